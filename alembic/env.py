@@ -20,8 +20,8 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 from configs.settings import settings
+from src.databases.sqlite import models  # noqa: F401  (регистрирует все модели)
 from src.databases.sqlite.models.base import Base
-from src.databases.sqlite.models.user import User  # noqa: F401
 
 # TODO: добавить миграции алембик в CI/CD
 
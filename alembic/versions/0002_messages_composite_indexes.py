@@ -0,0 +1,62 @@
+"""messages composite indexes
+
+Заменяет одиночные индексы messages.dialog_session_id и messages.user_id
+составными, совпадающими с порядком сортировки запросов истории:
+
+- (dialog_session_id, timestamp DESC, id DESC) — MessageDAO.get_last_messages
+  и постраничное чтение диалога без временного B-дерева для ORDER BY;
+- (user_id, timestamp, id) — постраничное чтение истории пользователя.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 18:00:24.281788
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Сначала создаём новые индексы, затем удаляем старые
+    op.create_index(
+        "ix_messages_dialog_session_id_timestamp_id",
+        "messages",
+        [
+            "dialog_session_id",
+            sa.literal_column("timestamp DESC"),
+            sa.literal_column("id DESC"),
+        ],
+        unique=False,
+    )
+    op.create_index(
+        "ix_messages_user_id_timestamp_id",
+        "messages",
+        ["user_id", "timestamp", "id"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_messages_dialog_session_id"), table_name="messages")
+    op.drop_index(op.f("ix_messages_user_id"), table_name="messages")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_messages_user_id"), "messages", ["user_id"], unique=False)
+    op.create_index(
+        op.f("ix_messages_dialog_session_id"),
+        "messages",
+        ["dialog_session_id"],
+        unique=False,
+    )
+    op.drop_index("ix_messages_user_id_timestamp_id", table_name="messages")
+    op.drop_index("ix_messages_dialog_session_id_timestamp_id", table_name="messages")
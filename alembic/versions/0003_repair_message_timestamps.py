@@ -0,0 +1,53 @@
+"""repair message timestamps
+
+До исправления Message.timestamp по умолчанию получал значение
+datetime.now(timezone.utc), вычисленное один раз при импорте модели. Все
+сообщения, записанные одним процессом, получали время его запуска.
+
+Миграция восстанавливает время из messages.created_at (серверный
+CURRENT_TIMESTAMP в UTC, вычисляемый при каждой вставке) для строк, у которых
+timestamp отстаёт от created_at больше чем на секунду или совпадает с
+timestamp другой строки. Совпадения внутри одной секунды упорядочиваются по id.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        sa.text(
+            """
+            UPDATE messages
+            SET timestamp = created_at
+            WHERE timestamp < datetime(created_at, '-1 seconds')
+               OR timestamp IN (
+                    SELECT timestamp
+                    FROM messages
+                    GROUP BY timestamp
+                    HAVING COUNT(*) > 1
+               )
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Исходные («замороженные») значения не несут информации — откат данных не нужен
+    pass
@@ -0,0 +1,47 @@
+"""message token count
+
+Добавляет столбец messages.token_count — длину content в токенах, которую
+Message вычисляет при вставке. По ней история диалога подбирается под бюджет
+контекстного окна модели без повторного подсчёта на каждом ходе.
+
+Существующие строки заполняются той же оценкой, что и
+src.utils.tokens.count_tokens: длина content в байтах UTF-8, делённая на 4
+с округлением вверх.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("messages", sa.Column("token_count", sa.Integer(), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            UPDATE messages
+            SET token_count = (length(CAST(content AS BLOB)) + 3) / 4
+            WHERE token_count IS NULL
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("messages") as batch_op:
+        batch_op.drop_column("token_count")
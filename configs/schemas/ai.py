@@ -148,6 +148,193 @@ class OpenRouterSettings(BaseConfig):
         examples=[0.0, 0.7, 1.0, 1.2],
     )
 
+    api_key: str = Field(
+        default="",
+        alias="OPENROUTER_API_KEY",
+        description=(
+            "API ключ OpenRouter. Передаётся в заголовке Authorization "
+            "каждого запроса. Если не задан, генерация текста недоступна."
+        ),
+        examples=["sk-or-v1-1234567890abcdef"],
+    )
+
+    request_timeout: float = Field(
+        default=60.0,
+        alias="OPENROUTER_REQUEST_TIMEOUT",
+        description=(
+            "Предельное время одной попытки запроса в секундах: от "
+            "отправки до получения полного ответа модели."
+        ),
+        gt=0,
+        examples=[30.0, 60.0, 120.0],
+    )
+
+    connect_timeout: float = Field(
+        default=10.0,
+        alias="OPENROUTER_CONNECT_TIMEOUT",
+        description=(
+            "Таймаут установки соединения (TCP и TLS) и ожидания "
+            "свободного соединения пула в секундах."
+        ),
+        gt=0,
+        examples=[5.0, 10.0],
+    )
+
+    max_connections: int = Field(
+        default=20,
+        alias="OPENROUTER_MAX_CONNECTIONS",
+        description=(
+            "Максимум одновременных соединений с API. При HTTP/2 запросы "
+            "мультиплексируются, и обычно хватает одного соединения."
+        ),
+        ge=1,
+        examples=[10, 20, 50],
+    )
+
+    max_keepalive_connections: int = Field(
+        default=10,
+        alias="OPENROUTER_MAX_KEEPALIVE_CONNECTIONS",
+        description=(
+            "Сколько простаивающих соединений держать открытыми, чтобы "
+            "следующие запросы не тратили время на TCP и TLS рукопожатие."
+        ),
+        ge=0,
+        examples=[5, 10],
+    )
+
+    keepalive_expiry: float = Field(
+        default=60.0,
+        alias="OPENROUTER_KEEPALIVE_EXPIRY",
+        description="Через сколько секунд простоя закрывать соединение пула.",
+        gt=0,
+        examples=[30.0, 60.0],
+    )
+
+    http2: bool = Field(
+        default=True,
+        alias="OPENROUTER_HTTP2",
+        description=(
+            "Использовать HTTP/2, если установлен пакет h2 (httpx[http2]). "
+            "Без него клиент работает по HTTP/1.1."
+        ),
+    )
+
+    prewarm: bool = Field(
+        default=True,
+        alias="OPENROUTER_PREWARM",
+        description=(
+            "При запуске заранее открыть соединение с API, чтобы первый "
+            "ответ пользователю не ждал рукопожатия TLS."
+        ),
+    )
+
+    retry_base_delay: float = Field(
+        default=0.5,
+        alias="OPENROUTER_RETRY_BASE_DELAY",
+        description=(
+            "Начальная задержка перед повторной попыткой в секундах. "
+            "Удваивается с каждой попыткой, фактическая пауза выбирается "
+            "случайно от нуля до этого значения (джиттер)."
+        ),
+        gt=0,
+        examples=[0.25, 0.5, 1.0],
+    )
+
+    retry_max_delay: float = Field(
+        default=8.0,
+        alias="OPENROUTER_RETRY_MAX_DELAY",
+        description="Максимальная задержка между попытками в секундах.",
+        gt=0,
+        examples=[4.0, 8.0, 30.0],
+    )
+
+    coalesce_requests: bool = Field(
+        default=True,
+        alias="OPENROUTER_COALESCE_REQUESTS",
+        description=(
+            "Объединять одинаковые одновременные запросы: к API уходит один "
+            "запрос, а его ответ получают все ожидающие."
+        ),
+    )
+
+    response_cache_enabled: bool = Field(
+        default=True,
+        alias="OPENROUTER_RESPONSE_CACHE",
+        description=(
+            "Кэшировать ответы модели в Redis по отпечатку запроса. "
+            "Автоматически кэшируются только детерминированные запросы "
+            "(temperature = 0), остальные — если вызывающий код явно разрешил."
+        ),
+    )
+
+    response_cache_ttl: int = Field(
+        default=86400,
+        alias="OPENROUTER_RESPONSE_CACHE_TTL",
+        description="Время жизни закэшированного ответа модели в секундах.",
+        ge=1,
+        examples=[3600, 86400],
+    )
+
+    context_window: int = Field(
+        default=32768,
+        alias="OPENROUTER_CONTEXT_WINDOW",
+        description=(
+            "Размер контекстного окна модели `model_name` в токенах. "
+            "История диалога для запроса подбирается так, чтобы вместе "
+            "с ответом (`max_tokens`) уложиться в это окно. Длина текста "
+            "оценивается без токенизатора модели (4 байта UTF-8 на токен) и "
+            "для чисел, кода, эмодзи и CJK занижается — на это оставляется "
+            "запас `context_reserve_percent`."
+        ),
+        ge=256,
+        examples=[8192, 32768, 131072],
+    )
+
+    context_reserve_percent: float = Field(
+        default=10,
+        alias="OPENROUTER_CONTEXT_RESERVE_PERCENT",
+        description=(
+            "Доля контекстного окна в процентах, которая не заполняется "
+            "историей: запас на ошибку оценки длины текста."
+        ),
+        ge=0,
+        lt=100,
+        examples=[10, 25],
+    )
+
+    message_token_overhead: int = Field(
+        default=4,
+        alias="OPENROUTER_MESSAGE_TOKEN_OVERHEAD",
+        description=(
+            "Служебные токены на одно сообщение запроса (роль и разметка "
+            "формата чата), добавляемые к длине текста при подсчёте бюджета."
+        ),
+        ge=0,
+        examples=[3, 4],
+    )
+
+    @property
+    def context_budget(self) -> int:
+        """
+        Бюджет токенов на входные сообщения запроса.
+
+        Returns:
+            int: `context_window` за вычетом запаса `context_reserve_percent`
+                и места под ответ (`max_tokens`).
+        """
+        reserve = int(self.context_window * self.context_reserve_percent / 100)
+        return max(self.context_window - reserve - self.max_tokens, 0)
+
+    @property
+    def is_configured(self) -> bool:
+        """
+        Проверка, что API ключ OpenRouter задан.
+
+        Returns:
+            bool: True если API ключ задан и не пустой, False в противном случае
+        """
+        return bool(self.api_key and self.api_key.strip())
+
     @field_validator("api_url")
     @classmethod
     def validate_api_url(cls, v: str) -> str:
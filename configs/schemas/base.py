@@ -4,15 +4,67 @@
 Этот модуль предоставляет основу для всех конфигурационных классов
 в приложении. Он автоматически загружает переменные окружения из
 .env файлов и обеспечивает базовую валидацию данных.
+
+Файл `.env` разбирается один раз за процесс: все секции настроек получают
+значения из общего разобранного словаря (`CachedDotEnvSettingsSource`), а не
+перечитывают файл. Значения из `.env` не переносятся в `os.environ`, поэтому
+секреты не наследуются дочерними процессами.
 """
 
+import os
+import threading
+from pathlib import Path
+from typing import ClassVar
+
+from dotenv import dotenv_values
 from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict,
+)
+from pydantic_settings.sources.utils import parse_env_vars
 
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Файл переменных окружения приложения
+ENV_FILE = ".env"
+
+_env_lock = threading.Lock()
+
+# Разобранные файлы: (абсолютный путь, кодировка) -> значения
+_env_files: dict[tuple[str, str | None], dict[str, str | None]] = {}
+
+
+def read_env_file(path: str | os.PathLike, encoding: str | None = None) -> dict:
+    """
+    Значения из env-файла; каждый файл разбирается один раз за процесс.
+
+    Returns:
+        dict: Имя переменной -> значение (без изменения `os.environ`).
+    """
+    key = (str(Path(path).resolve()), encoding)
+    with _env_lock:
+        values = _env_files.get(key)
+        if values is None:
+            values = _env_files[key] = dotenv_values(path, encoding=encoding)
+    return values
+
+
+class CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    """Источник настроек из `.env`, использующий разобранный один раз файл."""
+
+    def _read_env_file(self, file_path: Path) -> dict[str, str | None]:
+        return parse_env_vars(
+            read_env_file(file_path, self.env_file_encoding),
+            self.case_sensitive,
+            self.env_ignore_empty,
+            self.env_parse_none_str,
+        )
+
 
 class BaseConfig(BaseSettings):
     """
@@ -21,8 +73,15 @@ class BaseConfig(BaseSettings):
     Наследуется всеми конфигурационными классами приложения.
     Автоматически загружает переменные окружения и применяет
     универсальные валидаторы для очистки данных.
+
+    Вложенные секции объявляются как `functools.cached_property` и
+    перечисляются в `sections`: они создаются при первом обращении и
+    попадают в `dump_with_sections()`.
     """
 
+    # Имена ленивых вложенных секций
+    sections: ClassVar[tuple[str, ...]] = ()
+
     model_config = SettingsConfigDict(
         env_file=".env",  # Автоматическая загрузка .env
         env_file_encoding="utf-8",  # Кодировка
@@ -50,5 +109,57 @@ class BaseConfig(BaseSettings):
             return v.strip()
         return v
 
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        """
+        Заменяет стандартный источник `.env` на разбирающий файл один раз.
+
+        Приоритет прежний: явные значения, окружение, `.env`, секреты.
+        """
+        cached_dotenv = CachedDotEnvSettingsSource(
+            settings_cls,
+            env_file=dotenv_settings.env_file,
+            env_file_encoding=dotenv_settings.env_file_encoding,
+            case_sensitive=dotenv_settings.case_sensitive,
+            env_prefix=dotenv_settings.env_prefix,
+        )
+        return init_settings, env_settings, cached_dotenv, file_secret_settings
+
+    @classmethod
+    def from_env(cls, **data):
+        """
+        Создаёт секцию из окружения и `.env`, не перечитывая файл.
+
+        Args:
+            **data: Явные значения полей (приоритетнее окружения).
+
+        Returns:
+            Экземпляр настроек.
+        """
+        return cls(**data)
+
+    def dump_with_sections(self) -> dict:
+        """
+        Дамп полей вместе со всеми вложенными секциями (создаёт их).
+
+        Returns:
+            dict: Результат `model_dump()` с дампами секций из `sections`.
+        """
+        dump = self.model_dump()
+        for name in self.sections:
+            section = getattr(self, name)
+            if isinstance(section, BaseConfig):
+                dump[name] = section.dump_with_sections()
+            else:
+                dump[name] = section.model_dump()
+        return dump
+
 
 logger.debug("Базовая модель конфигурации загружена")
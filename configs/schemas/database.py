@@ -2,16 +2,57 @@
 Схемы конфигурации для баз данных.
 """
 
+from functools import cached_property
+from typing import Literal
+
 from pydantic import Field
+from pydantic_settings import SettingsConfigDict
 
 from .base import BaseConfig
 
+# Именованные профили производительности SQLite (значения PRAGMA).
+# cache_size < 0 задаётся в КиБ, mmap_size и busy_timeout — в байтах и мс.
+SQLITE_PERFORMANCE_PRESETS: dict[str, dict[str, str | int]] = {
+    # Максимальная надёжность: fsync на каждый commit
+    "durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    # WAL + NORMAL: при сбое питания теряются лишь последние транзакции
+    "balanced": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 134217728,
+        "temp_store": "MEMORY",
+    },
+    # Максимальная скорость записи ценой надёжности при сбое ОС
+    "throughput": {
+        "busy_timeout": 10000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 536870912,
+        "temp_store": "MEMORY",
+    },
+}
+
 
 class SQLiteSettings(BaseConfig):
     """
     Настройки SQLite базы данных.
+
+    Все поля читаются из переменных окружения с префиксом `SQLITE_`
+    (например, `SQLITE_DATABASE_URL`, `SQLITE_WRITE_BATCH_SIZE`).
     """
 
+    model_config = SettingsConfigDict(env_prefix="SQLITE_")
+
     database_url: str = Field(
         default="sqlite+aiosqlite:///./data/db.sqlite3",
         description="URL подключения к SQLite базе данных",
@@ -24,11 +65,78 @@ class SQLiteSettings(BaseConfig):
         default=False, description="Не устаревают объекты после commit"
     )
     autoflush: bool = Field(default=False, description="Отключить автоматический flush")
-    pool_size: int = Field(default=5, description="Размер пула соединений")
+    pool_size: int = Field(default=5, description="Размер пула соединений для чтения")
     max_overflow: int = Field(
-        default=10, description="Максимальное количество дополнительных соединений"
+        default=10,
+        description="Максимальное количество дополнительных соединений для чтения",
+    )
+    write_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Максимум сообщений в одной транзакции очереди записи",
+    )
+    write_flush_interval_ms: int = Field(
+        default=50,
+        ge=1,
+        description="Максимальная задержка перед записью накопленной порции, мс",
+    )
+    write_queue_size: int = Field(
+        default=10_000,
+        ge=1,
+        description="Ёмкость очереди записи (при заполнении enqueue ожидает)",
     )
 
+    # --- Профиль производительности (PRAGMA на каждое новое соединение) ---
+    performance_profile: Literal["durable", "balanced", "throughput"] = Field(
+        default="balanced",
+        description=(
+            "Именованный набор PRAGMA. Отдельные параметры ниже, если заданы, "
+            "переопределяют значения профиля."
+        ),
+    )
+    journal_mode: (
+        Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] | None
+    ) = Field(
+        default=None,
+        description="PRAGMA journal_mode. WAL позволяет читать во время записи",
+    )
+    synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] | None = Field(
+        default=None,
+        description="PRAGMA synchronous — как часто SQLite вызывает fsync",
+    )
+    mmap_size: int | None = Field(
+        default=None,
+        ge=0,
+        description="PRAGMA mmap_size — объём memory-mapped I/O в байтах",
+    )
+    cache_size: int | None = Field(
+        default=None,
+        description="PRAGMA cache_size: > 0 — в страницах, < 0 — в КиБ",
+    )
+    temp_store: Literal["DEFAULT", "FILE", "MEMORY"] | None = Field(
+        default=None,
+        description="PRAGMA temp_store — где хранить временные таблицы и индексы",
+    )
+    busy_timeout: int | None = Field(
+        default=None,
+        ge=0,
+        description="PRAGMA busy_timeout — ожидание снятия блокировки, мс",
+    )
+
+    def get_pragmas(self) -> dict[str, str | int]:
+        """
+        Итоговые значения PRAGMA: профиль с учётом явно заданных параметров.
+
+        Returns:
+            dict: Имя PRAGMA -> значение, в порядке применения.
+        """
+        pragmas = dict(SQLITE_PERFORMANCE_PRESETS[self.performance_profile])
+        for name in pragmas:
+            value = getattr(self, name)
+            if value is not None:
+                pragmas[name] = value
+        return pragmas
+
 
 class RedisSettings(BaseConfig):
     """
@@ -47,6 +155,112 @@ class RedisSettings(BaseConfig):
         default=True,
         description="Декодировать ответы Redis в строки (удобно для работы с текстовыми данными)",
     )
+    redis_max_connections: int = Field(
+        default=20,
+        ge=1,
+        description=(
+            "Максимум соединений в пуле. При исчерпании команды ждут "
+            "освободившееся соединение, а не открывают новые"
+        ),
+    )
+    redis_pool_timeout: float = Field(
+        default=5.0,
+        gt=0,
+        description="Сколько секунд ждать свободное соединение пула до ошибки",
+    )
+    redis_health_check_interval: int = Field(
+        default=30,
+        ge=0,
+        description=(
+            "Проверять соединение PING-ом, если оно простаивало дольше "
+            "стольких секунд (0 — не проверять)"
+        ),
+    )
+    redis_retry_on_timeout: bool = Field(
+        default=True, description="Повторять команду один раз при таймауте сокета"
+    )
+    redis_socket_keepalive: bool = Field(
+        default=True,
+        description="Включить TCP keepalive, чтобы NAT/балансировщик не рвал простаивающие соединения",
+    )
+    redis_socket_timeout: float | None = Field(
+        default=5.0,
+        gt=0,
+        description="Таймаут чтения/записи в сокет, с (None — без таймаута)",
+    )
+    redis_socket_connect_timeout: float | None = Field(
+        default=5.0,
+        gt=0,
+        description="Таймаут установки соединения, с (None — без таймаута)",
+    )
+    redis_cache_codec: Literal["json", "msgpack", "struct"] = Field(
+        default="struct",
+        description=(
+            "Формат объектов кэша (MessageRead, UserRead) в Redis: json, "
+            "msgpack (нужен пакет msgpack) или компактный struct"
+        ),
+    )
+    redis_compress_threshold: int = Field(
+        default=512,
+        ge=0,
+        description="Сжимать zlib значения кэша от стольких байт (0 — не сжимать)",
+    )
+    redis_compress_level: int = Field(
+        default=6, ge=1, le=9, description="Уровень сжатия zlib значений кэша"
+    )
+    redis_fallback_enabled: bool = Field(
+        default=True,
+        description=(
+            "Пока Redis недоступен, отдавать вместо него ограниченное "
+            "хранилище в памяти процесса"
+        ),
+    )
+    redis_fallback_max_keys: int = Field(
+        default=10000, ge=1, description="Максимум ключей в хранилище в памяти"
+    )
+    redis_fallback_max_ttl: int = Field(
+        default=60,
+        ge=1,
+        description=(
+            "Предельное время жизни ключа в памяти, с: данные процесса не "
+            "видны другим процессам, поэтому не должны жить долго"
+        ),
+    )
+    redis_probe_interval: float = Field(
+        default=5.0,
+        gt=0,
+        description="Как часто проверять доступность Redis в нормальном режиме, с",
+    )
+    redis_reconnect_min_delay: float = Field(
+        default=0.5,
+        gt=0,
+        description="Начальная пауза между попытками переподключения, с",
+    )
+    redis_reconnect_max_delay: float = Field(
+        default=30.0,
+        gt=0,
+        description="Максимальная пауза между попытками переподключения, с",
+    )
+
+
+class CacheSettings(BaseConfig):
+    """
+    Настройки in-memory кэшей поверх БД.
+    """
+
+    user_cache_size: int = Field(
+        default=10_000,
+        ge=0,
+        description="Максимум пользователей в кэше UserDAO (0 — кэш отключён)",
+    )
+    user_cache_ttl: int = Field(
+        default=300, ge=0, description="Время жизни записи о пользователе, с"
+    )
+    user_cache_negative_ttl: int = Field(
+        default=30,
+        ge=0,
+        description="Время жизни записи об отсутствии пользователя, с",
+    )
 
 
 class DatabaseSettings(BaseConfig):
@@ -54,5 +268,19 @@ class DatabaseSettings(BaseConfig):
     Общие настройки для всех баз данных.
     """
 
-    sqlite: SQLiteSettings = SQLiteSettings()
-    redis: RedisSettings = RedisSettings()
+    sections = ("sqlite", "redis", "cache")
+
+    @cached_property
+    def sqlite(self) -> SQLiteSettings:
+        """Настройки SQLite (создаются при первом обращении)."""
+        return SQLiteSettings.from_env()
+
+    @cached_property
+    def redis(self) -> RedisSettings:
+        """Настройки Redis (создаются при первом обращении)."""
+        return RedisSettings.from_env()
+
+    @cached_property
+    def cache(self) -> CacheSettings:
+        """Настройки in-memory кэшей (создаются при первом обращении)."""
+        return CacheSettings.from_env()
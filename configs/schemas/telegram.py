@@ -68,6 +68,30 @@ class TelegramSettings(BaseConfig):
         examples=[[111111111, 222222222]],
     )
 
+    stream_edit_interval: float = Field(
+        default=1.0,
+        alias="TELEGRAM_STREAM_EDIT_INTERVAL",
+        description=(
+            "Минимальный интервал между правками сообщения при потоковом "
+            "выводе ответа модели в личном чате, в секундах. Telegram "
+            "ограничивает частоту правок и отвечает Flood control при превышении."
+        ),
+        gt=0,
+        examples=[1.0, 1.5],
+    )
+
+    stream_group_edit_interval: float = Field(
+        default=3.0,
+        alias="TELEGRAM_STREAM_GROUP_EDIT_INTERVAL",
+        description=(
+            "Минимальный интервал между правками сообщения при потоковом "
+            "выводе в группах, в секундах (лимит Telegram для групп — около "
+            "20 сообщений в минуту)."
+        ),
+        gt=0,
+        examples=[3.0, 5.0],
+    )
+
     @field_validator("admin_ids", mode="before")
     @classmethod
     def parse_admin_ids(cls, v) -> List[int]:
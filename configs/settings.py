@@ -1,8 +1,13 @@
 """
 Основная конфигурация приложения с использованием Pydantic 2.
+
+Секции настроек создаются лениво — при первом обращении к атрибуту
+`settings.<секция>`; `.env` при этом разбирается один раз за процесс.
 """
 
+import logging
 import os
+from functools import cached_property
 from typing import ClassVar, Optional
 
 from configs.schemas.ai import (
@@ -27,13 +32,15 @@ class AppSettings(BaseConfig):
     """
 
     # Вложенные настройки для структурированного доступа
-    telegram: TelegramSettings = TelegramSettings()
-    openrouter: OpenRouterSettings = OpenRouterSettings()
-    assemblyai: AssemblyAISettings = AssemblyAISettings()
-    elevenlabs: ElevenLabsSettings = ElevenLabsSettings()
-    storage: StorageSettings = StorageSettings()
-    file_processing: MediaProcessingSettings = MediaProcessingSettings()
-    database: DatabaseSettings = DatabaseSettings()
+    sections = (
+        "telegram",
+        "openrouter",
+        "assemblyai",
+        "elevenlabs",
+        "storage",
+        "file_processing",
+        "database",
+    )
 
     # Синглтон для производительности и консистентности
     _instance: ClassVar[Optional["AppSettings"]] = None
@@ -41,17 +48,57 @@ class AppSettings(BaseConfig):
     def __init__(self, **data):
         """Инициализация с логированием безопасной конфигурации."""
         super().__init__(**data)
-        # Создаём папку /data, если её нет
+        # Создаём папку /data, если её нет (секция без чтения окружения)
         self.storage.data_dir.mkdir(exist_ok=True)
         # Логируем безопасный дамп при создании
         self._log_safe_configuration()
 
+    @cached_property
+    def telegram(self) -> TelegramSettings:
+        """Настройки Telegram-бота."""
+        return TelegramSettings.from_env()
+
+    @cached_property
+    def openrouter(self) -> OpenRouterSettings:
+        """Настройки OpenRouter."""
+        return OpenRouterSettings.from_env()
+
+    @cached_property
+    def assemblyai(self) -> AssemblyAISettings:
+        """Настройки AssemblyAI."""
+        return AssemblyAISettings.from_env()
+
+    @cached_property
+    def elevenlabs(self) -> ElevenLabsSettings:
+        """Настройки ElevenLabs."""
+        return ElevenLabsSettings.from_env()
+
+    @cached_property
+    def storage(self) -> StorageSettings:
+        """Настройки хранилища и путей."""
+        return StorageSettings()
+
+    @cached_property
+    def file_processing(self) -> MediaProcessingSettings:
+        """Настройки обработки медиафайлов."""
+        return MediaProcessingSettings.from_env()
+
+    @cached_property
+    def database(self) -> DatabaseSettings:
+        """Настройки баз данных."""
+        return DatabaseSettings.from_env()
+
     def _log_safe_configuration(self):
-        """Логирование безопасной конфигурации при инициализации."""
+        """Логирование безопасной конфигурации при инициализации.
+
+        Полный дамп создаёт все секции, поэтому строится только при
+        включённом уровне DEBUG.
+        """
+        logger.info("🔧 Конфигурация приложения загружена")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         try:
-            safe_dump = self.get_safe_dump()
-            logger.info("🔧 Конфигурация приложения загружена")
-            logger.debug(f"Настройки: {safe_dump}")
+            logger.debug(f"Настройки: {self.get_safe_dump()}")
         except Exception as e:
             logger.warning(f"Не удалось залогировать конфигурацию: {e}")
 
@@ -59,7 +106,7 @@ class AppSettings(BaseConfig):
     def get_instance(cls) -> "AppSettings":
         """Получить синглтон экземпляр конфигурации."""
         if cls._instance is None:
-            cls._instance = cls()
+            cls._instance = cls.from_env()
         return cls._instance
 
     @property
@@ -71,7 +118,7 @@ class AppSettings(BaseConfig):
 
     def get_safe_dump(self) -> dict:
         """Получить безопасный дамп всех настроек для логирования."""
-        dump = self.model_dump()
+        dump = self.dump_with_sections()
 
         # Удаляем чувствительные данные
         sensitive_keys = [
@@ -0,0 +1,25 @@
+"""
+Клиенты AI сервисов (LLM, распознавание и синтез речи).
+"""
+
+from .context import build_context
+from .openrouter import (
+    OpenRouterClient,
+    OpenRouterError,
+    openrouter_client,
+    request_fingerprint,
+)
+from .response_cache import LLMResponseCache, llm_response_cache
+from .streaming import ThrottledEditSink, stream_reply
+
+__all__ = [
+    "OpenRouterClient",
+    "OpenRouterError",
+    "openrouter_client",
+    "LLMResponseCache",
+    "llm_response_cache",
+    "request_fingerprint",
+    "ThrottledEditSink",
+    "stream_reply",
+    "build_context",
+]
@@ -0,0 +1,80 @@
+"""
+Сборка сообщений запроса к модели из истории диалога по бюджету токенов.
+
+Вместо фиксированных последних 30 сообщений история подбирается от новых
+к старым, пока укладывается в контекстное окно модели:
+
+    бюджет = context_window − запас − max_tokens − системный промпт
+
+Запас (`context_reserve_percent` окна) покрывает ошибку приблизительной
+оценки длины (`src.utils.tokens`).
+
+Длина каждого сообщения берётся из `Message.token_count`, сохранённого при
+вставке, поэтому на каждом ходе история не токенизируется заново.
+
+`Message.role` хранит роль автора, в том числе имя персонажа, от лица
+которого отвечает бот. API принимает только роли формата чата OpenAI,
+поэтому роли не из `CHAT_ROLES` передаются как `assistant`.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.schemas.ai import OpenRouterSettings
+from configs.settings import settings
+from src.databases.cache.dialog import DialogContextCache, dialog_cache
+from src.utils.tokens import count_tokens
+
+# Роли сообщений, которые принимает chat completions API
+CHAT_ROLES = frozenset({"system", "user", "assistant"})
+
+
+def chat_role(role: str) -> str:
+    """
+    Роль сообщения истории в формате OpenAI.
+
+    Returns:
+        str: `role`, если это роль из `CHAT_ROLES`, иначе `assistant`
+            (реплика персонажа, которого играет модель).
+    """
+    role = role.lower()
+    return role if role in CHAT_ROLES else "assistant"
+
+
+async def build_context(
+    session: AsyncSession,
+    dialog_session_id: str,
+    system_prompt: str | None = None,
+    config: OpenRouterSettings | None = None,
+    cache: DialogContextCache | None = None,
+) -> list[dict]:
+    """
+    Сообщения запроса в формате OpenAI: системный промпт и хвост диалога.
+
+    Args:
+        session: Асинхронная сессия SQLAlchemy.
+        dialog_session_id: ID сессии диалога.
+        system_prompt: Системный промпт; его длина вычитается из бюджета.
+        config: Настройки OpenRouter (по умолчанию `settings.openrouter`).
+        cache: Кэш диалога (по умолчанию общий `dialog_cache`).
+
+    Returns:
+        list[dict]: Сообщения (`role`, `content`) от старых к новым.
+    """
+    config = config or settings.openrouter
+    cache = cache or dialog_cache
+    overhead = config.message_token_overhead
+
+    budget = config.context_budget
+    messages = []
+    if system_prompt:
+        budget -= count_tokens(system_prompt) + overhead
+        messages.append({"role": "system", "content": system_prompt})
+
+    history = await cache.get_context_messages(
+        session, dialog_session_id, max(budget, 0), overhead
+    )
+    messages.extend(
+        {"role": chat_role(message.role), "content": message.content}
+        for message in history
+    )
+    return messages
@@ -0,0 +1,495 @@
+"""
+Асинхронный клиент OpenRouter API (chat completions).
+
+Клиент построен на `OpenRouterSettings` и держит один общий пул соединений
+`httpx.AsyncClient`:
+
+- соединения переиспользуются (keep-alive), поэтому TCP и TLS рукопожатие
+  выполняется один раз, а не на каждом ходе бота;
+- при установленном `h2` запросы идут по HTTP/2 и мультиплексируются в
+  одном соединении;
+- `start()` при запуске заранее открывает соединение с API (pre-warm), а
+  `close()` при остановке закрывает пул — оба вызываются в обработчиках
+  запуска и остановки приложения (см. docs/articles/architecture.md);
+- каждая попытка ограничена `request_timeout`, а сетевые ошибки, таймауты и
+  ответы 408/429/5xx повторяются до `max_retries` попыток с экспоненциальной
+  паузой и джиттером (с учётом заголовка `Retry-After`).
+
+Одинаковые одновременные запросы (один и тот же промпт из группового чата)
+объединяются по отпечатку тела запроса: к API уходит один запрос, а его
+результат получают все ожидающие (`src.utils.single_flight`).
+
+`stream_completion` запрашивает ответ с `stream=True` и отдаёт фрагменты
+текста по мере прихода server-sent events — пользователь видит начало ответа,
+не дожидаясь конца генерации.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from typing import Any, AsyncIterator
+
+import httpx
+
+from configs.schemas.ai import OpenRouterSettings
+from configs.settings import settings
+from src.utils.logger import get_logger
+from src.utils.single_flight import SingleFlight
+
+try:
+    import h2
+except ImportError:  # Необязательная зависимость: без неё используется HTTP/1.1
+    h2 = None
+
+logger = get_logger(__name__)
+
+# Статусы ответа, после которых запрос имеет смысл повторить
+RETRY_STATUSES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+# Данные события, завершающего поток
+SSE_DONE = "[DONE]"
+
+# Поля тела запроса, не влияющие на текст ответа
+_NON_SEMANTIC_FIELDS = frozenset({"stream"})
+
+
+class OpenRouterError(RuntimeError):
+    """Запрос к OpenRouter не удался (после всех попыток или без права на повтор)."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def request_fingerprint(payload: dict) -> str:
+    """
+    Отпечаток тела запроса chat completions.
+
+    Поля сериализуются в канонический JSON (ключи отсортированы), поэтому
+    одинаковые запросы дают одинаковый отпечаток независимо от порядка
+    ключей. `stream` не учитывается.
+
+    Returns:
+        str: SHA-256 в шестнадцатеричном виде.
+    """
+    canonical = json.dumps(
+        {
+            key: value
+            for key, value in payload.items()
+            if key not in _NON_SEMANTIC_FIELDS
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+async def iter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Разбирает поток server-sent events и отдаёт поле `data` каждого события.
+
+    Событие заканчивается пустой строкой, несколько строк `data:` одного
+    события склеиваются через перевод строки. Комментарии (`: ...` —
+    OpenRouter шлёт их как keep-alive) и прочие поля пропускаются.
+
+    Args:
+        lines: Строки ответа без символов перевода строки
+            (например, `httpx.Response.aiter_lines()`).
+    """
+    data: list[str] = []
+    async for line in lines:
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value.removeprefix(" "))
+    if data:
+        yield "\n".join(data)
+
+
+class OpenRouterClient:
+    """
+    Клиент OpenRouter с общим пулом соединений и повторными попытками.
+
+    Example:
+        await openrouter_client.start()  # При запуске приложения
+        text = await openrouter_client.complete(
+            [{"role": "user", "content": "Привет!"}]
+        )
+        await openrouter_client.close()
+    """
+
+    def __init__(
+        self,
+        config: OpenRouterSettings | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Args:
+            config: Настройки OpenRouter (по умолчанию `settings.openrouter`).
+            transport: Транспорт httpx (например, `httpx.MockTransport` в тестах).
+        """
+        self._config = config
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.streams = 0
+        self.first_token_time_total = 0.0
+        self.single_flight = SingleFlight()
+
+    @property
+    def config(self) -> OpenRouterSettings:
+        """Настройки клиента (секция настроек создаётся при первом обращении)."""
+        if self._config is None:
+            self._config = settings.openrouter
+        return self._config
+
+    @property
+    def http2(self) -> bool:
+        """True, если клиент согласует HTTP/2."""
+        return self.config.http2 and h2 is not None and self._transport is None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Создаёт `httpx.AsyncClient` с пулом и таймаутами из настроек."""
+        config = self.config
+        headers = {"Content-Type": "application/json"}
+        if config.is_configured:
+            headers["Authorization"] = f"Bearer {config.api_key}"
+        return httpx.AsyncClient(
+            http2=self.http2,
+            transport=self._transport,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                config.request_timeout,
+                connect=config.connect_timeout,
+                pool=config.connect_timeout,
+            ),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Общий `httpx.AsyncClient` (создаётся при первом обращении)."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self) -> None:
+        """
+        Создаёт пул соединений и при `prewarm` заранее открывает соединение.
+
+        Ошибка прогрева не мешает запуску: соединение откроется при первом
+        запросе.
+        """
+        if not self.config.is_configured:
+            logger.warning(
+                "OPENROUTER_API_KEY не задан, запросы к OpenRouter отклонит API"
+            )
+        client = self.client
+        if not self.config.prewarm:
+            return
+        started = time.monotonic()
+        try:
+            # Любой ответ (даже 405) означает, что TCP и TLS уже установлены
+            response = await client.head(self.config.api_url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Не удалось заранее подключиться к OpenRouter: {e}")
+            return
+        logger.info(
+            f"Соединение с OpenRouter открыто за {time.monotonic() - started:.2f} с "
+            f"({response.http_version})"
+        )
+
+    async def close(self) -> None:
+        """Закрывает пул соединений."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def build_payload(self, messages: list[dict], **overrides: Any) -> dict:
+        """
+        Тело запроса chat completions с параметрами генерации из настроек.
+
+        Args:
+            messages: Сообщения в формате OpenAI (`role`, `content`).
+            **overrides: Переопределения полей запроса (`model`, `temperature`,
+                `max_tokens`, `stream` и т.п.).
+
+        Returns:
+            dict: JSON-тело запроса.
+        """
+        config = self.config
+        payload = {
+            "model": config.model_name,
+            "messages": messages,
+            "max_tokens": config.max_tokens,
+            "temperature": config.default_temperature,
+            "top_p": config.top_p,
+            "frequency_penalty": config.frequency_penalty,
+            "presence_penalty": config.presence_penalty,
+        }
+        payload.update(overrides)
+        return payload
+
+    def _retry_delay(self, attempt: int, response: httpx.Response | None) -> float:
+        """
+        Пауза перед следующей попыткой.
+
+        Экспоненциальная граница `retry_base_delay * 2**attempt` (не больше
+        `retry_max_delay`) со случайной паузой от нуля до неё. `Retry-After`
+        в секундах, если сервер его прислал, задаёт нижнюю границу.
+        """
+        config = self.config
+        ceiling = min(config.retry_max_delay, config.retry_base_delay * 2**attempt)
+        delay = random.uniform(0, ceiling)
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), config.retry_max_delay))
+        return delay
+
+    async def chat_completion(self, messages: list[dict], **overrides: Any) -> dict:
+        """
+        Выполняет запрос chat completions с повторными попытками.
+
+        При `coalesce_requests` одинаковые одновременные запросы выполняются
+        одним обращением к API и получают один и тот же словарь ответа —
+        его нельзя изменять.
+
+        Args:
+            messages: Сообщения в формате OpenAI (`role`, `content`).
+            **overrides: Переопределения полей запроса (см. `build_payload`).
+
+        Returns:
+            dict: Разобранный JSON-ответ API.
+
+        Raises:
+            OpenRouterError: Ответ с ошибкой без права на повтор или исчерпаны
+                все `max_retries` попыток.
+        """
+        payload = self.build_payload(messages, **overrides)
+        if not self.config.coalesce_requests:
+            return await self._chat_completion(payload)
+        return await self.single_flight.do(
+            request_fingerprint(payload), lambda: self._chat_completion(payload)
+        )
+
+    async def _chat_completion(self, payload: dict) -> dict:
+        """Один запрос chat completions с повторными попытками."""
+        attempts = self.config.max_retries
+        self.requests += 1
+
+        for attempt in range(attempts):
+            response = None
+            try:
+                async with asyncio.timeout(self.config.request_timeout):
+                    response = await self.client.post(self.config.api_url, json=payload)
+            except (httpx.TransportError, TimeoutError) as e:
+                error = self._transport_error(e)
+            else:
+                if response.status_code == 200:
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        error = OpenRouterError(f"Некорректный JSON от OpenRouter: {e}")
+                        break
+                error = self._status_error(response)
+                if response.status_code not in RETRY_STATUSES:
+                    break
+
+            if attempt + 1 < attempts:
+                await self._wait_retry(error, attempt, response)
+
+        self.failures += 1
+        raise error
+
+    async def stream_completion(
+        self, messages: list[dict], **overrides: Any
+    ) -> AsyncIterator[str]:
+        """
+        Запрашивает ответ с `stream=True` и отдаёт фрагменты текста по мере генерации.
+
+        Повторные попытки выполняются, только пока ответ не начал приходить:
+        после первого фрагмента обрыв потока завершается `OpenRouterError`.
+        `request_timeout` ограничивает ожидание заголовков ответа, а
+        таймаут чтения — паузу между фрагментами.
+
+        Args:
+            messages: Сообщения в формате OpenAI (`role`, `content`).
+            **overrides: Переопределения полей запроса (см. `build_payload`).
+
+        Yields:
+            str: Очередной фрагмент текста ответа.
+
+        Raises:
+            OpenRouterError: Ошибка до начала ответа после всех попыток,
+                ошибка в потоке или обрыв соединения.
+        """
+        payload = self.build_payload(messages, **overrides, stream=True)
+        attempts = self.config.max_retries
+        self.requests += 1
+        self.streams += 1
+        started = time.monotonic()
+
+        for attempt in range(attempts):
+            request = self.client.build_request(
+                "POST", self.config.api_url, json=payload
+            )
+            response = None
+            try:
+                async with asyncio.timeout(self.config.request_timeout):
+                    response = await self.client.send(request, stream=True)
+            except (httpx.TransportError, TimeoutError) as e:
+                error = self._transport_error(e)
+            else:
+                if response.status_code == 200:
+                    break
+                await response.aread()
+                await response.aclose()
+                error = self._status_error(response)
+                if response.status_code not in RETRY_STATUSES:
+                    self.failures += 1
+                    raise error
+
+            if attempt + 1 < attempts:
+                await self._wait_retry(error, attempt, response)
+        else:
+            self.failures += 1
+            raise error
+
+        first_token = True
+        try:
+            async for data in iter_sse_data(response.aiter_lines()):
+                if data == SSE_DONE:
+                    break
+                delta = self._parse_stream_chunk(data)
+                if not delta:
+                    continue
+                if first_token:
+                    first_token = False
+                    latency = time.monotonic() - started
+                    self.first_token_time_total += latency
+                    logger.debug(
+                        f"Первый фрагмент ответа OpenRouter через {latency:.2f} с"
+                    )
+                yield delta
+        except httpx.TransportError as e:
+            self.failures += 1
+            raise OpenRouterError(f"Поток ответа OpenRouter прерван: {e}") from e
+        except OpenRouterError:
+            self.failures += 1
+            raise
+        finally:
+            await response.aclose()
+
+    @staticmethod
+    def _parse_stream_chunk(data: str) -> str:
+        """
+        Текст из события потока; ошибка генерации — `OpenRouterError`.
+        """
+        try:
+            chunk = json.loads(data)
+        except ValueError as e:
+            raise OpenRouterError(f"Некорректное событие потока OpenRouter: {e}") from e
+        if "error" in chunk:
+            error = chunk["error"]
+            raise OpenRouterError(
+                f"Ошибка в потоке OpenRouter: {error.get('message', error)}",
+                status_code=error.get("code")
+                if isinstance(error.get("code"), int)
+                else None,
+            )
+        choices = chunk.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    @staticmethod
+    def _status_error(response: httpx.Response) -> OpenRouterError:
+        """Ошибка для ответа с кодом, отличным от 200 (тело должно быть прочитано)."""
+        return OpenRouterError(
+            f"OpenRouter ответил {response.status_code}: {response.text[:500]}",
+            status_code=response.status_code,
+        )
+
+    @staticmethod
+    def _transport_error(error: Exception) -> OpenRouterError:
+        """Ошибка для сетевого сбоя или таймаута попытки."""
+        detail = (
+            f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+        )
+        return OpenRouterError(f"Сетевая ошибка OpenRouter: {detail}")
+
+    async def _wait_retry(
+        self, error: OpenRouterError, attempt: int, response: httpx.Response | None
+    ) -> None:
+        """Логирует неудачную попытку и ждёт паузу перед следующей."""
+        delay = self._retry_delay(attempt, response)
+        self.retries += 1
+        logger.warning(
+            f"{error}. Попытка {attempt + 2}/{self.config.max_retries} "
+            f"через {delay:.2f} с"
+        )
+        await asyncio.sleep(delay)
+
+    async def complete(self, messages: list[dict], **overrides: Any) -> str:
+        """
+        Возвращает текст первого варианта ответа модели.
+
+        Raises:
+            OpenRouterError: См. `chat_completion`; также если ответ не
+                содержит текста.
+        """
+        return self.message_content(await self.chat_completion(messages, **overrides))
+
+    @staticmethod
+    def message_content(data: dict) -> str:
+        """
+        Текст первого варианта из ответа chat completions.
+
+        Raises:
+            OpenRouterError: Ответ не содержит `choices[0].message`.
+        """
+        try:
+            return data["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError) as e:
+            raise OpenRouterError(f"Неожиданный ответ OpenRouter: {data!r:.500}") from e
+
+    def stats(self) -> dict:
+        """
+        Счётчики клиента.
+
+        Returns:
+            dict: requests, retries, failures, streams, first_token_avg
+                (среднее время до первого фрагмента потока, с), coalesced
+                (запросы, получившие результат чужого одинакового запроса)
+                и http2.
+        """
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "streams": self.streams,
+            "first_token_avg": (
+                self.first_token_time_total / self.streams if self.streams else 0.0
+            ),
+            "coalesced": self.single_flight.coalesced,
+            "http2": self.http2,
+        }
+
+
+# Общий экземпляр клиента (один пул соединений на процесс)
+openrouter_client = OpenRouterClient()
@@ -0,0 +1,216 @@
+"""
+Кэш ответов модели в Redis по отпечатку запроса.
+
+Многие ходы ролевого бота повторяются дословно: приветствия, сценарий
+/start, одинаковые запросы при `temperature = 0`. `LLMResponseCache` хранит
+ответ под ключом `llm:response:<sha256>`, где хэш считается по всему телу
+запроса (модель, сообщения, `max_tokens`, `temperature`, `top_p`, штрафы и
+прочие параметры генерации), и отдаёт его без обращения к API.
+
+Кэшируются только запросы, ответ на которые воспроизводим: при
+`temperature = 0` — автоматически, при других значениях — только если
+вызывающий код явно передал `cache=True`. Значения кодируются
+`src.databases.redis_codec`, вместе с текстом хранятся расход токенов и
+время исходного запроса — по ним считается экономия в `stats()`.
+"""
+
+import time
+from typing import Any
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.ai.openrouter import (
+    OpenRouterClient,
+    openrouter_client,
+    request_fingerprint,
+)
+from src.databases.redis import (
+    RedisNotInitializedError,
+    get_redis_client,
+    mark_redis_unavailable,
+)
+from src.databases.redis_codec import CodecError, ModelCodec, get_codec
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedCompletion(BaseModel):
+    """Закэшированный ответ модели."""
+
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float  # Длительность исходного запроса, с
+
+
+class LLMResponseCache:
+    """
+    Read-through кэш ответов OpenRouter.
+
+    Example:
+        text = await llm_response_cache.complete(messages, temperature=0)
+        text = await llm_response_cache.complete(messages, cache=True)  # Явно
+        llm_response_cache.stats()["hit_rate"]
+    """
+
+    def __init__(
+        self,
+        llm_client: OpenRouterClient | None = None,
+        redis_client: Redis | None = None,
+        ttl: int | None = None,
+        key_prefix: str = "llm:response",
+        codec: ModelCodec | None = None,
+    ):
+        """
+        Args:
+            llm_client: Клиент OpenRouter (по умолчанию общий `openrouter_client`).
+            redis_client: Клиент Redis с `decode_responses=False`. По
+                умолчанию — глобальный бинарный клиент из `src.databases.redis`.
+            ttl: Время жизни ответа в секундах (по умолчанию
+                `response_cache_ttl`); 0 — ответы не сохраняются.
+            key_prefix: Префикс ключей Redis.
+            codec: Кодек значений (по умолчанию — из настроек Redis).
+        """
+        self.llm_client = llm_client or openrouter_client
+        self._redis_client = redis_client
+        self._ttl = ttl
+        self.key_prefix = key_prefix
+        self.codec = codec or get_codec(CachedCompletion)
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_tokens = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def ttl(self) -> int:
+        """Время жизни ответа в секундах."""
+        if self._ttl is not None:
+            return self._ttl
+        return self.llm_client.config.response_cache_ttl
+
+    async def _get_client(self) -> Redis:
+        """Возвращает явно переданный или глобальный бинарный клиент Redis."""
+        return self._redis_client or await get_redis_client(binary=True)
+
+    def _key(self, payload: dict) -> str:
+        """Ключ Redis для тела запроса."""
+        return f"{self.key_prefix}:{request_fingerprint(payload)}"
+
+    def is_cacheable(self, payload: dict, cache: bool | None = None) -> bool:
+        """
+        Можно ли отдать ответ на запрос из кэша.
+
+        Args:
+            payload: Тело запроса.
+            cache: True — кэшировать независимо от температуры, False — никогда,
+                None — только детерминированные запросы (`temperature = 0`).
+        """
+        if not self.llm_client.config.response_cache_enabled or cache is False:
+            return False
+        return cache is True or payload.get("temperature") == 0
+
+    async def get(self, payload: dict) -> CachedCompletion | None:
+        """
+        Закэшированный ответ на запрос или None (также при ошибке Redis и
+        если Redis не настроен).
+        """
+        try:
+            raw = await (await self._get_client()).get(self._key(payload))
+        except RedisNotInitializedError:
+            return None
+        except RedisError as e:
+            logger.warning(f"Кэш ответов модели недоступен: {e}")
+            mark_redis_unavailable(e)
+            return None
+        if raw is None:
+            return None
+        try:
+            return self.codec.decode(raw)
+        except CodecError as e:
+            logger.warning(f"Ответ модели в кэше не читается: {e}")
+            return None
+
+    async def set(self, payload: dict, completion: CachedCompletion) -> None:
+        """Сохраняет ответ на запрос с TTL."""
+        if not self.ttl:
+            return
+        try:
+            client = await self._get_client()
+            await client.set(
+                self._key(payload), self.codec.encode(completion), ex=self.ttl
+            )
+        except RedisNotInitializedError:
+            pass  # Redis не настроен — кэш не используется
+        except RedisError as e:
+            logger.warning(f"Не удалось сохранить ответ модели в кэш: {e}")
+            mark_redis_unavailable(e)
+
+    async def complete(
+        self, messages: list[dict], cache: bool | None = None, **overrides: Any
+    ) -> str:
+        """
+        Текст ответа модели: из кэша или от OpenRouter с сохранением в кэш.
+
+        Args:
+            messages: Сообщения в формате OpenAI (`role`, `content`).
+            cache: Разрешение кэширования (см. `is_cacheable`).
+            **overrides: Переопределения полей запроса (см. `build_payload`).
+
+        Raises:
+            OpenRouterError: См. `OpenRouterClient.chat_completion`.
+        """
+        payload = self.llm_client.build_payload(messages, **overrides)
+        if not self.is_cacheable(payload, cache):
+            self.bypassed += 1
+            return await self.llm_client.complete(messages, **overrides)
+
+        cached = await self.get(payload)
+        if cached is not None:
+            self.hits += 1
+            self.saved_tokens += cached.prompt_tokens + cached.completion_tokens
+            self.saved_seconds += cached.latency
+            return cached.content
+
+        self.misses += 1
+        started = time.monotonic()
+        data = await self.llm_client.chat_completion(messages, **overrides)
+        latency = time.monotonic() - started
+        content = self.llm_client.message_content(data)
+        usage = data.get("usage") or {}
+        if content:
+            await self.set(
+                payload,
+                CachedCompletion(
+                    content=content,
+                    prompt_tokens=usage.get("prompt_tokens") or 0,
+                    completion_tokens=usage.get("completion_tokens") or 0,
+                    latency=latency,
+                ),
+            )
+        return content
+
+    def stats(self) -> dict:
+        """
+        Счётчики кэша.
+
+        Returns:
+            dict: hits, misses, bypassed (некэшируемые запросы), hit_rate
+                (доля попаданий среди кэшируемых), saved_tokens и saved_seconds.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_tokens": self.saved_tokens,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+# Общий экземпляр кэша на общем клиенте OpenRouter и глобальном клиенте Redis
+llm_response_cache = LLMResponseCache()
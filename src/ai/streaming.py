@@ -0,0 +1,194 @@
+"""
+Потоковый вывод ответа модели правками одного сообщения Telegram.
+
+`ThrottledEditSink` принимает фрагменты текста (например, из
+`OpenRouterClient.stream_completion`) и редактирует сообщение не чаще
+`interval` секунд:
+
+- первый фрагмент показывается сразу — это и есть время до первого ответа,
+  которое замечает пользователь;
+- фрагменты, пришедшие между правками, объединяются: очередная правка
+  отправляет весь накопленный текст;
+- ответ Flood control (`TelegramRetryAfter` в aiogram, атрибут
+  `retry_after`) откладывает следующую правку, а не теряет текст;
+- `finish()` дожидается и отправляет итоговый текст целиком.
+
+Sink не зависит от aiogram: правка передаётся функцией `edit(text)`.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+from configs.settings import settings
+from src.ai.openrouter import OpenRouterClient, openrouter_client
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Максимальная длина текста сообщения Telegram
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Сколько раз пытаться отправить итоговый текст при Flood control
+FINAL_EDIT_ATTEMPTS = 3
+
+
+class ThrottledEditSink:
+    """
+    Объединяет фрагменты текста и редактирует сообщение с ограничением частоты.
+
+    Example:
+        placeholder = await message.answer("…")
+        sink = ThrottledEditSink(
+            lambda text: placeholder.edit_text(text),
+            interval=settings.telegram.stream_edit_interval,
+        )
+        async for delta in openrouter_client.stream_completion(messages):
+            sink.feed(delta)
+        await sink.finish()
+    """
+
+    def __init__(
+        self,
+        edit: Callable[[str], Awaitable[Any]],
+        interval: float | None = None,
+        max_length: int = TELEGRAM_MESSAGE_LIMIT,
+    ):
+        """
+        Args:
+            edit: Корутина-функция, заменяющая текст сообщения.
+            interval: Минимальный интервал между правками в секундах
+                (по умолчанию `stream_edit_interval` из настроек Telegram).
+            max_length: Предельная длина текста сообщения; длинный текст
+                обрезается с многоточием.
+        """
+        self._edit = edit
+        self.interval = (
+            settings.telegram.stream_edit_interval if interval is None else interval
+        )
+        self.max_length = max_length
+        self.text = ""
+        self._sent = ""
+        self._next_edit_at = 0.0
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._finished = False
+        self.edits = 0
+        self.flood_waits = 0
+
+    def feed(self, delta: str) -> None:
+        """Добавляет фрагмент текста; правка будет отправлена в фоне."""
+        if self._finished:
+            raise RuntimeError("ThrottledEditSink уже завершён")
+        if not delta:
+            return
+        self.text += delta
+        self._changed.set()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def render(self) -> str:
+        """Текст для сообщения с учётом `max_length`."""
+        if len(self.text) <= self.max_length:
+            return self.text
+        return self.text[: self.max_length - 1] + "…"
+
+    async def _run(self) -> None:
+        """Отправляет накопленный текст не чаще раза в `interval` секунд."""
+        while True:
+            await self._changed.wait()
+            wait = self._next_edit_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)  # Тем временем копятся новые фрагменты
+            self._changed.clear()
+            if not await self._deliver():
+                self._changed.set()  # Повторим после паузы Flood control
+
+    async def _deliver(self) -> bool:
+        """
+        Отправляет текущий текст, если он изменился.
+
+        Returns:
+            bool: False, если правку нужно повторить позже (Flood control).
+        """
+        text = self.render()
+        if text == self._sent or not text.strip():
+            return True
+        try:
+            await self._edit(text)
+        except Exception as e:
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is not None:
+                self.flood_waits += 1
+                self._next_edit_at = time.monotonic() + float(retry_after)
+                logger.debug(
+                    f"Flood control при правке сообщения: ждём {retry_after} с"
+                )
+                return False
+            if "message is not modified" in str(e):
+                self._sent = text
+                return True
+            logger.warning(f"Не удалось обновить сообщение с ответом: {e}")
+            self._next_edit_at = time.monotonic() + self.interval
+            return True
+        self._sent = text
+        self.edits += 1
+        self._next_edit_at = time.monotonic() + self.interval
+        return True
+
+    async def finish(self) -> str:
+        """
+        Останавливает фоновые правки и отправляет итоговый текст.
+
+        Returns:
+            str: Весь накопленный текст (без обрезки).
+        """
+        self._finished = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for _ in range(FINAL_EDIT_ATTEMPTS):
+            wait = self._next_edit_at - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if await self._deliver():
+                break
+        return self.text
+
+
+async def stream_reply(
+    messages: list[dict],
+    edit: Callable[[str], Awaitable[Any]],
+    interval: float | None = None,
+    client: OpenRouterClient | None = None,
+    **overrides: Any,
+) -> str:
+    """
+    Генерирует ответ потоком и показывает его правками сообщения.
+
+    При ошибке генерации уже полученная часть ответа остаётся в сообщении,
+    а исключение пробрасывается вызывающему.
+
+    Args:
+        messages: Сообщения в формате OpenAI (`role`, `content`).
+        edit: Корутина-функция, заменяющая текст сообщения.
+        interval: Минимальный интервал между правками (см. `ThrottledEditSink`).
+        client: Клиент OpenRouter (по умолчанию общий `openrouter_client`).
+        **overrides: Переопределения полей запроса (см. `build_payload`).
+
+    Returns:
+        str: Полный текст ответа.
+    """
+    client = client or openrouter_client
+    sink = ThrottledEditSink(edit, interval=interval)
+    try:
+        async for delta in client.stream_completion(messages, **overrides):
+            sink.feed(delta)
+    finally:
+        await sink.finish()
+    return sink.text
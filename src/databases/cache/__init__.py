@@ -0,0 +1,13 @@
+"""
+Модуль кэшей поверх Redis для горячих путей работы с БД.
+"""
+
+from .dialog import DialogContextCache, dialog_cache
+from .users import UserCache, user_cache
+
+__all__ = [
+    "DialogContextCache",
+    "dialog_cache",
+    "UserCache",
+    "user_cache",
+]
@@ -0,0 +1,353 @@
+"""
+Read-through кэш последних сообщений диалога в Redis.
+
+На каждом ходе бота нужен контекст — последние N сообщений сессии диалога.
+Вместо запроса к SQLite кэш хранит их в Redis-списке
+`dialog:<dialog_session_id>:messages` (не длиннее `max_messages`) в виде
+`MessageRead`, закодированных `src.databases.redis_codec`:
+
+- чтение — `LRANGE` по хвосту списка; при промахе список заполняется из SQLite;
+- запись — новое сообщение дописывается в конец списка (`RPUSHX` + `LTRIM`),
+  только если список уже существует. Общий `dialog_cache` подписан на все
+  вставки `MessageDAO` (`create_message`, `add_many`, `MessageWriteQueue`),
+  поэтому кэш обновляется, каким бы путём ни было записано сообщение;
+- время жизни — `RedisSettings.redis_ttl`, продлевается при каждой записи.
+
+Контекст по бюджету токенов (`get_context_messages`) тоже читается из
+кэша, если бюджет исчерпывается внутри хранимого хвоста; более длинная
+история подбирается в SQLite.
+
+Чтобы заполнение после промаха не затёрло сообщение, записанное во время
+чтения из SQLite, каждая запись увеличивает счётчик версии диалога, а
+заполнение выполняется под `WATCH` этого счётчика. Сообщение, уже
+зафиксированное в SQLite, но ещё не дописанное в кэш, может попасть в список
+дважды (из заполнения и из `append`), поэтому чтение отбрасывает повторы по id.
+
+Если Redis недоступен или не инициализирован, чтение идёт из SQLite.
+"""
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.settings import settings
+from src.databases.dao.message_dao import MessageDAO
+from src.databases.redis import (
+    RedisNotInitializedError,
+    get_redis_client,
+    mark_redis_unavailable,
+    register_cache_prefix,
+)
+from src.databases.redis_codec import CodecError, ModelCodec, get_codec
+from src.databases.sqlite.models import Message
+from src.databases.sqlite.schemas import MessageRead
+from src.utils.logger import get_logger
+from src.utils.tokens import message_tokens
+
+logger = get_logger(__name__)
+
+# Сколько последних сообщений диалога хранится в кэше
+DIALOG_CACHE_SIZE = 30
+
+
+class DialogContextCache:
+    """
+    Кэш последних сообщений диалога.
+
+    Example:
+        messages = await dialog_cache.get_last_messages(session, dialog_session_id)
+
+        message = await dialog_cache.create_message(
+            session, user_id=1, dialog_session_id="abc", role="user", content="Привет"
+        )
+    """
+
+    def __init__(
+        self,
+        client: Redis | None = None,
+        max_messages: int = DIALOG_CACHE_SIZE,
+        ttl: int | None = None,
+        key_prefix: str = "dialog",
+        codec: ModelCodec | None = None,
+    ):
+        """
+        Args:
+            client: Клиент Redis с `decode_responses=False`. По умолчанию —
+                глобальный бинарный клиент из `src.databases.redis`,
+                получаемый при каждом обращении.
+            max_messages: Длина хранимого хвоста диалога.
+            ttl: Время жизни ключей в секундах (по умолчанию `redis_ttl`).
+            key_prefix: Префикс ключей Redis.
+            codec: Кодек сообщений (по умолчанию — из настроек Redis).
+        """
+        self._client = client
+        self.codec = codec or get_codec(MessageRead)
+        self.max_messages = max_messages
+        self.ttl = ttl or settings.database.redis.redis_ttl
+        self.key_prefix = key_prefix
+        self._attached = False
+        # Дописанное в память во время недоступности Redis сбросится в Redis
+        register_cache_prefix(f"{key_prefix}:")
+
+    def attach(self) -> None:
+        """Подписывает кэш на все вставки сообщений через `MessageDAO`."""
+        MessageDAO.add_write_listener(self.on_messages_written)
+        self._attached = True
+
+    def detach(self) -> None:
+        """Отписывает кэш от вставок сообщений."""
+        MessageDAO.remove_write_listener(self.on_messages_written)
+        self._attached = False
+
+    def _messages_key(self, dialog_session_id: str) -> str:
+        """Ключ списка сообщений диалога."""
+        return f"{self.key_prefix}:{dialog_session_id}:messages"
+
+    def _version_key(self, dialog_session_id: str) -> str:
+        """Ключ счётчика версии диалога (меняется при каждой записи)."""
+        return f"{self.key_prefix}:{dialog_session_id}:version"
+
+    async def _get_client(self) -> Redis:
+        """Возвращает явно переданный или глобальный клиент Redis."""
+        return self._client or await get_redis_client(binary=True)
+
+    async def get_last_messages(
+        self, session: AsyncSession, dialog_session_id: str, limit: int | None = None
+    ) -> list[MessageRead]:
+        """
+        Возвращает последние сообщения диалога (от старых к новым).
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy (используется только при промахе).
+            dialog_session_id: ID сессии диалога.
+            limit: Количество сообщений (по умолчанию `max_messages`).
+
+        Returns:
+            Список `MessageRead`.
+        """
+        messages, _ = await self._read_tail(session, dialog_session_id, limit)
+        return messages
+
+    async def _read_tail(
+        self, session: AsyncSession, dialog_session_id: str, limit: int | None
+    ) -> tuple[list[MessageRead], bool]:
+        """
+        Последние сообщения диалога и признак того, что это весь диалог.
+
+        Returns:
+            tuple: Список `MessageRead` (от старых к новым) и True, если
+                в диалоге нет сообщений старше первого из них.
+        """
+        if limit is None:
+            limit = self.max_messages
+        if limit <= 0:
+            return [], False
+        if limit > self.max_messages:
+            # Кэш хранит только хвост диалога — длинную историю читаем из БД
+            messages = await MessageDAO.get_last_messages(
+                session, dialog_session_id, limit=limit
+            )
+            result = [MessageRead.model_validate(message) for message in messages]
+            return result, len(result) < limit
+
+        try:
+            client = await self._get_client()
+            raw_messages = await client.lrange(
+                self._messages_key(dialog_session_id), -limit, -1
+            )
+            if raw_messages:
+                try:
+                    messages = self._decode_unique(raw_messages)
+                except CodecError as e:
+                    # Старая схема или повреждённое значение — заполним заново
+                    logger.warning(f"Кэш диалога {dialog_session_id} не читается: {e}")
+                else:
+                    # Неполный список ещё не обрезался и содержит весь диалог
+                    return messages, len(raw_messages) < limit
+            version = await client.get(self._version_key(dialog_session_id))
+        except RedisNotInitializedError:
+            client = None  # Redis не настроен — кэш не используется
+        except RedisError as e:
+            logger.warning(f"Кэш диалога недоступен, читаем из SQLite: {e}")
+            mark_redis_unavailable(e)
+            client = None
+
+        messages = await MessageDAO.get_last_messages(
+            session, dialog_session_id, limit=self.max_messages
+        )
+        result = [MessageRead.model_validate(message) for message in messages]
+        if client is not None and result:
+            await self._fill(client, dialog_session_id, result, version)
+        complete = len(result) < self.max_messages and len(result) <= limit
+        return result[-limit:], complete
+
+    def _decode_unique(self, raw_messages: list[bytes]) -> list[MessageRead]:
+        """Декодирует список кэша, отбрасывая повторно дописанные сообщения."""
+        messages = []
+        seen = set()
+        for raw in raw_messages:
+            message = self.codec.decode(raw)
+            if message.id not in seen:
+                seen.add(message.id)
+                messages.append(message)
+        return messages
+
+    async def get_context_messages(
+        self,
+        session: AsyncSession,
+        dialog_session_id: str,
+        token_budget: int,
+        message_overhead: int = 0,
+    ) -> list[MessageRead]:
+        """
+        Возвращает хвост диалога, укладывающийся в бюджет токенов.
+
+        Аргументы совпадают с `MessageDAO.get_context_messages`.
+
+        Returns:
+            Список `MessageRead` от старых к новым.
+        """
+        tail, complete = await self._read_tail(session, dialog_session_id, None)
+        used = 0
+        start = len(tail)
+        while start > 0:
+            used += message_tokens(tail[start - 1]) + message_overhead
+            if used > token_budget:
+                break
+            start -= 1
+        if start > 0 or complete:
+            return tail[start:]
+
+        messages = await MessageDAO.get_context_messages(
+            session, dialog_session_id, token_budget, message_overhead
+        )
+        return [MessageRead.model_validate(message) for message in messages]
+
+    async def _fill(
+        self,
+        client: Redis,
+        dialog_session_id: str,
+        messages: list[MessageRead],
+        version: str | bytes | None,
+    ) -> None:
+        """
+        Заполняет список диалога, если с момента промаха не было записей.
+        """
+        messages_key = self._messages_key(dialog_session_id)
+        version_key = self._version_key(dialog_session_id)
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(version_key)
+                if await pipe.get(version_key) != version:
+                    return  # Диалог изменился — данные из SQLite уже неактуальны
+                pipe.multi()
+                pipe.delete(messages_key)
+                pipe.rpush(
+                    messages_key, *(self.codec.encode(message) for message in messages)
+                )
+                pipe.expire(messages_key, self.ttl)
+                await pipe.execute()
+        except WatchError:
+            pass
+        except RedisError as e:
+            logger.warning(f"Не удалось заполнить кэш диалога {dialog_session_id}: {e}")
+
+    async def append(self, message: Message | MessageRead) -> None:
+        """
+        Дописывает только что сохранённое сообщение в кэш диалога.
+
+        Если списка в кэше нет, он не создаётся: его заполнит следующий
+        промах целиком из SQLite.
+        """
+        await self.append_many([message])
+
+    async def append_many(self, messages: list[Message | MessageRead]) -> None:
+        """
+        Дописывает сохранённые сообщения в кэши их диалогов одним конвейером.
+        """
+        by_dialog: dict[str, list[MessageRead]] = {}
+        for message in messages:
+            message = MessageRead.model_validate(message)
+            by_dialog.setdefault(message.dialog_session_id, []).append(message)
+        if not by_dialog:
+            return
+        try:
+            client = await self._get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                for dialog_session_id, dialog_messages in by_dialog.items():
+                    messages_key = self._messages_key(dialog_session_id)
+                    version_key = self._version_key(dialog_session_id)
+                    pipe.incr(version_key)
+                    pipe.expire(version_key, self.ttl)
+                    pipe.rpushx(
+                        messages_key,
+                        *(self.codec.encode(message) for message in dialog_messages),
+                    )
+                    pipe.ltrim(messages_key, -self.max_messages, -1)
+                    pipe.expire(messages_key, self.ttl)
+                await pipe.execute()
+        except RedisNotInitializedError:
+            pass  # Redis не настроен — обновлять нечего
+        except RedisError as e:
+            logger.warning(f"Не удалось обновить кэш диалогов {list(by_dialog)}: {e}")
+            for dialog_session_id in by_dialog:
+                await self.invalidate(dialog_session_id)
+
+    async def on_messages_written(
+        self, messages: list[Message], dialog_session_ids: set[str]
+    ) -> None:
+        """
+        Подписчик `MessageDAO.add_write_listener`: дописывает сообщения в кэш.
+
+        Диалоги, записанные сообщения которых не переданы, сбрасываются.
+        """
+        await self.append_many(messages)
+        for dialog_session_id in dialog_session_ids.difference(
+            message.dialog_session_id for message in messages
+        ):
+            await self.invalidate(dialog_session_id)
+
+    async def invalidate(self, dialog_session_id: str) -> None:
+        """Удаляет кэш диалога (следующее чтение пойдёт в SQLite)."""
+        try:
+            client = await self._get_client()
+            await client.delete(
+                self._messages_key(dialog_session_id),
+                self._version_key(dialog_session_id),
+            )
+        except RedisNotInitializedError:
+            pass
+        except RedisError as e:
+            logger.warning(f"Не удалось сбросить кэш диалога {dialog_session_id}: {e}")
+
+    async def create_message(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        dialog_session_id: str,
+        role: str,
+        content: str,
+        message_type: str = "text",
+    ) -> Message:
+        """
+        Создаёт сообщение через `MessageDAO.create_message` и обновляет кэш.
+
+        Кэш, подписанный через `attach`, обновляет сам `MessageDAO`.
+        Аргументы и результат совпадают с `MessageDAO.create_message`.
+        """
+        message = await MessageDAO.create_message(
+            session,
+            user_id=user_id,
+            dialog_session_id=dialog_session_id,
+            role=role,
+            content=content,
+            message_type=message_type,
+        )
+        if not self._attached:
+            await self.append(message)
+        return message
+
+
+# Общий экземпляр кэша на глобальном клиенте Redis
+dialog_cache = DialogContextCache()
+dialog_cache.attach()
@@ -0,0 +1,322 @@
+"""
+Двухуровневый распределённый кэш пользователей.
+
+При нескольких процессах бота локальный кэш `UserDAO.cache` в каждом из них
+устаревает независимо. `UserCache` решает это так:
+
+1. Локальный LRU/TTL-кэш `UserRead` в процессе — ответ без сетевых запросов.
+2. Redis (`user:tg:<telegram_id>`) — общий для всех процессов уровень.
+3. SQLite через `UserDAO` — при промахе обоих уровней.
+
+При записи через `UserDAO` (`create_user`, `delete_one_by_id`) процесс удаляет
+ключ в Redis и публикует сообщение в канал `cache:users:invalidate`. Каждый
+процесс, подписанный на канал, сбрасывает у себя и `UserCache.local`,
+и `UserDAO.cache`.
+
+Чтобы заполнение Redis после промаха не вернуло данные, прочитанные из
+SQLite до параллельного сброса, сброс увеличивает счётчик версии
+пользователя (`user:tg:<telegram_id>:version`), а заполнение выполняется
+под `WATCH` этого счётчика — как в `DialogContextCache`.
+
+Пока подписка прервана (Redis недоступен), сбросы других процессов не
+доходят: локальные кэши очищаются один раз при обрыве и один раз после
+повторной подписки, а переподписка идёт с экспоненциальной паузой.
+"""
+
+import asyncio
+import random
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from configs.settings import settings
+from src.databases.dao.user_dao import UserDAO
+from src.databases.redis import (
+    RedisNotInitializedError,
+    add_restore_listener,
+    get_redis_client,
+    mark_redis_unavailable,
+    register_cache_prefix,
+    remove_restore_listener,
+)
+from src.databases.redis_codec import CodecError, ModelCodec, get_codec
+from src.databases.sqlite.schemas import UserRead
+from src.utils.logger import get_logger
+from src.utils.ttl_cache import MISSING, TTLCache
+
+logger = get_logger(__name__)
+
+# Значение в Redis для закэшированного отсутствия пользователя
+_NEGATIVE = b"null"
+
+
+class UserCache:
+    """
+    Кэш пользователей: локальный LRU перед Redis с инвалидацией через pub/sub.
+
+    Клиент Redis можно передать явно (например, `fakeredis.FakeAsyncRedis`
+    в тестах; значения бинарные, поэтому `decode_responses=False`), иначе
+    используется глобальный бинарный клиент из `src.databases.redis`.
+
+    Example:
+        await user_cache.start()  # При запуске приложения, после setup_redis()
+        user = await user_cache.get_user(session, telegram_id)
+        await user_cache.stop()
+    """
+
+    def __init__(
+        self,
+        client: Redis | None = None,
+        ttl: int | None = None,
+        channel: str = "cache:users:invalidate",
+        key_prefix: str = "user:tg",
+        codec: ModelCodec | None = None,
+    ):
+        """
+        Args:
+            client: Клиент Redis.
+            ttl: Время жизни ключей Redis в секундах (по умолчанию `redis_ttl`).
+            channel: Канал pub/sub для сообщений об инвалидации.
+            key_prefix: Префикс ключей Redis.
+            codec: Кодек пользователей (по умолчанию — из настроек Redis).
+        """
+        cache_config = settings.database.cache
+        self._client = client
+        self.codec = codec or get_codec(UserRead)
+        self.ttl = ttl or settings.database.redis.redis_ttl
+        self.negative_ttl = cache_config.user_cache_negative_ttl
+        self.channel = channel
+        self.key_prefix = key_prefix
+        register_cache_prefix(f"{key_prefix}:")
+        self.local = TTLCache(
+            maxsize=cache_config.user_cache_size,
+            ttl=cache_config.user_cache_ttl,
+            negative_ttl=cache_config.user_cache_negative_ttl,
+        )
+        # Позволяет отличить собственные сообщения в канале от чужих
+        self.instance_id = uuid.uuid4().hex
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._listener_task: asyncio.Task | None = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def _key(self, telegram_id: int) -> str:
+        """Ключ Redis для пользователя."""
+        return f"{self.key_prefix}:{telegram_id}"
+
+    def _version_key(self, telegram_id: int) -> str:
+        """Ключ счётчика версии пользователя (меняется при каждом сбросе)."""
+        return f"{self.key_prefix}:{telegram_id}:version"
+
+    async def _get_client(self) -> Redis:
+        """Возвращает явно переданный или глобальный клиент Redis."""
+        return self._client or await get_redis_client(binary=True)
+
+    async def get_user(
+        self, session: AsyncSession, telegram_id: int
+    ) -> UserRead | None:
+        """
+        Находит пользователя по Telegram ID: процесс -> Redis -> SQLite.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy (используется только при промахе).
+            telegram_id: Уникальный ID пользователя в Telegram.
+
+        Returns:
+            `UserRead` или None, если пользователь не найден.
+        """
+        cached = self.local.get(telegram_id)
+        if cached is not MISSING:
+            return cached
+
+        version = None
+        try:
+            client = await self._get_client()
+            raw = await client.get(self._key(telegram_id))
+            if raw is None:
+                version = await client.get(self._version_key(telegram_id))
+        except RedisNotInitializedError:
+            client, raw = None, None  # Redis не настроен — только процесс и SQLite
+        except RedisError as e:
+            logger.warning(f"Кэш пользователей в Redis недоступен: {e}")
+            mark_redis_unavailable(e)
+            client, raw = None, None
+
+        if raw is not None:
+            try:
+                user = None if raw == _NEGATIVE else self.codec.decode(raw)
+            except CodecError as e:
+                logger.warning(f"Пользователь {telegram_id} в Redis не читается: {e}")
+            else:
+                self.redis_hits += 1
+                self.local.set(telegram_id, user)
+                return user
+
+        self.redis_misses += 1
+        db_user = await UserDAO.get_user_by_telegram_id(session, telegram_id)
+        user = UserRead.model_validate(db_user) if db_user else None
+        self.local.set(telegram_id, user)
+        if client is not None and (user is not None or self.negative_ttl):
+            # negative_ttl = 0 отключает негативный кэш
+            await self._fill(client, telegram_id, user, version)
+        return user
+
+    async def _fill(
+        self,
+        client: Redis,
+        telegram_id: int,
+        user: UserRead | None,
+        version: str | bytes | None,
+    ) -> None:
+        """
+        Сохраняет пользователя в Redis, если с момента промаха не было сбросов.
+        """
+        version_key = self._version_key(telegram_id)
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(version_key)
+                if await pipe.get(version_key) != version:
+                    return  # Пользователь сброшен — данные из SQLite устарели
+                pipe.multi()
+                if user is None:
+                    pipe.set(self._key(telegram_id), _NEGATIVE, ex=self.negative_ttl)
+                else:
+                    pipe.set(
+                        self._key(telegram_id), self.codec.encode(user), ex=self.ttl
+                    )
+                await pipe.execute()
+        except WatchError:
+            pass
+        except RedisError as e:
+            logger.warning(f"Не удалось сохранить пользователя в Redis: {e}")
+
+    async def invalidate(self, telegram_id: int) -> None:
+        """
+        Сбрасывает пользователя во всех процессах: локально, в Redis и через pub/sub.
+        """
+        self.local.invalidate(telegram_id)
+        version_key = self._version_key(telegram_id)
+        try:
+            client = await self._get_client()
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.incr(version_key)
+                pipe.expire(version_key, max(self.ttl, self.negative_ttl))
+                pipe.delete(self._key(telegram_id))
+                await pipe.execute()
+            await client.publish(self.channel, f"{self.instance_id}:{telegram_id}")
+        except RedisNotInitializedError:
+            pass  # Без Redis других процессов-подписчиков нет
+        except RedisError as e:
+            logger.warning(f"Не удалось разослать инвалидацию пользователя: {e}")
+
+    def _on_dao_invalidate(self, telegram_id: int) -> None:
+        """
+        Обработчик сброса из `UserDAO`: локально сразу, в Redis — фоновой задачей.
+        """
+        self.local.invalidate(telegram_id)
+        task = asyncio.get_running_loop().create_task(self.invalidate(telegram_id))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def start(self) -> None:
+        """
+        Подписывается на сбросы `UserDAO` и на канал инвалидации в Redis.
+        """
+        UserDAO.add_invalidation_listener(self._on_dao_invalidate)
+        # Сбросы, сделанные во время недоступности Redis, не дошли до Redis
+        add_restore_listener(self._clear_local)
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(
+                self._listen(), name="user-cache-invalidation"
+            )
+
+    async def stop(self) -> None:
+        """Отписывается от сбросов и дожидается отправки уже начатых."""
+        UserDAO.remove_invalidation_listener(self._on_dao_invalidate)
+        remove_restore_listener(self._clear_local)
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        """
+        Слушает канал инвалидации; после разрыва соединения переподписывается.
+
+        Пауза между попытками растёт от `redis_reconnect_min_delay` до
+        `redis_reconnect_max_delay`; предупреждение пишется один раз за обрыв.
+        """
+        redis_config = settings.database.redis
+        delay = redis_config.redis_reconnect_min_delay
+        interrupted = False
+        while True:
+            try:
+                client = await self._get_client()
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    if interrupted:
+                        # Сбросы, разосланные во время обрыва, пропущены
+                        self._clear_local()
+                        interrupted = False
+                        logger.info(
+                            "Подписка на инвалидацию пользователей восстановлена"
+                        )
+                    delay = redis_config.redis_reconnect_min_delay
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._apply_remote_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, RedisNotInitializedError) as e:
+                if not interrupted:
+                    logger.warning(
+                        f"Подписка на инвалидацию пользователей прервана: {e}"
+                    )
+                    self._clear_local()
+                    interrupted = True
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, redis_config.redis_reconnect_max_delay)
+
+    def _clear_local(self) -> None:
+        """Очищает кэши процесса: `UserCache.local` и `UserDAO.cache`."""
+        self.local.clear()
+        UserDAO.cache.clear()
+
+    def _apply_remote_invalidation(self, data: str | bytes) -> None:
+        """Применяет сообщение `<instance_id>:<telegram_id>` из канала."""
+        if isinstance(data, bytes):
+            data = data.decode()
+        sender, _, telegram_id = data.partition(":")
+        if sender == self.instance_id:
+            return  # Собственный сброс уже применён локально
+        try:
+            telegram_id = int(telegram_id)
+        except ValueError:
+            logger.warning(f"Некорректное сообщение инвалидации: {data!r}")
+            return
+        self.local.invalidate(telegram_id)
+        UserDAO.invalidate_cache(telegram_id, notify=False)
+
+    def stats(self) -> dict:
+        """
+        Счётчики обоих уровней кэша.
+
+        Returns:
+            dict: Статистика локального уровня и попадания/промахи Redis.
+        """
+        return {
+            "local": self.local.stats(),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+        }
+
+
+# Общий экземпляр кэша на глобальном клиенте Redis
+user_cache = UserCache()
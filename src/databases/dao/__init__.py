@@ -4,10 +4,12 @@
 
 from .base import BaseDAO
 from .message_dao import MessageDAO
+from .message_writer import MessageWriteQueue
 from .user_dao import UserDAO
 
 __all__ = [
     "BaseDAO",
     "UserDAO",
     "MessageDAO",
+    "MessageWriteQueue",
 ]
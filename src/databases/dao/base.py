@@ -4,9 +4,13 @@
 Содержит общие методы для добавления записей в БД.
 """
 
+from sqlalchemy import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Размер порции для пакетной вставки в режиме bulk
+BULK_CHUNK_SIZE = 1000
+
 
 class BaseDAO:
     """
@@ -40,17 +44,37 @@ class BaseDAO:
         return new_instance
 
     @classmethod
-    async def add_many(cls, session: AsyncSession, instances: list[dict]):
+    async def add_many(
+        cls,
+        session: AsyncSession,
+        instances: list[dict],
+        bulk: bool = False,
+        hydrate: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ):
         """
         Добавляет несколько записей в БД.
 
+        По умолчанию создаёт ORM-объект на каждую запись и проходит через
+        unit of work сессии. В режиме `bulk=True` каждая порция из `chunk_size`
+        записей отправляется одним `INSERT ... RETURNING` (executemany),
+        минуя unit of work.
+
         Args:
             session: Асинхронная сессия SQLAlchemy.
             instances: Список словарей с полями для создания записей.
+            bulk: Использовать пакетную вставку через Core `insert()`.
+            hydrate: Только для `bulk=True`. Если False — возвращает лишь ID
+                новых записей, не создавая ORM-объекты.
+            chunk_size: Только для `bulk=True`. Размер одной порции вставки.
 
         Returns:
-            Список новых экземпляров модели.
+            Список новых экземпляров модели или список их ID
+            (при `bulk=True, hydrate=False`).
         """
+        if bulk:
+            return await cls._bulk_insert(session, instances, hydrate, chunk_size)
+
         new_instances = [cls.model(**values) for values in instances]
         session.add_all(new_instances)
         try:
@@ -60,6 +84,48 @@ class BaseDAO:
             raise e
         return new_instances
 
+    @classmethod
+    async def _bulk_insert(
+        cls,
+        session: AsyncSession,
+        instances: list[dict],
+        hydrate: bool,
+        chunk_size: int,
+    ) -> list:
+        """
+        Пакетная вставка через `INSERT ... RETURNING` одной транзакцией.
+
+        Все записи должны содержать одинаковый набор ключей, иначе
+        SQLAlchemy разобьёт executemany на несколько групп. Результат
+        возвращается в порядке `instances`, если ID генерирует сама БД.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size должен быть положительным")
+        if not instances:
+            return []
+
+        returning = cls.model if hydrate else cls.model.id
+        statement = insert(cls.model).returning(returning)
+        results = []
+        try:
+            for start in range(0, len(instances), chunk_size):
+                chunk = instances[start : start + chunk_size]
+                rows = (await session.scalars(statement, chunk)).all()
+                # sort_by_parameter_order=True заставляет SQLAlchemy вставлять
+                # по одной строке. Вместо этого восстанавливаем порядок входных
+                # данных по автоинкрементному ID: в одной транзакции SQLite
+                # выдаёт ID строго по порядку вставки.
+                if hydrate:
+                    rows.sort(key=lambda instance: instance.id)
+                else:
+                    rows.sort()
+                results.extend(rows)
+            await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            raise e
+        return results
+
     @classmethod
     async def find_one_or_none_by_id(cls, session: AsyncSession, data_id: int):
         """
@@ -2,13 +2,29 @@
 DAO (Data Access Object) для работы с сообщениями в базе данных.
 
 Содержит методы для создания, поиска и удаления сообщений.
+
+Все вставки сообщений (`add`, `create_message`, `add_many`, в том числе из
+`MessageWriteQueue`) после фиксации оповещают подписчиков
+`add_write_listener` — так кэш диалогов не отстаёт от SQLite.
 """
 
-from sqlalchemy import select
+from typing import AsyncIterator, Awaitable, Callable, ClassVar
+
+from sqlalchemy import Row, and_, inspect, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.databases.dao.base import BaseDAO
+from src.databases.dao.base import BULK_CHUNK_SIZE, BaseDAO
 from src.databases.sqlite.models import Message
+from src.utils.logger import get_logger
+from src.utils.tokens import message_tokens
+
+logger = get_logger(__name__)
+
+# Размер страницы по умолчанию для потокового чтения истории
+STREAM_CHUNK_SIZE = 500
+
+# Размер страницы при подборе контекста диалога по бюджету токенов
+CONTEXT_PAGE_SIZE = 50
 
 
 class MessageDAO(BaseDAO):
@@ -16,6 +32,87 @@ class MessageDAO(BaseDAO):
 
     model = Message
 
+    # Подписчики на запись сообщений: listener(messages, dialog_session_ids)
+    _write_listeners: ClassVar[
+        list[Callable[[list[Message], set[str]], Awaitable[None]]]
+    ] = []
+
+    @classmethod
+    async def add(cls, session: AsyncSession, **values) -> Message:
+        """
+        Добавляет одно сообщение и оповещает подписчиков записи.
+
+        Аргументы совпадают с `BaseDAO.add`.
+        """
+        message = await super().add(session, **values)
+        await cls._notify_written([message], {values["dialog_session_id"]})
+        return message
+
+    @classmethod
+    async def add_many(
+        cls,
+        session: AsyncSession,
+        instances: list[dict],
+        bulk: bool = False,
+        hydrate: bool = True,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> list:
+        """
+        Добавляет несколько сообщений и оповещает подписчиков записи.
+
+        Аргументы и результат совпадают с `BaseDAO.add_many`.
+        """
+        result = await super().add_many(session, instances, bulk, hydrate, chunk_size)
+        messages = [item for item in result if isinstance(item, Message)]
+        dialog_session_ids = {values["dialog_session_id"] for values in instances}
+        await cls._notify_written(messages, dialog_session_ids)
+        return result
+
+    @classmethod
+    def add_write_listener(
+        cls, listener: Callable[[list[Message], set[str]], Awaitable[None]]
+    ) -> None:
+        """
+        Подписывает корутину `listener(messages, dialog_session_ids)` на запись.
+
+        `messages` — записанные сообщения с загруженными полями; диалоги из
+        `dialog_session_ids`, сообщений которых в `messages` нет (вставка без
+        гидрации или объекты, устаревшие после commit), подписчик должен
+        считать изменёнными целиком.
+        """
+        if listener not in cls._write_listeners:
+            cls._write_listeners.append(listener)
+
+    @classmethod
+    def remove_write_listener(
+        cls, listener: Callable[[list[Message], set[str]], Awaitable[None]]
+    ) -> None:
+        """Отписывает корутину от записи сообщений."""
+        if listener in cls._write_listeners:
+            cls._write_listeners.remove(listener)
+
+    @classmethod
+    async def _notify_written(
+        cls, messages: list[Message], dialog_session_ids: set[str]
+    ) -> None:
+        """
+        Оповещает подписчиков о зафиксированной записи.
+
+        Ошибка подписчика не отменяет уже зафиксированную запись и только
+        логируется.
+        """
+        if not cls._write_listeners:
+            return
+        # При expire_on_commit=True поля не загрузить без запроса к БД
+        loaded = [
+            message for message in messages if not inspect(message).expired_attributes
+        ]
+        for listener in cls._write_listeners:
+            try:
+                await listener(loaded, dialog_session_ids)
+            except Exception as e:
+                logger.error(f"Ошибка подписчика записи сообщений: {e}")
+
     @classmethod
     async def create_message(
         cls,
@@ -62,18 +159,92 @@ class MessageDAO(BaseDAO):
             limit: Максимальное количество сообщений для возврата (по умолчанию 30).
 
         Returns:
-            Список сообщений, отсортированных по времени в порядке убывания.
+            Список сообщений, отсортированных по времени (от старых к новым).
         """
-        query = (
-            select(cls.model)
-            .where(cls.model.dialog_session_id == dialog_session_id)
-            .order_by(cls.model.timestamp.desc())
-            .limit(limit)
+        result = await session.execute(
+            cls._last_messages_query(dialog_session_id, limit)
         )
-        result = await session.execute(query)
-        # Возвращаем в прямом порядке (от старых к новым), так как инвертировали при выборке
+        # Индекс отдаёт строки от новых к старым; разворот — O(limit) в памяти
         return result.scalars().all()[::-1]
 
+    @classmethod
+    async def get_context_messages(
+        cls,
+        session: AsyncSession,
+        dialog_session_id: str,
+        token_budget: int,
+        message_overhead: int = 0,
+        page_size: int = CONTEXT_PAGE_SIZE,
+    ) -> list[Message]:
+        """
+        Получает хвост диалога, укладывающийся в бюджет токенов.
+
+        Сообщения выбираются от новых к старым страницами по `page_size`
+        (keyset-пагинация по индексу диалога), пока следующее сообщение
+        не превысит бюджет. Длина берётся из `Message.token_count`,
+        поэтому история не токенизируется заново.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy.
+            dialog_session_id: ID сессии диалога.
+            token_budget: Бюджет токенов на сообщения истории.
+            message_overhead: Служебные токены на каждое сообщение.
+            page_size: Количество сообщений в одном запросе.
+
+        Returns:
+            Список сообщений, отсортированных по времени (от старых к новым).
+        """
+        if page_size < 1:
+            raise ValueError("page_size должен быть положительным")
+
+        selected: list[Message] = []
+        used = 0
+        before_timestamp = None
+        before_id = None
+        while True:
+            result = await session.execute(
+                cls._last_messages_query(
+                    dialog_session_id, page_size, before_timestamp, before_id
+                )
+            )
+            page = result.scalars().all()
+            for message in page:
+                used += message_tokens(message) + message_overhead
+                if used > token_budget:
+                    return selected[::-1]
+                selected.append(message)
+            if len(page) < page_size:
+                return selected[::-1]
+            before_timestamp, before_id = page[-1].timestamp, page[-1].id
+
+    @classmethod
+    def _last_messages_query(
+        cls,
+        dialog_session_id: str,
+        limit: int,
+        before_timestamp=None,
+        before_id: int | None = None,
+    ):
+        """
+        Запрос последних сообщений диалога (старше `(before_timestamp, before_id)`,
+        если курсор задан).
+
+        Порядок `timestamp DESC, id DESC` совпадает с составным индексом
+        `ix_messages_dialog_session_id_timestamp_id`, поэтому SQLite читает
+        первые `limit` строк индекса без сортировки во временном B-дереве.
+        """
+        model = cls.model
+        query = select(model).where(model.dialog_session_id == dialog_session_id)
+        if before_id is not None:
+            # Строго «до» последней выданной строки
+            query = query.where(
+                or_(
+                    model.timestamp < before_timestamp,
+                    and_(model.timestamp == before_timestamp, model.id < before_id),
+                )
+            )
+        return query.order_by(model.timestamp.desc(), model.id.desc()).limit(limit)
+
     @classmethod
     async def get_all_messages_by_user(
         cls, session: AsyncSession, user_id: int
@@ -111,3 +282,135 @@ class MessageDAO(BaseDAO):
         )
         result = await session.execute(query)
         return result.scalars().all()
+
+    @classmethod
+    async def stream_messages_by_user(
+        cls,
+        session: AsyncSession,
+        user_id: int,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        as_rows: bool = False,
+    ) -> AsyncIterator[list[Message] | list[Row]]:
+        """
+        Потоково читает все сообщения пользователя порциями фиксированного размера.
+
+        В отличие от `get_all_messages_by_user`, не загружает всю историю в память:
+        каждая порция выбирается keyset-пагинацией по `(timestamp, id)`, поэтому
+        пиковое потребление памяти ограничено размером `chunk_size`.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy.
+            user_id: ID пользователя.
+            chunk_size: Количество сообщений в одной порции.
+            as_rows: Если True — возвращает лёгкие кортежи `Row` вместо ORM-объектов.
+
+        Yields:
+            Списки сообщений (не длиннее `chunk_size`) в хронологическом порядке.
+
+        Example:
+            async for chunk in MessageDAO.stream_messages_by_user(session, user_id=1):
+                for message in chunk:
+                    ...
+        """
+        async for chunk in cls._stream_keyset(
+            session, cls.model.user_id == user_id, chunk_size, as_rows
+        ):
+            yield chunk
+
+    @classmethod
+    async def stream_messages_by_session(
+        cls,
+        session: AsyncSession,
+        dialog_session_id: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        as_rows: bool = False,
+    ) -> AsyncIterator[list[Message] | list[Row]]:
+        """
+        Потоково читает все сообщения сессии диалога порциями фиксированного размера.
+
+        Потоковый аналог `get_messages_by_session` с keyset-пагинацией
+        по `(timestamp, id)`.
+
+        Args:
+            session: Асинхронная сессия SQLAlchemy.
+            dialog_session_id: ID сессии диалога.
+            chunk_size: Количество сообщений в одной порции.
+            as_rows: Если True — возвращает лёгкие кортежи `Row` вместо ORM-объектов.
+
+        Yields:
+            Списки сообщений (не длиннее `chunk_size`) в хронологическом порядке.
+        """
+        async for chunk in cls._stream_keyset(
+            session,
+            cls.model.dialog_session_id == dialog_session_id,
+            chunk_size,
+            as_rows,
+        ):
+            yield chunk
+
+    @classmethod
+    async def _stream_keyset(
+        cls,
+        session: AsyncSession,
+        criteria,
+        chunk_size: int,
+        as_rows: bool,
+    ) -> AsyncIterator[list[Message] | list[Row]]:
+        """
+        Общая реализация keyset-пагинации по `(timestamp, id)`.
+
+        Каждая страница — отдельный запрос `... WHERE (timestamp, id) > (:ts, :id)
+        ORDER BY timestamp, id LIMIT :chunk_size`, выполняемый через
+        `session.stream()`. В отличие от OFFSET, стоимость запроса не растёт
+        с номером страницы.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size должен быть положительным")
+
+        last_timestamp = None
+        last_id = None
+        while True:
+            query = cls._keyset_page_query(
+                criteria, chunk_size, last_timestamp, last_id, as_rows
+            )
+            result = await session.stream(query)
+            if as_rows:
+                chunk = [row async for row in result]
+            else:
+                chunk = [message async for message in result.scalars()]
+
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+
+            last_timestamp, last_id = chunk[-1].timestamp, chunk[-1].id
+
+    @classmethod
+    def _keyset_page_query(
+        cls,
+        criteria,
+        chunk_size: int,
+        last_timestamp=None,
+        last_id: int | None = None,
+        as_rows: bool = False,
+    ):
+        """
+        Запрос страницы keyset-пагинации, следующей за `(last_timestamp, last_id)`.
+        """
+        model = cls.model
+        if as_rows:
+            query = select(*model.__table__.columns)
+        else:
+            query = select(model)
+        query = query.where(criteria)
+        if last_id is not None:
+            # Строго «после» последней выданной строки
+            query = query.where(
+                or_(
+                    model.timestamp > last_timestamp,
+                    and_(model.timestamp == last_timestamp, model.id > last_id),
+                )
+            )
+        return query.order_by(model.timestamp, model.id).limit(chunk_size)
@@ -0,0 +1,231 @@
+"""
+Очередь пакетной записи сообщений.
+
+`MessageDAO.create_message` фиксирует каждое сообщение отдельной транзакцией,
+то есть одним fsync на строку чата. `MessageWriteQueue` копит сообщения и
+записывает их одной транзакцией через `MessageDAO.add_many(bulk=True)`:
+каждые `batch_size` сообщений или раз в `flush_interval_ms` миллисекунд.
+
+Использование опционально: код, которому важна задержка одной записи,
+может и дальше вызывать `MessageDAO.create_message` напрямую.
+
+Запись порции идёт через `core.write_session` из фоновой задачи, поэтому
+ожидать future из `enqueue` внутри своей сессии записи (в том числе в
+функции с `@connection` без `readonly=True`) нельзя: фоновая задача ждёт
+ту же блокировку писателя, и обе стороны зависают.
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+from configs.settings import settings
+from src.databases.dao.message_dao import MessageDAO
+from src.databases.sqlite import core
+from src.databases.sqlite.models import Message
+from src.databases.sqlite.models.message import utc_now
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _PendingMessage:
+    """Сообщение в очереди вместе с future, который получит результат записи."""
+
+    values: dict
+    future: asyncio.Future
+
+
+class MessageWriteQueue:
+    """
+    Асинхронная очередь записи сообщений с объединением в транзакции.
+
+    Фоновая задача забирает сообщения из ограниченной очереди и пишет их
+    пачками. Если очередь заполнена, `enqueue` ожидает освобождения места,
+    тем самым замедляя источник (backpressure).
+
+    Example:
+        writer = MessageWriteQueue()
+        await writer.start()
+
+        future = await writer.enqueue(
+            user_id=1, dialog_session_id="abc", role="user", content="Привет"
+        )
+        message = await future  # Message после фиксации транзакции
+
+        await writer.stop()  # Дописывает остаток очереди
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: int | None = None,
+        flush_interval_ms: int | None = None,
+        max_queue_size: int | None = None,
+    ):
+        """
+        Args:
+            session_factory: Фабрика асинхронных сессий. По умолчанию —
+                `src.databases.sqlite.core.write_session` (под блокировкой
+                единственного писателя).
+            batch_size: Максимум сообщений в одной транзакции.
+            flush_interval_ms: Максимальная задержка записи первого
+                сообщения порции, мс.
+            max_queue_size: Ёмкость очереди.
+
+        Значения, не переданные явно, берутся из `settings.database.sqlite`.
+        """
+        sqlite_config = settings.database.sqlite
+        self._session_factory = session_factory
+        self.batch_size = batch_size or sqlite_config.write_batch_size
+        self.flush_interval = (
+            flush_interval_ms or sqlite_config.write_flush_interval_ms
+        ) / 1000
+        self._queue: asyncio.Queue[_PendingMessage | None] = asyncio.Queue(
+            maxsize=max_queue_size or sqlite_config.write_queue_size
+        )
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    @property
+    def is_running(self) -> bool:
+        """True, если фоновая задача записи запущена."""
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Запускает фоновую задачу записи."""
+        if self.is_running:
+            return
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="message-write-queue")
+        logger.info("Очередь записи сообщений запущена.")
+
+    async def stop(self) -> None:
+        """
+        Останавливает очередь, предварительно записав все накопленные сообщения.
+        """
+        if not self.is_running:
+            return
+        self._closing = True
+        await self._queue.put(None)  # Сигнал завершения после остатка очереди
+        await self._task
+        self._task = None
+        logger.info("Очередь записи сообщений остановлена.")
+
+    async def enqueue(
+        self,
+        user_id: int,
+        dialog_session_id: str,
+        role: str,
+        content: str,
+        message_type: str = "text",
+    ) -> asyncio.Future:
+        """
+        Ставит сообщение в очередь на запись.
+
+        Аргументы совпадают с `MessageDAO.create_message`.
+
+        Returns:
+            Future, который разрешится экземпляром `Message` после фиксации
+            транзакции или исключением, если запись не удалась.
+
+        Raises:
+            RuntimeError: Если очередь не запущена или останавливается, а
+                также при вызове изнутри сессии записи текущей задачи
+                (ожидание такого future — взаимоблокировка).
+        """
+        if not self.is_running or self._closing:
+            raise RuntimeError("Message write queue is not running. Call start first.")
+        if self._session_factory is None and core.current_write_session() is not None:
+            raise RuntimeError(
+                "Message write queue cannot be awaited inside a write session."
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(
+            _PendingMessage(
+                values={
+                    "user_id": user_id,
+                    "dialog_session_id": dialog_session_id,
+                    "role": role,
+                    "content": content,
+                    "message_type": message_type,
+                    # Время поступления, а не записи порции в БД
+                    "timestamp": utc_now(),
+                },
+                future=future,
+            )
+        )
+        if not self.is_running and not future.done():
+            # Задача записи завершилась, пока ждали места в очереди
+            future.set_exception(RuntimeError("Message write queue has stopped."))
+        return future
+
+    async def _run(self) -> None:
+        """Основной цикл: собирает порцию по размеру/таймауту и записывает её."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        batch: list[_PendingMessage] = []
+        try:
+            while not stopping:
+                item = await self._queue.get()
+                if item is None:
+                    break
+
+                batch = [item]
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                await self._flush(batch)
+                batch = []
+        finally:
+            # Отмена или сбой задачи: вызывающие не должны ждать вечно
+            self._fail_pending(batch)
+
+    def _fail_pending(self, batch: list[_PendingMessage]) -> None:
+        """
+        Завершает ошибкой futures незаписанной порции и остатка очереди.
+        """
+        pending = list(batch)
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                pending.append(item)
+        unresolved = [item for item in pending if not item.future.done()]
+        if not unresolved:
+            return
+        logger.error(
+            f"Очередь записи остановлена, не записано {len(unresolved)} сообщений."
+        )
+        for item in unresolved:
+            item.future.set_exception(RuntimeError("Message write queue has stopped."))
+
+    async def _flush(self, batch: list[_PendingMessage]) -> None:
+        """Записывает порцию одной транзакцией и разрешает futures вызывающих."""
+        session_factory = self._session_factory or core.write_session
+        try:
+            async with session_factory() as session:
+                messages: list[Message] = await MessageDAO.add_many(
+                    session, [pending.values for pending in batch], bulk=True
+                )
+        except Exception as e:
+            logger.error(f"Не удалось записать {len(batch)} сообщений: {e}")
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for pending, message in zip(batch, messages):
+            if not pending.future.done():
+                pending.future.set_result(message)
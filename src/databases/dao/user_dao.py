@@ -2,13 +2,24 @@
 DAO (Data Access Object) для работы с пользователями в базе данных.
 
 Содержит методы для создания, поиска и обновления пользователей.
+
+Поиск по Telegram ID выполняется на каждом входящем обновлении, поэтому
+результаты (в том числе промахи) кэшируются в процессе в `UserDAO.cache`.
+Изменение и удаление пользователя через ORM (в том числе объекта, полученного
+из кэша через `merge`) сбрасывает его запись: обработчики событий маппера
+`after_update` и `after_delete` срабатывают при flush.
 """
 
-from sqlalchemy import select
+from typing import Callable, ClassVar
+
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import attributes, make_transient_to_detached
 
+from configs.settings import settings
 from src.databases.dao.base import BaseDAO
 from src.databases.sqlite.models import User
+from src.utils.ttl_cache import MISSING, TTLCache
 
 
 class UserDAO(BaseDAO):
@@ -16,6 +27,16 @@ class UserDAO(BaseDAO):
 
     model = User
 
+    # Кэш telegram_id -> отсоединённый снимок User (или None для промаха)
+    cache = TTLCache(
+        maxsize=settings.database.cache.user_cache_size,
+        ttl=settings.database.cache.user_cache_ttl,
+        negative_ttl=settings.database.cache.user_cache_negative_ttl,
+    )
+
+    # Подписчики на сброс записей кэша (например, межпроцессная инвалидация)
+    _invalidation_listeners: ClassVar[list[Callable[[int], None]]] = []
+
     @classmethod
     async def create_user(
         cls,
@@ -36,9 +57,16 @@ class UserDAO(BaseDAO):
         Returns:
             Новый экземпляр модели User.
         """
-        return await cls.add(
+        user = await cls.add(
             session, telegram_id=telegram_id, first_name=first_name, username=username
         )
+        if inspect(user).expired_attributes:
+            # expire_on_commit=True: ленивую загрузку в async сессии не сделать
+            await session.refresh(user)
+        # Заменяем возможную негативную запись о пользователе
+        cls.invalidate_cache(telegram_id)
+        cls.cache.set(telegram_id, cls._snapshot(user))
+        return user
 
     @classmethod
     async def get_user_by_telegram_id(
@@ -47,6 +75,9 @@ class UserDAO(BaseDAO):
         """
         Находит пользователя по его Telegram ID.
 
+        Сначала проверяет in-memory кэш: найденный снимок присоединяется
+        к сессии через `session.merge(load=False)` без запроса к БД.
+
         Args:
             session: Асинхронная сессия SQLAlchemy.
             telegram_id: Уникальный ID пользователя в Telegram.
@@ -54,8 +85,77 @@ class UserDAO(BaseDAO):
         Returns:
             Экземпляр модели User или None, если пользователь не найден.
         """
-        # Используем существующий метод BaseDAO, предполагая, что telegram_id уникален
-        # Или напишем специфичный запрос
+        cached = cls.cache.get(telegram_id)
+        if cached is not MISSING:
+            if cached is None:
+                return None
+            return await session.merge(cached, load=False)
+
         query = select(cls.model).where(cls.model.telegram_id == telegram_id)
         result = await session.execute(query)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        cls.cache.set(telegram_id, cls._snapshot(user) if user else None)
+        return user
+
+    @classmethod
+    async def delete_one_by_id(cls, session: AsyncSession, data_id: int):
+        """
+        Удаляет одного пользователя по ID и сбрасывает его запись в кэше.
+        """
+        user = await super().delete_one_by_id(session, data_id)
+        if user:
+            cls.invalidate_cache(user.telegram_id)
+        return user
+
+    @classmethod
+    def invalidate_cache(cls, telegram_id: int, notify: bool = True) -> None:
+        """
+        Удаляет пользователя из кэша (следующий поиск пойдёт в БД).
+
+        Args:
+            telegram_id: Telegram ID пользователя.
+            notify: Оповестить подписчиков `add_invalidation_listener`.
+                False — для сбросов, пришедших от других процессов.
+        """
+        cls.cache.invalidate(telegram_id)
+        if notify:
+            for listener in cls._invalidation_listeners:
+                listener(telegram_id)
+
+    @classmethod
+    def add_invalidation_listener(cls, listener: Callable[[int], None]) -> None:
+        """Подписывает функцию `listener(telegram_id)` на сбросы кэша."""
+        if listener not in cls._invalidation_listeners:
+            cls._invalidation_listeners.append(listener)
+
+    @classmethod
+    def remove_invalidation_listener(cls, listener: Callable[[int], None]) -> None:
+        """Отписывает функцию от сбросов кэша."""
+        if listener in cls._invalidation_listeners:
+            cls._invalidation_listeners.remove(listener)
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """Счётчики кэша пользователей (попадания, промахи, вытеснения)."""
+        return cls.cache.stats()
+
+    @classmethod
+    def _snapshot(cls, user: User) -> User:
+        """
+        Создаёт отсоединённую от сессии копию пользователя для кэша.
+
+        Копия не связана с исходной сессией, поэтому её не затронут
+        незафиксированные изменения, а `merge(load=False)` не делает SELECT.
+        """
+        snapshot = cls.model(**user.to_dict())
+        make_transient_to_detached(snapshot)
+        return snapshot
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    """Сбрасывает кэш пользователя, изменённого или удалённого при flush."""
+    history = attributes.get_history(target, "telegram_id")
+    for telegram_id in (*history.unchanged, *history.added, *history.deleted):
+        UserDAO.invalidate_cache(telegram_id)
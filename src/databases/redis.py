@@ -3,13 +3,39 @@
 
 Содержит:
 - redis_client: глобальный асинхронный клиент Redis.
+- redis_binary_client: клиент на отдельном пуле без декодирования ответов
+  (для значений, закодированных `src.databases.redis_codec`).
 - get_redis_client: функцию для получения клиента (может быть использована как зависимость в FastAPI, если понадобится).
 - setup_redis: асинхронную функцию для инициализации клиента при запуске приложения.
 - close_redis: асинхронную функцию для закрытия клиента при завершении приложения.
+- get_redis_pool_stats: статистику пула соединений (занятые, свободные, ожидание).
+
+Деградированный режим: если Redis недоступен при запуске или перестаёт
+отвечать, `get_redis_client` отдаёт `InMemoryRedis` — ограниченное хранилище
+в памяти процесса с тем же асинхронным интерфейсом (подмножество команд).
+Фоновая задача переподключается с экспоненциальной паузой и, как только
+Redis снова отвечает, возвращает клиент Redis. Включается настройкой
+`redis_fallback_enabled`.
+
+Записи и сбросы, выполненные во время деградации, в Redis не попали, поэтому
+перед возвратом в нормальный режим ключи, изменённые в памяти, удаляются
+из Redis (при переполнении журнала — все ключи префиксов, зарегистрированных
+`register_cache_prefix`), а обработчики `add_restore_listener` очищают
+локальные кэши процесса.
 """
 
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from typing import Callable
+
 import redis.asyncio as redis
 from redis.asyncio import Redis
+from redis.asyncio.connection import BlockingConnectionPool
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError, ResponseError, WatchError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from configs.settings import settings
 from src.utils.logger import get_logger
@@ -19,45 +45,637 @@ logger = get_logger(__name__)
 # Глобальная переменная для клиента Redis
 redis_client: Redis | None = None
 
+# Клиент, возвращающий байты (decode_responses=False)
+redis_binary_client: Redis | None = None
+
+# Хранилища в памяти, пока Redis недоступен (None — нормальный режим)
+fallback_client: "InMemoryRedis | None" = None
+fallback_binary_client: "InMemoryRedis | None" = None
+
+# Фоновая задача проверки доступности и переподключения
+_supervisor_task: asyncio.Task | None = None
+
+# Сколько изменённых ключей запоминает хранилище в памяти
+WRITTEN_KEYS_LIMIT = 100_000
+
+# Префиксы ключей кэшей — сбрасываются целиком, если журнал переполнился
+_cache_prefixes: set[str] = set()
+
+# Обработчики возврата в нормальный режим (очистка локальных кэшей)
+_restore_listeners: list[Callable[[], None]] = []
+
+
+class RedisNotInitializedError(RuntimeError):
+    """
+    Клиент Redis ещё не создан (`setup_redis` не вызывался).
+
+    Кэши поверх Redis обрабатывают её как недоступность Redis — промахом.
+    """
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Ограниченный пул соединений Redis со счётчиками ожидания.
+
+    Как и `BlockingConnectionPool`, не открывает больше `max_connections`
+    соединений: при исчерпании пула команда ждёт освободившееся соединение
+    не дольше `timeout` секунд. Дополнительно считает, сколько раз и как
+    долго вызывающий код ждал соединение.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        """Выдаёт соединение из пула, учитывая время ожидания."""
+        started = time.monotonic()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError:
+            self.timeouts += 1
+            raise
+        waited = time.monotonic() - started
+        self.acquisitions += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        return connection
+
+    def stats(self) -> dict:
+        """
+        Текущее состояние пула и счётчики ожидания.
+
+        Returns:
+            dict: in_use, available, created, max_connections, acquisitions,
+                timeouts, wait_time_avg и wait_time_max (в секундах).
+        """
+        in_use = len(self._in_use_connections)
+        available = len(self._available_connections)
+        return {
+            "in_use": in_use,
+            "available": available,
+            "created": in_use + available,
+            "max_connections": self.max_connections,
+            "acquisitions": self.acquisitions,
+            "timeouts": self.timeouts,
+            "wait_time_avg": (
+                self.wait_time_total / self.acquisitions if self.acquisitions else 0.0
+            ),
+            "wait_time_max": self.wait_time_max,
+        }
+
+
+class InMemoryRedis:
+    """
+    Ограниченное хранилище в памяти процесса с интерфейсом подмножества Redis.
+
+    Используется вместо Redis, пока тот недоступен: поддерживает команды,
+    которыми пользуется кэш-слой (строки, счётчики, списки, TTL), а также
+    `pipeline()` с `watch`/`multi`/`execute`. Ключи вытесняются по LRU сверх
+    `max_keys`, а время жизни любого ключа ограничено `max_ttl`, потому что
+    данные процесса не видны другим процессам и быстро устаревают.
+
+    Pub/sub не поддерживается: `pubsub()` возбуждает `ConnectionError`, как
+    при недоступном сервере.
 
-async def get_redis_client() -> Redis:
+    Ключи, изменённые или удалённые через хранилище, запоминаются в
+    `written` (не больше `WRITTEN_KEYS_LIMIT`, дальше — `written_overflow`),
+    чтобы после восстановления удалить их устаревшие копии в Redis.
+    """
+
+    def __init__(self, max_keys: int, max_ttl: int, decode_responses: bool = True):
+        """
+        Args:
+            max_keys: Максимум ключей; при переполнении вытесняется давно не
+                использованный.
+            max_ttl: Предельное время жизни ключа в секундах.
+            decode_responses: Возвращать строки (True) или байты (False),
+                как одноимённый параметр клиента Redis.
+        """
+        self.max_keys = max_keys
+        self.max_ttl = max_ttl
+        self.decode_responses = decode_responses
+        # ключ -> [значение, момент истечения, версия]
+        self._data: OrderedDict[str, list] = OrderedDict()
+        self._version = 0
+        self.written: set = set()
+        self.written_overflow = False
+
+    # --- Внутренние синхронные операции ---
+
+    def _encode(self, value):
+        """Приводит значение к типу ответа Redis (строка или байты)."""
+        if isinstance(value, bytes):
+            return value.decode() if self.decode_responses else value
+        value = value if isinstance(value, str) else str(value)
+        return value if self.decode_responses else value.encode()
+
+    def _entry(self, key) -> list | None:
+        """Живая запись по ключу (истёкшие удаляются при обращении)."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _mark_written(self, key) -> None:
+        """Запоминает ключ, копия которого в Redis устарела."""
+        if len(self.written) < WRITTEN_KEYS_LIMIT:
+            self.written.add(key)
+        elif key not in self.written:
+            self.written_overflow = True
+
+    def take_written(self) -> tuple[set, bool]:
+        """
+        Забирает журнал изменённых ключей.
+
+        Returns:
+            tuple: Множество ключей и признак переполнения журнала.
+        """
+        written, overflow = self.written, self.written_overflow
+        self.written, self.written_overflow = set(), False
+        return written, overflow
+
+    def _store(self, key, value, ttl: float | None = None) -> None:
+        """Сохраняет значение с TTL не больше `max_ttl`."""
+        self._mark_written(key)
+        ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        self._version += 1
+        self._data[key] = [value, time.monotonic() + ttl, self._version]
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+
+    def _touch(self, key, entry: list) -> None:
+        """Отмечает изменение значения на месте (для WATCH)."""
+        self._mark_written(key)
+        self._version += 1
+        entry[2] = self._version
+
+    def _list(self, key, create: bool = False) -> list | None:
+        """Список по ключу; `WRONGTYPE`, если по ключу лежит не список."""
+        entry = self._entry(key)
+        if entry is None:
+            if not create:
+                return None
+            self._store(key, [])
+            entry = self._data[key]
+        if not isinstance(entry[0], list):
+            raise ResponseError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value"
+            )
+        return entry[0]
+
+    def version(self, key) -> int | None:
+        """Версия ключа (меняется при каждой записи) или None, если его нет."""
+        entry = self._entry(key)
+        return None if entry is None else entry[2]
+
+    @staticmethod
+    def _range(length: int, start: int, end: int) -> slice:
+        """Срез Python для индексов Redis (включительно, с отрицательными)."""
+        start = max(length + start, 0) if start < 0 else start
+        end = length + end if end < 0 else end
+        return slice(start, end + 1)
+
+    def execute_command(self, name: str, *args, **kwargs):
+        """Выполняет команду синхронно (используется конвейером)."""
+        command = getattr(self, f"_cmd_{name}", None)
+        if command is None:
+            raise ResponseError(f"unknown command '{name}' in memory fallback")
+        return command(*args, **kwargs)
+
+    def _cmd_ping(self):
+        return True
+
+    def _cmd_get(self, key):
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        if isinstance(entry[0], list):
+            raise ResponseError(
+                "WRONGTYPE Operation against a key holding the wrong kind of value"
+            )
+        return entry[0]
+
+    def _cmd_set(self, key, value, ex=None, nx=False):
+        if nx and self._entry(key) is not None:
+            return None
+        self._store(key, self._encode(value), ex)
+        return True
+
+    def _cmd_delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            self._mark_written(key)  # В Redis ключ мог остаться
+            if self._entry(key) is not None:
+                del self._data[key]
+                deleted += 1
+        return deleted
+
+    def _cmd_exists(self, *keys):
+        return sum(self._entry(key) is not None for key in keys)
+
+    def _cmd_expire(self, key, seconds):
+        entry = self._entry(key)
+        if entry is None:
+            return False
+        entry[1] = time.monotonic() + min(seconds, self.max_ttl)
+        return True
+
+    def _cmd_incr(self, key, amount=1):
+        value = int(self._cmd_get(key) or 0) + amount
+        entry = self._entry(key)
+        if entry is None:
+            self._store(key, self._encode(value))
+        else:
+            entry[0] = self._encode(value)
+            self._touch(key, entry)
+        return value
+
+    def _cmd_lpush(self, key, *values):
+        items = self._list(key, create=True)
+        for value in values:
+            items.insert(0, self._encode(value))
+        self._touch(key, self._data[key])
+        return len(items)
+
+    def _cmd_rpush(self, key, *values):
+        items = self._list(key, create=True)
+        items.extend(self._encode(value) for value in values)
+        self._touch(key, self._data[key])
+        return len(items)
+
+    def _cmd_rpushx(self, key, *values):
+        if self._list(key) is None:
+            return 0
+        return self._cmd_rpush(key, *values)
+
+    def _cmd_lrange(self, key, start, end):
+        items = self._list(key)
+        return [] if items is None else items[self._range(len(items), start, end)]
+
+    def _cmd_ltrim(self, key, start, end):
+        items = self._list(key)
+        if items is not None:
+            items[:] = items[self._range(len(items), start, end)]
+            if items:
+                self._touch(key, self._data[key])
+            else:
+                del self._data[key]
+        return True
+
+    def _cmd_llen(self, key):
+        items = self._list(key)
+        return 0 if items is None else len(items)
+
+    def _cmd_publish(self, channel, message):
+        return 0  # Подписчиков в памяти процесса нет
+
+    # --- Асинхронный интерфейс клиента Redis ---
+
+    async def ping(self):
+        return self._cmd_ping()
+
+    async def get(self, key):
+        return self._cmd_get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        return self._cmd_set(key, value, ex=ex, nx=nx)
+
+    async def delete(self, *keys):
+        return self._cmd_delete(*keys)
+
+    async def exists(self, *keys):
+        return self._cmd_exists(*keys)
+
+    async def expire(self, key, seconds):
+        return self._cmd_expire(key, seconds)
+
+    async def incr(self, key, amount=1):
+        return self._cmd_incr(key, amount)
+
+    async def lpush(self, key, *values):
+        return self._cmd_lpush(key, *values)
+
+    async def rpush(self, key, *values):
+        return self._cmd_rpush(key, *values)
+
+    async def rpushx(self, key, *values):
+        return self._cmd_rpushx(key, *values)
+
+    async def lrange(self, key, start, end):
+        return self._cmd_lrange(key, start, end)
+
+    async def ltrim(self, key, start, end):
+        return self._cmd_ltrim(key, start, end)
+
+    async def llen(self, key):
+        return self._cmd_llen(key)
+
+    async def publish(self, channel, message):
+        return self._cmd_publish(channel, message)
+
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        """Конвейер команд с поддержкой WATCH/MULTI/EXEC."""
+        return InMemoryPipeline(self)
+
+    def pubsub(self):
+        """Pub/sub недоступен без Redis."""
+        raise RedisConnectionError(
+            "Redis недоступен: pub/sub не поддерживается в памяти"
+        )
+
+    async def aclose(self) -> None:
+        self._data.clear()
+
+
+class InMemoryPipeline:
+    """
+    Конвейер для `InMemoryRedis` с семантикой redis-py.
+
+    До `watch()` команды копятся и выполняются в `execute()`. После
+    `watch()` команды выполняются сразу (их нужно `await`-ить), пока не
+    вызван `multi()`; `execute()` завершается `WatchError`, если
+    наблюдаемые ключи изменились.
+    """
+
+    def __init__(self, store: InMemoryRedis):
+        self._store = store
+        self._commands: list[tuple[str, tuple, dict]] = []
+        self._watched: dict[str, int | None] = {}
+        self._immediate = False
+
+    async def __aenter__(self) -> "InMemoryPipeline":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.reset()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not hasattr(self._store, f"_cmd_{name}"):
+            raise AttributeError(name)
+
+        def command(*args, **kwargs):
+            if self._immediate:
+                return self._run_now(name, args, kwargs)
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    async def _run_now(self, name: str, args: tuple, kwargs: dict):
+        """Команда в режиме WATCH выполняется сразу."""
+        return self._store.execute_command(name, *args, **kwargs)
+
+    async def watch(self, *keys) -> None:
+        """Запоминает версии ключей и переходит в немедленный режим."""
+        for key in keys:
+            self._watched[key] = self._store.version(key)
+        self._immediate = True
+
+    def multi(self) -> None:
+        """Начинает буферизацию команд транзакции."""
+        self._immediate = False
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        """Выполняет накопленные команды; `WatchError`, если ключи изменились."""
+        try:
+            for key, version in self._watched.items():
+                if self._store.version(key) != version:
+                    raise WatchError("Watched variable changed.")
+            results = []
+            for name, args, kwargs in self._commands:
+                try:
+                    results.append(self._store.execute_command(name, *args, **kwargs))
+                except ResponseError as e:
+                    if raise_on_error:
+                        raise
+                    results.append(e)
+            return results
+        finally:
+            self.reset()
+
+    def reset(self) -> None:
+        """Сбрасывает команды и наблюдаемые ключи."""
+        self._commands = []
+        self._watched = {}
+        self._immediate = False
+
+
+async def get_redis_client(binary: bool = False) -> "Redis | InMemoryRedis":
     """
     Возвращает глобальный асинхронный клиент Redis.
 
+    В деградированном режиме возвращает хранилище в памяти процесса.
+
+    Args:
+        binary: Вернуть клиент, отдающий байты без декодирования
+            (независимо от `decode_responses`).
+
     Raises:
-        RuntimeError: Если клиент Redis не был инициализирован.
+        RedisNotInitializedError: Если клиент Redis не был инициализирован.
     """
     if redis_client is None:
-        raise RuntimeError("Redis client not initialized. Call setup_redis first.")
+        raise RedisNotInitializedError(
+            "Redis client not initialized. Call setup_redis first."
+        )
+    if binary:
+        return fallback_binary_client or redis_binary_client
+    if fallback_client is not None:
+        return fallback_client
     return redis_client
 
 
+def is_redis_degraded() -> bool:
+    """True, если вместо Redis сейчас используется хранилище в памяти."""
+    return fallback_client is not None
+
+
+def mark_redis_unavailable(error: Exception | None = None) -> None:
+    """
+    Переводит клиент в деградированный режим после ошибки соединения.
+
+    Вызывается фоновой проверкой, а также может вызываться кодом, который
+    получил `ConnectionError`/`TimeoutError` от Redis, — чтобы следующие
+    запросы не ждали таймаутов. Ошибки команд (`ResponseError`, `WatchError`)
+    режим не меняют.
+    """
+    global fallback_client, fallback_binary_client
+    redis_config = settings.database.redis
+    if (
+        redis_client is None
+        or fallback_client is not None
+        or not redis_config.redis_fallback_enabled
+    ):
+        return
+    if error is not None and not isinstance(
+        error, (RedisConnectionError, RedisTimeoutError, OSError)
+    ):
+        return
+
+    fallback_client = InMemoryRedis(
+        max_keys=redis_config.redis_fallback_max_keys,
+        max_ttl=redis_config.redis_fallback_max_ttl,
+        decode_responses=redis_config.decode_responses,
+    )
+    fallback_binary_client = InMemoryRedis(
+        max_keys=redis_config.redis_fallback_max_keys,
+        max_ttl=redis_config.redis_fallback_max_ttl,
+        decode_responses=False,
+    )
+    logger.error(f"Redis недоступен, переключаемся на хранилище в памяти: {error}")
+
+
+def register_cache_prefix(prefix: str) -> None:
+    """
+    Регистрирует префикс ключей кэша (например, `dialog:`).
+
+    Если во время деградации журнал изменённых ключей переполнился, при
+    восстановлении из Redis удаляются все ключи зарегистрированных префиксов.
+    """
+    _cache_prefixes.add(prefix)
+
+
+def add_restore_listener(listener: Callable[[], None]) -> None:
+    """Подписывает функцию на возврат в нормальный режим."""
+    if listener not in _restore_listeners:
+        _restore_listeners.append(listener)
+
+
+def remove_restore_listener(listener: Callable[[], None]) -> None:
+    """Отписывает функцию от возврата в нормальный режим."""
+    if listener in _restore_listeners:
+        _restore_listeners.remove(listener)
+
+
+async def _drop_stale_keys(keys: set, overflow: bool) -> None:
+    """Удаляет из Redis ключи, изменённые в памяти во время деградации."""
+    if overflow:
+        for prefix in _cache_prefixes:
+            async for key in redis_client.scan_iter(match=f"{prefix}*", count=1000):
+                keys.add(key)
+    keys = list(keys)
+    for start in range(0, len(keys), 1000):
+        await redis_client.unlink(*keys[start : start + 1000])
+
+
+async def _restore_redis() -> None:
+    """
+    Возвращает нормальный режим (данные из памяти отбрасываются).
+
+    Сначала удаляет из Redis устаревшие копии ключей, изменённых в памяти;
+    пока идёт удаление, запись продолжается в память, поэтому журнал
+    забирается повторно, пока не окажется пустым.
+
+    Raises:
+        RedisError: Если Redis снова перестал отвечать (режим не меняется).
+    """
+    global fallback_client, fallback_binary_client
+    dropped = 0
+    while True:
+        keys, overflow = set(), False
+        for store in (fallback_client, fallback_binary_client):
+            if store is not None:
+                store_keys, store_overflow = store.take_written()
+                keys |= store_keys
+                overflow = overflow or store_overflow
+        if not keys and not overflow:
+            break
+        await _drop_stale_keys(keys, overflow)
+        dropped += len(keys)
+
+    fallback_client = None
+    fallback_binary_client = None
+    for listener in _restore_listeners[:]:
+        try:
+            listener()
+        except Exception as e:
+            logger.error(f"Ошибка обработчика восстановления Redis: {e}")
+    logger.info(
+        f"Redis снова доступен, хранилище в памяти отключено "
+        f"(сброшено устаревших ключей: {dropped})."
+    )
+
+
+async def _supervise() -> None:
+    """
+    Следит за доступностью Redis.
+
+    В нормальном режиме раз в `redis_probe_interval` секунд выполняет PING.
+    В деградированном — переподключается с экспоненциальной паузой от
+    `redis_reconnect_min_delay` до `redis_reconnect_max_delay` (с джиттером).
+    """
+    redis_config = settings.database.redis
+    delay = redis_config.redis_reconnect_min_delay
+    while True:
+        if fallback_client is None:
+            await asyncio.sleep(redis_config.redis_probe_interval)
+            try:
+                await redis_client.ping()
+            except (RedisError, OSError) as e:
+                mark_redis_unavailable(e)
+            continue
+
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        try:
+            await redis_client.ping()
+        except (RedisError, OSError) as e:
+            delay = min(delay * 2, redis_config.redis_reconnect_max_delay)
+            logger.debug(f"Переподключение к Redis не удалось: {e}")
+            continue
+        try:
+            await _restore_redis()
+        except (RedisError, OSError) as e:
+            delay = min(delay * 2, redis_config.redis_reconnect_max_delay)
+            logger.debug(f"Сброс устаревших ключей Redis не удался: {e}")
+            continue
+        delay = redis_config.redis_reconnect_min_delay
+
+
+def _create_pool(decode_responses: bool) -> InstrumentedConnectionPool:
+    """Создаёт ограниченный пул соединений с настройками из конфига."""
+    redis_config = settings.database.redis
+    return InstrumentedConnectionPool.from_url(
+        url=redis_config.redis_url,
+        db=redis_config.redis_db,
+        decode_responses=decode_responses,
+        max_connections=redis_config.redis_max_connections,
+        timeout=redis_config.redis_pool_timeout,
+        health_check_interval=redis_config.redis_health_check_interval,
+        retry_on_timeout=redis_config.redis_retry_on_timeout,
+        socket_keepalive=redis_config.redis_socket_keepalive,
+        socket_timeout=redis_config.redis_socket_timeout,
+        socket_connect_timeout=redis_config.redis_socket_connect_timeout,
+    )
+
+
 async def setup_redis() -> None:
     """
     Инициализирует асинхронный клиент Redis при запуске приложения.
 
-    Использует настройки из `settings.database.redis`.
+    Использует настройки из `settings.database.redis`. Если Redis недоступен
+    и включён `redis_fallback_enabled`, приложение стартует в
+    деградированном режиме, а подключение продолжается в фоне.
     """
-    global redis_client
+    global redis_client, redis_binary_client, _supervisor_task
     redis_config = settings.database.redis
 
     try:
-        # Создаём ConnectionPool с настройками из конфига
+        # Создаём ограниченные пулы с настройками из конфига
         # Пул соединений управляется самим клиентом
-        pool = redis.ConnectionPool.from_url(
-            url=redis_config.redis_url,
-            db=redis_config.redis_db,
-            decode_responses=redis_config.decode_responses,
-            # max_connections=10,  # Пример: ограничить пул (настройте по необходимости)
-            # retry_on_timeout=True, # Пример: повтор при таймауте
-            # health_check_interval=30, # Пример: интервал проверки здоровья
-        )
+        pool = _create_pool(redis_config.decode_responses)
 
-        # Инициализируем клиент с пулом
-        redis_client = redis.Redis(
-            connection_pool=pool,
-            # socket_keepalive=True, # Пример дополнительной опции
-        )
+        # Инициализируем клиенты с пулами. Соединения бинарного пула
+        # открываются только при первом использовании
+        redis_client = redis.Redis(connection_pool=pool)
+        redis_binary_client = redis.Redis(connection_pool=_create_pool(False))
         # Проверяем подключение
         await redis_client.ping()
         logger.info("Redis client initialized and connection verified.")
@@ -66,20 +684,62 @@ async def setup_redis() -> None:
             "Redis authentication failed. Check REDIS_USER and REDIS_USER_PASSWORD."
         )
         raise
-    except redis.ConnectionError as e:
-        logger.error(f"Failed to connect to Redis: {e}")
-        raise
+    except (redis.ConnectionError, redis.TimeoutError, OSError) as e:
+        if not redis_config.redis_fallback_enabled:
+            logger.error(f"Failed to connect to Redis: {e}")
+            raise
+        mark_redis_unavailable(e)
     except Exception as e:
         logger.error(f"An unexpected error occurred while setting up Redis: {e}")
         raise
 
+    if _supervisor_task is None or _supervisor_task.done():
+        _supervisor_task = asyncio.create_task(_supervise(), name="redis-supervisor")
+
 
 async def close_redis() -> None:
     """
     Закрывает соединение с Redis при завершении приложения.
     """
-    global redis_client
+    global redis_client, redis_binary_client, fallback_client, fallback_binary_client
+    global _supervisor_task
+    if _supervisor_task is not None:
+        _supervisor_task.cancel()
+        try:
+            await _supervisor_task
+        except asyncio.CancelledError:
+            pass
+        _supervisor_task = None
+    fallback_client = None
+    fallback_binary_client = None
+    if redis_binary_client:
+        await redis_binary_client.aclose()
+        redis_binary_client = None
     if redis_client:
         await redis_client.aclose()  # Используем aclose для асинхронного закрытия
         logger.info("Redis client closed.")
         redis_client = None
+
+
+def get_redis_pool_stats(binary: bool = False) -> dict:
+    """
+    Возвращает статистику пула соединений глобального клиента Redis.
+
+    Args:
+        binary: Статистика пула бинарного клиента.
+
+    Returns:
+        dict: Результат `InstrumentedConnectionPool.stats()` или пустой
+            словарь, если клиент не инициализирован.
+    """
+    client = redis_binary_client if binary else redis_client
+    if client is None:
+        return {}
+    pool = client.connection_pool
+    if isinstance(pool, InstrumentedConnectionPool):
+        return pool.stats()
+    return {
+        "in_use": len(pool._in_use_connections),
+        "available": len(pool._available_connections),
+        "max_connections": pool.max_connections,
+    }
@@ -0,0 +1,229 @@
+"""
+Пакетная отправка команд Redis одним конвейером (pipeline).
+
+Каждая команда через `redis_client` — отдельный сетевой round trip. На ходе
+бота кэш-слой выполняет десятки независимых GET/SET/EXPIRE, поэтому
+`RedisBatcher` собирает команды и отправляет их одним
+`pipeline(transaction=False)`:
+
+- автоматически — все команды, выданные в одном проходе event loop,
+  уходят одним пакетом на следующем проходе (`loop.call_soon`);
+- явно — команды внутри `async with batcher.batch():` уходят одним пакетом
+  при выходе из блока.
+
+Методы команд возвращают `asyncio.Future`, который завершается результатом
+именно этой команды (или её ошибкой), поэтому вызывающий код просто делает
+`await batcher.get(key)`. Любой сбой отправки пакета завершает ошибкой
+Future всех его команд; при отмене отправки Future отменяются.
+
+Значения, закодированные `src.databases.redis_codec`, читаются через
+батчер с `binary=True` (клиент без декодирования ответов).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator
+
+from redis.asyncio import Redis
+
+from src.databases.redis import (
+    RedisNotInitializedError,
+    get_redis_client,
+    mark_redis_unavailable,
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Максимум команд в одном конвейере
+MAX_BATCH_SIZE = 256
+
+# Буфер явного пакета текущей задачи (внутри `batch()`)
+_explicit_batch: ContextVar[list | None] = ContextVar("redis_batch", default=None)
+
+
+class RedisBatcher:
+    """
+    Группирует команды Redis в конвейеры и раздаёт результаты вызывающим.
+
+    Example:
+        # Автоматически: три команды — один round trip
+        user, dialog, _ = await asyncio.gather(
+            redis_batcher.get("user:tg:1"),
+            redis_batcher.get("dialog:abc:version"),
+            redis_batcher.expire("dialog:abc:messages", 3600),
+        )
+
+        # Явно: команды уходят при выходе из блока
+        async with redis_batcher.batch():
+            cached = redis_batcher.get("user:tg:1")
+            redis_batcher.set("user:tg:2", payload, ex=3600)
+        value = cached.result()
+    """
+
+    def __init__(
+        self,
+        client: Redis | None = None,
+        max_batch: int = MAX_BATCH_SIZE,
+        binary: bool = False,
+    ):
+        """
+        Args:
+            client: Клиент Redis. По умолчанию — глобальный клиент из
+                `src.databases.redis`, получаемый при каждой отправке.
+            max_batch: Максимум команд в одном конвейере.
+            binary: Использовать глобальный клиент без декодирования ответов
+                (для значений `src.databases.redis_codec`).
+        """
+        self._client = client
+        self.max_batch = max_batch
+        self.binary = binary
+        self._pending: list[tuple[str, tuple, dict, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.commands = 0
+
+    async def _get_client(self) -> Redis:
+        """Возвращает явно переданный или глобальный клиент Redis."""
+        return self._client or await get_redis_client(binary=self.binary)
+
+    def get(self, key: str) -> asyncio.Future:
+        """GET key."""
+        return self._enqueue("get", key)
+
+    def set(self, key: str, value: Any, ex: int | None = None) -> asyncio.Future:
+        """SET key value [EX ex]."""
+        return self._enqueue("set", key, value, ex=ex)
+
+    def expire(self, key: str, seconds: int) -> asyncio.Future:
+        """EXPIRE key seconds."""
+        return self._enqueue("expire", key, seconds)
+
+    def lpush(self, key: str, *values: Any) -> asyncio.Future:
+        """LPUSH key value [value ...]."""
+        return self._enqueue("lpush", key, *values)
+
+    def ltrim(self, key: str, start: int, end: int) -> asyncio.Future:
+        """LTRIM key start end."""
+        return self._enqueue("ltrim", key, start, end)
+
+    def _enqueue(self, command: str, *args, **kwargs) -> asyncio.Future:
+        """Добавляет команду в явный пакет задачи или в общий автоматический."""
+        future = asyncio.get_running_loop().create_future()
+        entry = (command, args, kwargs, future)
+
+        explicit = _explicit_batch.get()
+        if explicit is not None:
+            explicit.append(entry)
+            return future
+
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._start_flush)
+        return future
+
+    def _start_flush(self) -> None:
+        """Забирает накопленные команды и отправляет их фоновой задачей."""
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._execute(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        # Задачу могут отменить ещё до её запуска
+        task.add_done_callback(lambda _, entries=pending: _cancel_futures(entries))
+
+    async def _execute(self, entries: list) -> None:
+        """Отправляет команды конвейерами и раздаёт результаты по Future."""
+        for start in range(0, len(entries), self.max_batch):
+            chunk = entries[start : start + self.max_batch]
+            try:
+                client = await self._get_client()
+                async with client.pipeline(transaction=False) as pipe:
+                    for command, args, kwargs, _ in chunk:
+                        getattr(pipe, command)(*args, **kwargs)
+                    results = await pipe.execute(raise_on_error=False)
+            except asyncio.CancelledError:
+                # Результатов не будет ни у этой, ни у следующих порций
+                _cancel_futures(entries[start:])
+                raise
+            except Exception as e:
+                mark_redis_unavailable(e)  # Только для ошибок соединения
+                if not isinstance(e, RedisNotInitializedError):
+                    logger.warning(f"Не удалось выполнить пакет команд Redis: {e}")
+                for *_, future in chunk:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.commands += len(chunk)
+            for (*_, future), result in zip(chunk, results):
+                if future.done():
+                    continue  # Вызывающий уже отменил ожидание
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator["RedisBatcher"]:
+        """
+        Собирает команды текущей задачи и отправляет их одним пакетом на выходе.
+
+        Внутри блока результаты ещё не готовы — ожидать возвращённые Future
+        нужно после выхода из него. Вложенные блоки присоединяются к внешнему.
+        Если блок завершился исключением, команды не отправляются, а их
+        Future отменяются.
+        """
+        if _explicit_batch.get() is not None:
+            yield self
+            return
+
+        entries: list = []
+        token = _explicit_batch.set(entries)
+        try:
+            yield self
+        except BaseException:
+            _cancel_futures(entries)
+            raise
+        finally:
+            _explicit_batch.reset(token)
+        if entries:
+            await self._execute(entries)
+
+    async def flush(self) -> None:
+        """Немедленно отправляет накопленные команды и дожидается всех пакетов."""
+        self._start_flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """
+        Счётчики пакетной отправки.
+
+        Returns:
+            dict: batches, commands и commands_per_batch (средний размер пакета).
+        """
+        return {
+            "batches": self.batches,
+            "commands": self.commands,
+            "commands_per_batch": self.commands / self.batches if self.batches else 0.0,
+        }
+
+
+def _cancel_futures(entries: list) -> None:
+    """Отменяет ещё не завершённые Future неотправленных команд."""
+    for *_, future in entries:
+        if not future.done():
+            future.cancel()
+
+
+# Общий экземпляр на глобальном клиенте Redis
+redis_batcher = RedisBatcher()
@@ -0,0 +1,349 @@
+"""
+Компактная сериализация Pydantic-моделей для хранения в Redis.
+
+JSON через `model_dump_json` повторяет имена полей в каждом значении и
+требует текстового клиента (`decode_responses=True`). `ModelCodec` кодирует
+модель в байты одним из форматов:
+
+- `json` — `model_dump_json` (совместим со старыми значениями в кэше);
+- `msgpack` — массив значений полей в порядке объявления (нужен `msgpack`);
+- `struct` — фиксированная часть `struct.Struct` (числа, даты, длины строк)
+  и следом строки в UTF-8; без зависимостей и самый компактный.
+
+Значения больше `compress_threshold` байт дополнительно сжимаются zlib.
+Первый байт значения — заголовок (формат и флаг сжатия), поэтому `decode`
+читает любое значение независимо от текущего формата, в том числе JSON,
+записанный до появления кодеков. Бинарные форматы хранят отпечаток набора
+полей модели: после изменения схемы старые значения не читаются с
+ошибкой `CodecError`, и кэш считает их промахом.
+"""
+
+import struct
+import types
+import typing
+import zlib
+from datetime import datetime, timezone
+from functools import cache
+
+from pydantic import BaseModel
+
+from configs.settings import settings
+from src.utils.logger import get_logger
+
+try:
+    import msgpack
+except ImportError:  # Необязательная зависимость: без неё формат msgpack недоступен
+    msgpack = None
+
+logger = get_logger(__name__)
+
+# Флаг сжатия zlib в байте заголовка
+COMPRESSED = 0x80
+
+# Первый байт JSON-значений, записанных без заголовка
+_LEGACY_JSON = ord("{")
+
+# Длина строки, обозначающая None в формате struct
+_NONE_LENGTH = 0xFFFFFFFF
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = datetime.resolution
+
+
+class CodecError(ValueError):
+    """Значение не удаётся декодировать (повреждено или схема изменилась)."""
+
+
+def _layout(model: type[BaseModel]) -> list[tuple[str, str]]:
+    """
+    Поля модели и их вид для бинарных форматов.
+
+    Returns:
+        list: Пары (имя поля, вид): int, float, bool, str, optional_str,
+            optional_int, datetime.
+    """
+    layout = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        args = typing.get_args(annotation)
+        optional = typing.get_origin(annotation) in (typing.Union, types.UnionType)
+        if optional and set(args) == {str, type(None)}:
+            kind = "optional_str"
+        elif optional and set(args) == {int, type(None)}:
+            kind = "optional_int"
+        elif annotation in (int, float, bool, str, datetime):
+            kind = annotation.__name__
+        else:
+            raise TypeError(
+                f"Поле {model.__name__}.{name} не поддерживается: {annotation}"
+            )
+        layout.append((name, kind))
+    return layout
+
+
+def _fingerprint(layout: list[tuple[str, str]]) -> bytes:
+    """Два байта отпечатка набора полей (меняется при изменении схемы)."""
+    description = ",".join(f"{name}:{kind}" for name, kind in layout).encode()
+    return (zlib.crc32(description) & 0xFFFF).to_bytes(2, "little")
+
+
+class JsonFormat:
+    """JSON через Pydantic: текстовый и самый переносимый формат."""
+
+    format_id = 1
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+
+    def encode(self, obj: BaseModel) -> bytes:
+        return obj.model_dump_json().encode()
+
+    def decode(self, data: bytes) -> BaseModel:
+        return self.model.model_validate_json(data)
+
+
+class MsgpackFormat:
+    """
+    msgpack-массив значений полей; даты — целые микросекунды от эпохи.
+    """
+
+    format_id = 2
+
+    def __init__(self, model: type[BaseModel]):
+        if msgpack is None:
+            raise RuntimeError("Формат msgpack требует установленного пакета msgpack")
+        self.model = model
+        self.layout = _layout(model)
+        self.fingerprint = _fingerprint(self.layout)
+
+    def encode(self, obj: BaseModel) -> bytes:
+        values = []
+        for name, kind in self.layout:
+            value = getattr(obj, name)
+            if kind == "datetime":
+                value = _pack_datetime(value)
+            values.append(value)
+        return self.fingerprint + msgpack.packb(values)
+
+    def decode(self, data: bytes) -> BaseModel:
+        if data[:2] != self.fingerprint:
+            raise CodecError(f"Схема {self.model.__name__} изменилась")
+        values = msgpack.unpackb(data[2:])
+        fields = {}
+        for (name, kind), value in zip(self.layout, values, strict=True):
+            if kind == "datetime":
+                value = _unpack_datetime(*value)
+            fields[name] = value
+        return self.model.model_validate(fields)
+
+
+class StructFormat:
+    """
+    Фиксированная часть `struct` и строки UTF-8 следом за ней.
+
+    Фиксированная часть содержит числа, даты (микросекунды и признак
+    часового пояса UTC) и длины строк; None в необязательной строке
+    кодируется длиной `0xFFFFFFFF`, необязательное целое хранится вместе
+    с признаком наличия значения.
+    """
+
+    format_id = 3
+
+    _CODES = {
+        "int": "q",
+        "float": "d",
+        "bool": "?",
+        "str": "I",
+        "optional_str": "I",
+        "optional_int": "q?",
+        "datetime": "q?",
+    }
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self.layout = _layout(model)
+        self.fingerprint = _fingerprint(self.layout)
+        self.header = struct.Struct(
+            "<" + "".join(self._CODES[kind] for _, kind in self.layout)
+        )
+        # (имя поля, вид, индекс в распакованной фиксированной части)
+        self._plan = []
+        index = 0
+        for name, kind in self.layout:
+            self._plan.append((name, kind, index))
+            index += len(self._CODES[kind])
+
+    def encode(self, obj: BaseModel) -> bytes:
+        fixed = []
+        strings = []
+        for name, kind in self.layout:
+            value = getattr(obj, name)
+            if kind == "datetime":
+                fixed.extend(_pack_datetime(value))
+            elif kind in ("str", "optional_str"):
+                if value is None:
+                    fixed.append(_NONE_LENGTH)
+                else:
+                    encoded = value.encode()
+                    fixed.append(len(encoded))
+                    strings.append(encoded)
+            elif kind == "optional_int":
+                fixed.extend((0, False) if value is None else (value, True))
+            else:
+                fixed.append(value)
+        return b"".join((self.fingerprint, self.header.pack(*fixed), *strings))
+
+    def decode(self, data: bytes) -> BaseModel:
+        if data[:2] != self.fingerprint:
+            raise CodecError(f"Схема {self.model.__name__} изменилась")
+        try:
+            fixed = self.header.unpack_from(data, 2)
+        except struct.error as e:
+            raise CodecError(f"Повреждённое значение {self.model.__name__}: {e}") from e
+        offset = 2 + self.header.size
+        fields = {}
+        for name, kind, index in self._plan:
+            if kind == "str" or kind == "optional_str":
+                length = fixed[index]
+                if length == _NONE_LENGTH:
+                    fields[name] = None
+                    continue
+                end = offset + length
+                fields[name] = data[offset:end].decode()
+                offset = end
+            elif kind == "datetime":
+                fields[name] = _unpack_datetime(fixed[index], fixed[index + 1])
+            elif kind == "optional_int":
+                fields[name] = fixed[index] if fixed[index + 1] else None
+            else:
+                fields[name] = fixed[index]
+        if offset != len(data):
+            raise CodecError(f"Повреждённое значение {self.model.__name__}")
+        return self.model.model_validate(fields)
+
+
+def _pack_datetime(value: datetime) -> tuple[int, bool]:
+    """Дата -> (микросекунды от эпохи, признак UTC). Aware-даты приводятся к UTC."""
+    if value.tzinfo is None:
+        return (value - _EPOCH) // _MICROSECOND, False
+    value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND, True
+
+
+def _unpack_datetime(microseconds: int, aware: bool) -> datetime:
+    """Обратное преобразование к `_pack_datetime`."""
+    value = _EPOCH + microseconds * _MICROSECOND
+    return value.replace(tzinfo=timezone.utc) if aware else value
+
+
+# Доступные форматы: имя -> класс
+FORMATS = {"json": JsonFormat, "msgpack": MsgpackFormat, "struct": StructFormat}
+
+
+class ModelCodec:
+    """
+    Кодирует модель выбранным форматом и декодирует значение любого формата.
+
+    Example:
+        codec = ModelCodec(MessageRead, "struct", compress_threshold=512)
+        raw = codec.encode(message)          # bytes для клиента Redis
+        message = codec.decode(raw)          # MessageRead
+    """
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        format: str = "struct",
+        compress_threshold: int = 512,
+        compress_level: int = 6,
+    ):
+        """
+        Args:
+            model: Класс Pydantic-модели.
+            format: Формат записи: json, msgpack или struct.
+            compress_threshold: Сжимать zlib значения от стольких байт
+                (0 — не сжимать).
+            compress_level: Уровень сжатия zlib (1–9).
+        """
+        self.model = model
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self._formats: dict[int, JsonFormat | MsgpackFormat | StructFormat] = {}
+        for format_class in FORMATS.values():
+            try:
+                self._formats[format_class.format_id] = format_class(model)
+            except RuntimeError:
+                continue  # Необязательная зависимость не установлена
+        self.format = self._formats[FORMATS[format].format_id]
+
+    def encode(self, obj: BaseModel) -> bytes:
+        """Кодирует модель в байты с заголовком."""
+        payload = self.format.encode(obj)
+        header = self.format.format_id
+        if self.compress_threshold and len(payload) >= self.compress_threshold:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload = compressed
+                header |= COMPRESSED
+        return bytes((header,)) + payload
+
+    def decode(self, data: bytes | str) -> BaseModel:
+        """
+        Декодирует значение любого поддерживаемого формата.
+
+        Raises:
+            CodecError: Значение повреждено, записано в неизвестном формате
+                или по старой схеме модели.
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not data:
+            raise CodecError("Пустое значение")
+        header = data[0]
+        if header == _LEGACY_JSON:
+            return self._decode_json(data)
+
+        format = self._formats.get(header & ~COMPRESSED)
+        if format is None:
+            raise CodecError(f"Неизвестный формат значения: {header:#04x}")
+        payload = data[1:]
+        if header & COMPRESSED:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as e:
+                raise CodecError(f"Повреждённое сжатое значение: {e}") from e
+        if isinstance(format, JsonFormat):
+            return self._decode_json(payload)
+        try:
+            return format.decode(payload)
+        except CodecError:
+            raise
+        except (ValueError, TypeError, IndexError, StopIteration) as e:
+            raise CodecError(f"Повреждённое значение {self.model.__name__}: {e}") from e
+
+    def _decode_json(self, data: bytes) -> BaseModel:
+        """JSON проверяется Pydantic; ошибка валидации — тоже `CodecError`."""
+        try:
+            return self.model.model_validate_json(data)
+        except ValueError as e:
+            raise CodecError(f"Некорректный JSON {self.model.__name__}: {e}") from e
+
+
+@cache
+def get_codec(model: type[BaseModel]) -> ModelCodec:
+    """
+    Кодек модели с настройками `settings.database.redis`.
+
+    Если выбран msgpack, но пакет не установлен, используется struct.
+    """
+    redis_config = settings.database.redis
+    format = redis_config.redis_cache_codec
+    if format == "msgpack" and msgpack is None:
+        logger.warning("Пакет msgpack не установлен, кэш использует формат struct")
+        format = "struct"
+    return ModelCodec(
+        model,
+        format,
+        compress_threshold=redis_config.redis_compress_threshold,
+        compress_level=redis_config.redis_compress_level,
+    )
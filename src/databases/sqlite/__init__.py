@@ -5,16 +5,32 @@
 - Подключение
 - ORM-модели
 - Сессии
+
+Движки и фабрики сессий (`engine`, `read_engine`, `async_session`,
+`read_async_session`) создаются при первом обращении — см. `core.init_engines`.
 """
 
+from . import core
 from .connection import get_db_session
-from .core import async_session, connection, engine
+from .core import connection, dispose_engines, init_engines, write_session
 from .models.base import Base
 
 __all__ = [
     "engine",
+    "read_engine",
     "async_session",
+    "read_async_session",
+    "write_session",
+    "init_engines",
+    "dispose_engines",
     "get_db_session",
     "Base",
     "connection",
 ]
+
+
+def __getattr__(name: str):
+    """Лениво отдаёт движки и фабрики сессий из `core`."""
+    if name in core._LAZY_ATTRIBUTES:
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
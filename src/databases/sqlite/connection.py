@@ -7,16 +7,20 @@
 
 from typing import AsyncGenerator
 
-from .core import async_session
+from . import core
 
 
-async def get_db_session() -> AsyncGenerator:
+async def get_db_session(readonly: bool = False) -> AsyncGenerator:
     """
     Асинхронный генератор сессии базы данных.
 
     Используется для внедрения зависимости в FastAPI-маршруты.
     Обеспечивает автоматическое открытие и закрытие сессии при каждом запросе.
 
+    Args:
+        readonly: Если True — сессия на движке чтения (без блокировки писателя),
+            иначе — сессия записи под `write_lock`.
+
     Yields:
         AsyncSession: Асинхронная сессия SQLAlchemy для выполнения запросов к БД.
 
@@ -27,8 +31,13 @@ async def get_db_session() -> AsyncGenerator:
         async def get_user_list(db: AsyncSession = Depends(get_db_session)):
             # Работа с сессией
             pass
+
+        async def get_session_for_reads():
+            async for session in get_db_session(readonly=True):
+                yield session
     """
-    async with async_session() as session:
+    session_factory = core.read_async_session if readonly else core.write_session
+    async with session_factory() as session:
         try:
             # Возвращаем сессию для использования в маршруте
             yield session
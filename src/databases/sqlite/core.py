@@ -5,43 +5,232 @@
 асинхронного движка SQLAlchemy. Он предоставляет все необходимые компоненты
 для работы с базой данных в асинхронном режиме:
 
-- `engine` — асинхронный движок, который управляет подключением к базе данных.
-  Он отвечает за создание соединений, настройку пула соединений, логирование
-  SQL-запросов и другие параметры подключения.
+- `engine` — асинхронный движок для записи. SQLite допускает только одного
+  писателя, поэтому пул движка ограничен одним соединением, а доступ к нему
+  сериализуется через `write_lock`.
 
-- `async_session` — фабрика асинхронных сессий, которая создает сессии
-  для выполнения запросов к базе данных.
+- `read_engine` — асинхронный движок только для чтения (`PRAGMA query_only`)
+  с пулом из нескольких соединений. В режиме WAL читатели не ждут писателя.
+
+- `async_session` / `read_async_session` — фабрики асинхронных сессий
+  для записи и для чтения соответственно.
+
+- `write_session` — контекстный менеджер сессии записи под `write_lock`.
+  Вложенные сессии записи в той же задаче asyncio получают внешнюю сессию,
+  а не ждут блокировку, которую сами же держат.
+
+Движки и фабрики сессий создаются лениво — при первом обращении к любому из
+имён выше (или явно через `init_engines()`), поэтому импорт модуля не
+загружает драйвер aiosqlite и диалект SQLAlchemy. `dispose_engines()`
+закрывает пулы соединений; следующее обращение создаст движки заново.
+
+На каждое новое соединение применяются PRAGMA из профиля производительности
+`settings.database.sqlite` (WAL, synchronous, cache_size и т.д.).
+
+Для `:memory:` баз раздельные движки не подходят: у каждого соединения
+своя база в памяти.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from functools import wraps
-
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from typing import TYPE_CHECKING, AsyncIterator
 
 from configs.settings import settings
 
-# Формируем путь и URL для подключения к БД
-db_url: str = settings.database.sqlite.database_url
-
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
-# Асинхронный движок с настройками из конфига
-engine = create_async_engine(
-    url=db_url,  # URL подключения к базе данных
-    echo=settings.database.sqlite.echo,  # Логирование SQL-запросов
-    pool_pre_ping=settings.database.sqlite.pool_pre_ping,  # Проверка соединения перед использованием
-    pool_size=settings.database.sqlite.pool_size,  # Размер пула соединений
-    max_overflow=settings.database.sqlite.max_overflow,  # Максимальное количество дополнительных соединений
+# Ресурсы, создаваемые init_engines() и доступные как атрибуты модуля
+_LAZY_ATTRIBUTES = (
+    "db_url",
+    "engine",
+    "read_engine",
+    "async_session",
+    "read_async_session",
 )
 
+_engine: "AsyncEngine | None" = None
+_read_engine: "AsyncEngine | None" = None
+_async_session: "async_sessionmaker[AsyncSession] | None" = None
+_read_async_session: "async_sessionmaker[AsyncSession] | None" = None
+_db_url: str | None = None
+
+
+def _apply_sqlite_pragmas(dbapi_connection, readonly: bool) -> None:
+    """
+    Применяет PRAGMA профиля производительности к новому соединению.
+
+    PRAGMA действуют на уровне соединения (кроме journal_mode=WAL, который
+    сохраняется в файле БД), поэтому их нужно выполнять при каждом подключении.
+    Значения проходят валидацию в `SQLiteSettings`, поэтому безопасны для
+    подстановки в текст запроса.
+    """
+    pragmas = settings.database.sqlite.get_pragmas()
+    if readonly:
+        # journal_mode меняет файл БД — это задача соединения для записи
+        pragmas.pop("journal_mode", None)
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if readonly:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def _on_write_connect(dbapi_connection, connection_record):
+    """Настраивает новое соединение движка записи."""
+    _apply_sqlite_pragmas(dbapi_connection, readonly=False)
+
+
+def _on_read_connect(dbapi_connection, connection_record):
+    """Настраивает новое соединение движка чтения (query_only)."""
+    _apply_sqlite_pragmas(dbapi_connection, readonly=True)
+
+
+def init_engines() -> None:
+    """
+    Создаёт движки записи и чтения и фабрики сессий, если их ещё нет.
+
+    Вызывается автоматически при первом обращении к `engine`,
+    `async_session` и т.д.; явный вызов при запуске приложения переносит
+    стоимость импорта драйвера из первого запроса в старт.
+    """
+    global _db_url, _engine, _read_engine, _async_session, _read_async_session
+    if _engine is not None:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    sqlite_config = settings.database.sqlite
+
+    # Формируем путь и URL для подключения к БД
+    db_url = sqlite_config.database_url
+
+    # Асинхронный движок для записи: ровно одно соединение
+    engine = create_async_engine(
+        url=db_url,  # URL подключения к базе данных
+        echo=sqlite_config.echo,  # Логирование SQL-запросов
+        pool_pre_ping=sqlite_config.pool_pre_ping,  # Проверка соединения перед использованием
+        pool_size=1,  # SQLite допускает только одного писателя
+        max_overflow=0,  # Дополнительные соединения для записи не создаются
+    )
+
+    # Асинхронный движок для чтения с пулом из нескольких соединений
+    read_engine = create_async_engine(
+        url=db_url,
+        echo=sqlite_config.echo,
+        pool_pre_ping=sqlite_config.pool_pre_ping,
+        pool_size=sqlite_config.pool_size,  # Размер пула соединений для чтения
+        max_overflow=sqlite_config.max_overflow,  # Максимальное количество дополнительных соединений
+    )
+
+    event.listen(engine.sync_engine, "connect", _on_write_connect)
+    event.listen(read_engine.sync_engine, "connect", _on_read_connect)
+
+    # Фабрика асинхронных сессий для записи
+    _async_session = async_sessionmaker(
+        engine,  # Движок, из которого создаются соединения
+        expire_on_commit=sqlite_config.expire_on_commit,  # Если True — объекты устаревают после commit
+        autoflush=sqlite_config.autoflush,  # Если True — автоматически синхронизирует изменения с БД
+    )
+
+    # Фабрика асинхронных сессий только для чтения
+    _read_async_session = async_sessionmaker(
+        read_engine,
+        expire_on_commit=sqlite_config.expire_on_commit,
+        autoflush=sqlite_config.autoflush,
+    )
+
+    _db_url, _engine, _read_engine = db_url, engine, read_engine
+
+
+async def dispose_engines() -> None:
+    """
+    Закрывает пулы соединений обоих движков (при завершении приложения).
+
+    После вызова следующее обращение к `engine` или фабрикам сессий
+    создаст движки заново.
+    """
+    global _db_url, _engine, _read_engine, _async_session, _read_async_session
+    engines = [e for e in (_engine, _read_engine) if e is not None]
+    _db_url = _engine = _read_engine = _async_session = _read_async_session = None
+    for engine in engines:
+        await engine.dispose()
+
+
+def __getattr__(name: str):
+    """Создаёт движки при первом обращении к `engine`, `async_session` и т.д."""
+    if name in _LAZY_ATTRIBUTES:
+        init_engines()
+        return globals()[f"_{name}"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-# Фабрика асинхронных сессий
-async_session = async_sessionmaker(
-    engine,  # Движок, из которого создаются соединения
-    expire_on_commit=settings.database.sqlite.expire_on_commit,  # Если True — объекты устаревают после commit
-    autoflush=settings.database.sqlite.autoflush,  # Если True — автоматически синхронизирует изменения с БД
+def _session_factory(readonly: bool = False) -> "async_sessionmaker[AsyncSession]":
+    """Фабрика сессий чтения или записи (создаёт движки при необходимости)."""
+    init_engines()
+    return _read_async_session if readonly else _async_session
+
+
+# Единственный писатель: сессии записи выдаются строго по одной
+write_lock = asyncio.Lock()
+
+# Открытая сессия записи и задача-владелец (для повторного входа)
+_current_write: "ContextVar[tuple[asyncio.Task, AsyncSession] | None]" = ContextVar(
+    "current_write_session", default=None
 )
 
 
-def connection(func):
+def current_write_session() -> "AsyncSession | None":
+    """
+    Сессия записи, открытая текущей задачей asyncio, или None.
+
+    Дочерние задачи наследуют контекст, но не владеют сессией: для них
+    функция возвращает None.
+    """
+    current = _current_write.get()
+    if current is not None and current[0] is asyncio.current_task():
+        return current[1]
+    return None
+
+
+@asynccontextmanager
+async def write_session() -> "AsyncIterator[AsyncSession]":
+    """
+    Открывает сессию записи, удерживая `write_lock` на всё время её жизни.
+
+    Конкурентные писатели ждут своей очереди в asyncio, а не получают
+    "database is locked" от SQLite. Повторный вход из той же задачи
+    возвращает уже открытую сессию; закрывает её внешний вызов.
+
+    Блокировка нереентерабельна между задачами: ожидать внутри сессии записи
+    задачу, которой самой нужна сессия записи (например, future из
+    `MessageWriteQueue.enqueue`), нельзя — это взаимоблокировка.
+
+    Example:
+        async with write_session() as session:
+            await UserDAO.create_user(session, telegram_id=1, first_name="Иван")
+    """
+    session = current_write_session()
+    if session is not None:
+        yield session
+        return
+
+    async with write_lock:
+        async with _session_factory()() as session:
+            token = _current_write.set((asyncio.current_task(), session))
+            try:
+                yield session
+            finally:
+                _current_write.reset(token)
+
+
+def connection(func=None, *, readonly: bool = False):
     """
     Декоратор для автоматического управления сессией.
 
@@ -50,32 +239,59 @@ def connection(func):
 
     Args:
         func: Асинхронная функция, которая принимает сессию в качестве аргумента.
+        readonly: Если True — сессия открывается на движке чтения без
+            блокировки писателя. Запись в такой сессии завершится ошибкой.
+            По умолчанию используется `write_session`: функции только для
+            чтения стоит помечать `readonly=True`, чтобы не ждать писателей.
+
+    Вложенный вызов функции с `@connection` из той же задачи получает
+    сессию записи внешнего вызова; откат и закрытие остаются за внешним.
 
     Returns:
         Результат выполнения оборачиваемой функции.
 
     Example:
-        @connection
+        @connection(readonly=True)
         async def get_users(session):
             result = await session.execute(select(User))
             return result.scalars().all()
+
+        @connection
+        async def add_user(session, telegram_id: int):
+            return await UserDAO.create_user(session, telegram_id, "Иван")
     """
 
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        """
-        Внутренняя функция-обёртка, управляющая сессией.
+    def decorator(func):
+        """Оборачивает функцию с выбранным режимом сессии."""
 
-        Создаёт асинхронную сессию, передаёт её в оборачиваемую функцию,
-        обрабатывает исключения и гарантирует закрытие сессии.
-        """
-        async with async_session() as session:
-            try:
-                return await func(*args, session=session, **kwargs)
-            except Exception as e:
-                await session.rollback()  # Откат при ошибке
-                raise e
-            finally:
-                await session.close()  # Закрытие сессии
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            """
+            Внутренняя функция-обёртка, управляющая сессией.
+
+            Создаёт асинхронную сессию, передаёт её в оборачиваемую функцию,
+            обрабатывает исключения и гарантирует закрытие сессии.
+            """
+            if not readonly:
+                session = current_write_session()
+                if session is not None:
+                    return await func(*args, session=session, **kwargs)
+
+            session_factory = (
+                _session_factory(readonly=True) if readonly else write_session
+            )
+            async with session_factory() as session:
+                try:
+                    return await func(*args, session=session, **kwargs)
+                except Exception as e:
+                    await session.rollback()  # Откат при ошибке
+                    raise e
+                finally:
+                    await session.close()  # Закрытие сессии
+
+        return wrapper
 
-    return wrapper
+    if func is not None:
+        # Использование без скобок: @connection
+        return decorator(func)
+    return decorator
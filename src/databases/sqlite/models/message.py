@@ -4,34 +4,86 @@ ORM-модель сообщения для ролевого чат-бота.
 Содержит поля:
 - user_id: ссылка на пользователя
 - dialog_session_id: идентификатор сессии диалога
-- role: роль персонажа в сообщении
+- role: роль автора сообщения: `user`, `assistant`, `system` или имя
+  персонажа, от лица которого отвечает бот (в запросе к модели такие
+  сообщения передаются с ролью `assistant`, см. `src.ai.context`)
 - content: текст сообщения
 - message_type: тип сообщения (например, text, voice)
+- token_count: длина content в токенах (оценка `src.utils.tokens.count_tokens`)
+
+Порядок сообщений задаётся парой (timestamp, id): `timestamp` вычисляется
+при каждой вставке, а автоинкрементный `id` разрешает совпадения времени.
+
+`token_count` тоже вычисляется при вставке (через ORM и через пакетный
+`insert()`), поэтому контекст диалога подбирается по бюджету токенов без
+повторного подсчёта длины истории. При изменении `content` через ORM
+обработчик `before_update` пересчитывает его; изменение других полей столбец
+не трогает. Core `update()` с новым `content` должен передать и `token_count`.
+
+Индексы:
+- (dialog_session_id, timestamp DESC, id DESC) — последние сообщения диалога
+  и постраничное чтение истории диалога без сортировки;
+- (user_id, timestamp, id) — постраничное чтение истории пользователя.
 """
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, event
+from sqlalchemy.orm import Mapped, attributes, mapped_column
+
+from src.utils.tokens import count_tokens
 
 from .base import Base
 
 
+def utc_now() -> datetime:
+    """Текущее время в UTC; вызывается отдельно для каждой вставляемой строки."""
+    return datetime.now(timezone.utc)
+
+
+def content_tokens(context) -> int:
+    """Оценка длины `content` вставляемой строки в токенах."""
+    return count_tokens(context.get_current_parameters()["content"])
+
+
 class Message(Base):
     """
     ORM-модель сообщения.
     """
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     dialog_session_id: Mapped[str] = mapped_column(
-        String, index=True
+        String
     )  # Можно использовать UUID, если будете генерировать UUID в Python
-    role: Mapped[str] = mapped_column(String)  # Роль персонажа
+    role: Mapped[str] = mapped_column(String)  # user, assistant, system или персонаж
     content: Mapped[str] = mapped_column(Text)
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.now(timezone.utc), index=True
-    )  # Используем UTC
+        DateTime, default=utc_now, index=True
+    )  # Используем UTC; передаём функцию, а не значение, вычисленное при импорте
     message_type: Mapped[str] = mapped_column(String, default="text")  # Тип сообщения
+    token_count: Mapped[int | None] = mapped_column(
+        Integer, default=content_tokens
+    )  # NULL только у строк, записанных до появления столбца
 
     def __repr__(self):
         return f"<Message(id={self.id}, user_id={self.user_id}, dialog_session_id={self.dialog_session_id}, role='{self.role}', timestamp={self.timestamp}, message_type='{self.message_type}')>"
+
+
+@event.listens_for(Message, "before_update")
+def _recount_changed_content(mapper, connection, target: Message) -> None:
+    """Пересчитывает `token_count`, только если изменился `content`."""
+    if attributes.get_history(target, "content").has_changes():
+        target.token_count = count_tokens(target.content)
+
+
+# Составные индексы заменяют одиночные индексы по user_id и dialog_session_id:
+# их префикс обслуживает те же поиски по равенству
+Index(
+    "ix_messages_dialog_session_id_timestamp_id",
+    Message.dialog_session_id,
+    Message.timestamp.desc(),
+    Message.id.desc(),
+)
+Index(
+    "ix_messages_user_id_timestamp_id", Message.user_id, Message.timestamp, Message.id
+)
@@ -21,6 +21,7 @@ class MessageRead(BaseModel):
     content: str
     timestamp: datetime
     message_type: str
+    token_count: int | None = None  # Длина content в токенах (см. `Message`)
 
     model_config = ConfigDict(
         from_attributes=True,  # Позволяет создавать схему из ORM-объектов
@@ -2,20 +2,61 @@
 
 Обеспечивает цветной вывод в консоль и запись логов в файлы.
 
+Вызов логгера не выполняет ввод-вывод в потоке приложения (и в event loop):
+все логгеры делят один `QueueHandler`, который кладёт записи в ограниченную
+очередь. Единственный фоновый поток `QueueListener` забирает записи из очереди
+и пишет их в консоль и в файл.
+
 Attributes:
     LOGS_DIR (str): Путь к директории, где будут сохраняться лог-файлы.
     LOG_FORMAT (str): Формат строки лога.
     DATE_FORMAT (str): Формат даты и времени в логах.
+    LOG_QUEUE_SIZE (int): Ёмкость очереди записей (переменная окружения
+        `LOG_QUEUE_SIZE`).
+    LOG_OVERFLOW_POLICY (str): Поведение при переполнении очереди
+        (переменная окружения `LOG_OVERFLOW_POLICY`): `drop_oldest` —
+        вытеснить самую старую запись, `block` — ждать места в очереди.
+    LOG_FILE_MODE (str): Формат лог-файла (переменная окружения
+        `LOG_FILE_MODE`): `text` — как в консоли, без цвета; `json` — одна
+        JSON-запись на строку со всеми полями из `extra`.
+    LOG_MAX_BYTES (int): Размер лог-файла, после которого он ротируется
+        (переменная окружения `LOG_MAX_BYTES`, 0 — без ограничения).
+    LOG_RETENTION_BYTES (int): Суммарный объём лог-файлов, сверх которого
+        удаляются самые старые архивы (переменная окружения
+        `LOG_RETENTION_BYTES`, 0 — без ограничения).
+    LOG_COMPRESS (bool): Сжимать ли ротированные файлы gzip (переменная
+        окружения `LOG_COMPRESS`).
+    LOG_DEDUP_WINDOW (float): Окно в секундах, в котором повторы записи с тем
+        же логгером, уровнем и шаблоном сообщения подавляются (переменная
+        окружения `LOG_DEDUP_WINDOW`, 0 — не подавлять).
+    LOG_SAMPLING (dict[str, float]): Доля пропускаемых DEBUG/INFO-записей по
+        префиксу имени логгера (переменная окружения `LOG_SAMPLING`, например
+        `src.databases=0.1,aiogram.event=0.5`).
 """
 
+import atexit
+import copy
+import gzip
+import json
 import logging
 import os
+import queue
+import random
+import shutil
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener
 
 from colorama import Back, Fore, Style, init
 
-import os
+try:
+    import orjson
+except ImportError:  # Необязательная зависимость: без неё используется json
+    orjson = None
 
 # Инициализация colorama для Windows/Linux/macOS
 init(autoreset=True)
@@ -28,6 +69,37 @@ os.makedirs(LOGS_DIR, exist_ok=True)
 LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s:%(lineno)d | %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Параметры очереди логирования
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_OVERFLOW_POLICY = os.getenv("LOG_OVERFLOW_POLICY", "drop_oldest")
+
+# Формат лог-файла: text или json
+LOG_FILE_MODE = os.getenv("LOG_FILE_MODE", "text")
+
+# Ротация и хранение лог-файлов
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+LOG_RETENTION_BYTES = int(os.getenv("LOG_RETENTION_BYTES", str(1024 * 1024 * 1024)))
+LOG_COMPRESS = os.getenv("LOG_COMPRESS", "true").lower() in ("1", "true", "yes")
+
+
+def _parse_sampling(value: str) -> dict[str, float]:
+    """Разбирает строку вида `logger=0.1,other.logger=0.5`."""
+    ratios = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, ratio = item.partition("=")
+        ratios[name.strip()] = float(ratio)
+    return ratios
+
+
+# Подавление повторов и сэмплирование
+LOG_DEDUP_WINDOW = float(os.getenv("LOG_DEDUP_WINDOW", "5"))
+LOG_SAMPLING = _parse_sampling(os.getenv("LOG_SAMPLING", ""))
+
+# Стандартные атрибуты LogRecord; всё остальное в записи пришло из `extra`
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
+
 
 class ColoredFormatter(logging.Formatter):
     """Цветной форматтер для вывода логов в консоль.
@@ -36,6 +108,9 @@ class ColoredFormatter(logging.Formatter):
     в зависимости от уровня логирования. Поддерживаются уровни DEBUG, INFO,
     WARNING, ERROR и CRITICAL.
 
+    Форматтеры для каждого уровня создаются один раз в конструкторе, поэтому
+    `format` не изменяет общее состояние и безопасен при вызове из разных потоков.
+
     Attributes:
         COLORS (dict): Сопоставление уровней логирования с цветами из библиотеки colorama.
     """
@@ -48,11 +123,21 @@ class ColoredFormatter(logging.Formatter):
         "CRITICAL": Back.RED + Fore.WHITE + Style.BRIGHT,
     }
 
+    def __init__(self, fmt=LOG_FORMAT, datefmt=DATE_FORMAT):
+        """
+        Args:
+            fmt (str): Формат строки лога без цветовых кодов.
+            datefmt (str): Формат даты и времени.
+        """
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        self._formatters = {
+            level: logging.Formatter(f"{color}{fmt}{Style.RESET_ALL}", datefmt)
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record):
         """Форматирует запись лога, применяя цвет в зависимости от уровня.
 
-        Цвет устанавливается перед вызовом базового метода `format()` родительского класса.
-
         Args:
             record (logging.LogRecord): Объект записи лога.
 
@@ -60,10 +145,622 @@ class ColoredFormatter(logging.Formatter):
             str: Отформатированная строка лога с цветовым выделением.
         """
 
-        log_level = record.levelname
-        color = self.COLORS.get(log_level, "")
-        self._style._fmt = f"{color}{LOG_FORMAT}{Style.RESET_ALL}"
-        return super().format(record)
+        formatter = self._formatters.get(record.levelname)
+        if formatter is None:
+            return super().format(record)
+        return formatter.format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматтер JSON Lines для машинного разбора логов.
+
+    Каждая запись — один JSON-объект в строке с полями `ts` (ISO 8601, UTC),
+    `level`, `logger`, `line`, `msg`, а также `exc` и `stack`, если есть.
+    Поля, переданные через `extra`, добавляются как есть; несериализуемые
+    значения приводятся к строке. При установленном `orjson` сериализация
+    выполняется им, иначе — стандартным `json`.
+
+    Example:
+        logger.info("Сообщение сохранено", extra={"user_id": 1, "dialog": "abc"})
+        # {"ts":"...","level":"INFO",...,"msg":"Сообщение сохранено","user_id":1,...}
+    """
+
+    # Кэш (секунда, строка) — секундная часть метки меняется редко
+    _ts_cache = (None, "")
+
+    def _timestamp(self, created: float) -> str:
+        """Форматирует время записи как ISO 8601 в UTC с миллисекундами."""
+        second = int(created)
+        cached_second, prefix = self._ts_cache
+        if cached_second != second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._ts_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1000):03d}Z"
+
+    def format(self, record):
+        """Сериализует запись лога в одну JSON-строку.
+
+        Args:
+            record (logging.LogRecord): Объект записи лога.
+
+        Returns:
+            str: JSON-объект без перевода строки.
+        """
+        payload = {
+            "ts": self._timestamp(record.created),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = self.formatStack(record.stack_info)
+
+        return _dumps(payload)
+
+
+def _dumps(payload: dict) -> str:
+    """Сериализует словарь в компактный JSON (orjson, если установлен)."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode()
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Обработчик, передающий записи в ограниченную очередь фонового потока.
+
+    При переполнении очереди действует согласно политике:
+    `drop_oldest` вытесняет самую старую запись (вызов логгера никогда не
+    блокируется), `block` ждёт освобождения места.
+
+    Attributes:
+        dropped (int): Количество записей, вытесненных из-за переполнения.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "drop_oldest"):
+        """
+        Args:
+            log_queue (queue.Queue): Общая очередь записей.
+            overflow_policy (str): `drop_oldest` или `block`.
+
+        Raises:
+            ValueError: Если политика переполнения неизвестна.
+        """
+        if overflow_policy not in ("drop_oldest", "block"):
+            raise ValueError(f"Unknown log overflow policy: {overflow_policy}")
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        """Готовит запись к передаче в другой поток.
+
+        Подставляет аргументы в сообщение и заранее форматирует traceback
+        в `exc_text`, чтобы запись не ссылалась на изменяемые объекты, а
+        форматтеры в фоновом потоке по-прежнему выводили traceback.
+
+        Args:
+            record (logging.LogRecord): Исходная запись.
+
+        Returns:
+            logging.LogRecord: Копия записи, безопасная для другого потока.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        """Кладёт запись в очередь с учётом политики переполнения.
+
+        Args:
+            record (logging.LogRecord): Подготовленная запись.
+        """
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+
+        while True:
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class _DrainingQueueListener(QueueListener):
+    """`QueueListener`, который при остановке дописывает всю очередь.
+
+    Стандартный `enqueue_sentinel` использует `put_nowait` и падает на
+    заполненной ограниченной очереди; здесь маркер остановки ждёт места.
+    """
+
+    def enqueue_sentinel(self):
+        """Ставит маркер остановки в конец очереди."""
+        self.queue.put(self._sentinel)
+
+
+class DailySizeRotatingFileHandler(BaseRotatingHandler):
+    """Файловый обработчик с ротацией по дням и по размеру.
+
+    Пишет в `<директория>/YYYY-MM-DD<suffix>` за текущий день. Файл
+    ротируется, когда:
+
+    - наступили новые сутки — файл прошлого дня закрывается целиком;
+    - файл достиг `max_bytes` — он переименовывается в
+      `YYYY-MM-DD.<N><suffix>`, а запись продолжается в новый файл того же дня.
+
+    Ротированные файлы сжимаются gzip в отдельном фоновом потоке, после чего
+    самые старые из них удаляются, пока суммарный объём лог-файлов в
+    директории превышает `retention_bytes`. Текущий файл никогда не удаляется.
+
+    Обработчик рассчитан на запись из одного потока (`QueueListener`).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        suffix: str = ".log",
+        max_bytes: int = 0,
+        retention_bytes: int = 0,
+        compress: bool = True,
+        encoding: str = "utf-8",
+    ):
+        """
+        Args:
+            directory (str): Директория лог-файлов.
+            suffix (str): Расширение лог-файлов (`.log` или `.jsonl`).
+            max_bytes (int): Порог ротации по размеру; 0 — без ограничения.
+            retention_bytes (int): Бюджет объёма всех лог-файлов; 0 — без ограничения.
+            compress (bool): Сжимать ли ротированные файлы gzip.
+            encoding (str): Кодировка лог-файлов.
+        """
+        self.directory = directory
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.retention_bytes = retention_bytes
+        self.compress = compress
+        self._day = datetime.now().date()
+        self._rollover_at = self._next_midnight()
+        super().__init__(self._day_path(self._day), "a", encoding=encoding)
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-compress"
+        )
+        # Ротированные файлы, ещё не обработанные фоновым потоком
+        self._pending: set[str] = set()
+        # Досжимаем файлы, оставшиеся после прошлых запусков
+        self._submit(*self._stale_files())
+
+    def _day_path(self, day) -> str:
+        """Путь к файлу указанного дня."""
+        return os.path.join(self.directory, f"{day.isoformat()}{self.suffix}")
+
+    def _next_midnight(self) -> float:
+        """Момент (epoch) начала следующих локальных суток."""
+        tomorrow = datetime.combine(self._day + timedelta(days=1), datetime.min.time())
+        return tomorrow.timestamp()
+
+    def _stale_files(self) -> list[str]:
+        """Несжатые файлы с тем же расширением, кроме текущего."""
+        paths = (
+            os.path.abspath(os.path.join(self.directory, name))
+            for name in os.listdir(self.directory)
+            if name.endswith(self.suffix)
+        )
+        return [path for path in paths if path != self.baseFilename]
+
+    def shouldRollover(self, record) -> bool:
+        """Проверяет, наступили ли новые сутки или превышен размер файла.
+
+        Размер проверяется после предыдущей записи, чтобы не форматировать
+        запись дважды; файл может превысить порог на одну запись.
+        """
+        if record.created >= self._rollover_at:
+            return True
+        return bool(
+            self.max_bytes and self.stream and self.stream.tell() >= self.max_bytes
+        )
+
+    def doRollover(self) -> None:
+        """Закрывает текущий файл, открывает новый и ставит старый в очередь на сжатие."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        today = datetime.now().date()
+        if today != self._day:
+            rotated = self.baseFilename
+            self._day = today
+            self._rollover_at = self._next_midnight()
+            self.baseFilename = os.path.abspath(self._day_path(today))
+        else:
+            rotated = self._next_part_path()
+            if os.path.exists(self.baseFilename):
+                os.rename(self.baseFilename, rotated)
+
+        self.stream = self._open()
+        if os.path.exists(rotated):
+            self._submit(rotated)
+
+    def _submit(self, *paths: str) -> None:
+        """Ставит ротированные файлы в очередь фонового потока."""
+        self._pending.update(os.path.abspath(path) for path in paths)
+        self._executor.submit(self._compress_and_prune, *paths)
+
+    def _next_part_path(self) -> str:
+        """Свободное имя `YYYY-MM-DD.<N><suffix>` для части текущего дня."""
+        part = 1
+        while True:
+            path = os.path.join(
+                self.directory, f"{self._day.isoformat()}.{part}{self.suffix}"
+            )
+            if not os.path.exists(path) and not os.path.exists(f"{path}.gz"):
+                return path
+            part += 1
+
+    def _compress_and_prune(self, *paths: str) -> None:
+        """Сжимает ротированные файлы и соблюдает бюджет хранения (фоновый поток)."""
+        for path in paths:
+            self._pending.discard(os.path.abspath(path))
+            if not self.compress:
+                continue
+            try:
+                with open(path, "rb") as src, gzip.open(f"{path}.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                # Архив наследует время изменения, чтобы старые логи удалялись первыми
+                shutil.copystat(path, f"{path}.gz")
+                os.remove(path)
+            except OSError as e:
+                print(f"Не удалось сжать лог-файл {path}: {e}", file=sys.stderr)
+        self._enforce_retention()
+
+    def _enforce_retention(self) -> None:
+        """Удаляет самые старые лог-файлы, пока их объём превышает бюджет."""
+        if not self.retention_bytes:
+            return
+
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith((".log", ".jsonl", ".gz")):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.retention_bytes:
+                break
+            path = os.path.abspath(path)
+            if path == self.baseFilename or path in self._pending:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                print(f"Не удалось удалить лог-файл {path}: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Закрывает файл и дожидается завершения фонового сжатия."""
+        super().close()
+        self._executor.shutdown(wait=True)
+
+
+class DedupFilter(logging.Filter):
+    """Фильтр, схлопывающий повторяющиеся записи и сэмплирующий DEBUG/INFO.
+
+    Записи с одинаковыми (логгер, уровень, шаблон сообщения) внутри окна
+    `window` секунд пропускаются один раз; остальные подсчитываются. Когда
+    окно истекает, в конвейер отправляется сводная запись
+    «... повторилось ещё N раз за T с» (с полем `suppressed` для JSON-логов).
+    Ключом служит шаблон (`record.msg`), а не итоговый текст, поэтому
+    сообщения, различающиеся только аргументами, тоже схлопываются.
+
+    Для DEBUG и INFO можно задать долю пропускаемых записей по префиксу имени
+    логгера; выбывшие при сэмплировании записи учитываются в `sampled_out`.
+
+    Фильтр подключается к общему `QueueHandler`, поэтому подавленные записи
+    не копируются и не попадают в очередь.
+    """
+
+    # Как часто (не чаще, с) искать истёкшие окна при поступлении записей
+    SWEEP_INTERVAL = 1.0
+
+    # Сколько шаблонов хранит `suppressed_by_key`: при f-строках каждое
+    # сообщение — свой шаблон, поэтому при превышении `SUPPRESSED_KEYS_LIMIT`
+    # остаются только `SUPPRESSED_KEYS_KEEP` самых частых
+    SUPPRESSED_KEYS_LIMIT = 1000
+    SUPPRESSED_KEYS_KEEP = 100
+
+    def __init__(
+        self,
+        window: float = 5.0,
+        sampling: dict[str, float] | None = None,
+        emit=None,
+    ):
+        """
+        Args:
+            window (float): Окно подавления повторов в секундах; 0 — выключено.
+            sampling (dict[str, float], optional): Доля пропускаемых DEBUG/INFO
+                записей по префиксу имени логгера.
+            emit (callable, optional): Куда отправлять сводные записи
+                (обычно `handle` обработчика, к которому подключён фильтр).
+        """
+        super().__init__()
+        self.window = window
+        self.sampling = sampling or {}
+        self.emit = emit
+        self._lock = threading.Lock()
+        # ключ -> [начало окна, число подавленных, первая запись окна]
+        self._windows: dict[tuple, list] = {}
+        self._ratios: dict[str, float] = {}
+        self._next_sweep = 0.0
+        self.passed = 0
+        self.suppressed = 0
+        self.sampled_out = 0
+        self.summaries = 0
+        self.suppressed_by_key: Counter = Counter()
+
+    def _sample_ratio(self, name: str) -> float:
+        """Доля пропускаемых записей логгера (по самому длинному префиксу)."""
+        ratio = self._ratios.get(name)
+        if ratio is None:
+            ratio = 1.0
+            best = -1
+            for prefix, value in self.sampling.items():
+                matches = name == prefix or name.startswith(f"{prefix}.")
+                if matches and len(prefix) > best:
+                    ratio, best = value, len(prefix)
+            self._ratios[name] = ratio
+        return ratio
+
+    def filter(self, record) -> bool:
+        """Решает, пропустить ли запись дальше.
+
+        Args:
+            record (logging.LogRecord): Объект записи лога.
+
+        Returns:
+            bool: True, если запись нужно записать.
+        """
+        if getattr(record, "dedup_summary", False):
+            return True
+
+        if record.levelno <= logging.INFO and self.sampling:
+            ratio = self._sample_ratio(record.name)
+            if ratio < 1.0 and random.random() >= ratio:
+                with self._lock:
+                    self.sampled_out += 1
+                return False
+
+        if self.window <= 0:
+            with self._lock:
+                self.passed += 1
+            return True
+
+        template = record.msg if isinstance(record.msg, str) else str(record.msg)
+        key = (record.name, record.levelno, template)
+        now = record.created
+        with self._lock:
+            summaries = self._sweep(now) if now >= self._next_sweep else []
+            state = self._windows.get(key)
+            if state is not None and now - state[0] < self.window:
+                state[1] += 1
+                self.suppressed += 1
+                self.suppressed_by_key[key] += 1
+                allowed = False
+            else:
+                if state is not None and state[1]:
+                    summaries.append(self._summary(state, now))
+                self._windows[key] = [now, 0, record]
+                self.passed += 1
+                allowed = True
+
+        self._emit_summaries(summaries)
+        return allowed
+
+    def _sweep(self, now: float) -> list[logging.LogRecord]:
+        """Закрывает истёкшие окна и возвращает сводки по ним (под блокировкой)."""
+        self._next_sweep = now + min(self.window, self.SWEEP_INTERVAL)
+        if len(self.suppressed_by_key) > self.SUPPRESSED_KEYS_LIMIT:
+            self.suppressed_by_key = Counter(
+                dict(self.suppressed_by_key.most_common(self.SUPPRESSED_KEYS_KEEP))
+            )
+        summaries = []
+        for key, state in list(self._windows.items()):
+            if now - state[0] >= self.window:
+                del self._windows[key]
+                if state[1]:
+                    summaries.append(self._summary(state, now))
+        return summaries
+
+    def _summary(self, state: list, now: float) -> logging.LogRecord:
+        """Создаёт сводную запись о подавленных повторах окна."""
+        started, count, first = state
+        template = first.msg if isinstance(first.msg, str) else str(first.msg)
+        summary = logging.LogRecord(
+            first.name,
+            first.levelno,
+            first.pathname,
+            first.lineno,
+            "Сообщение «%s» повторилось ещё %d раз за %.1f с",
+            (template, count, now - started),
+            None,
+            first.funcName,
+        )
+        summary.dedup_summary = True
+        summary.suppressed = count
+        self.summaries += 1
+        return summary
+
+    def _emit_summaries(self, summaries: list[logging.LogRecord]) -> None:
+        """Отправляет сводные записи в конвейер (вне блокировки фильтра)."""
+        if self.emit is None:
+            return
+        for summary in summaries:
+            self.emit(summary)
+
+    def flush(self) -> None:
+        """Отправляет сводки по всем открытым окнам (например, при остановке)."""
+        with self._lock:
+            now = time.time()
+            summaries = [
+                self._summary(state, now)
+                for state in self._windows.values()
+                if state[1]
+            ]
+            self._windows.clear()
+        self._emit_summaries(summaries)
+
+    def stats(self) -> dict:
+        """
+        Счётчики фильтра.
+
+        Returns:
+            dict: passed, suppressed, sampled_out, summaries и top_suppressed —
+                до 10 шаблонов с наибольшим числом подавленных повторов.
+        """
+        with self._lock:
+            return {
+                "passed": self.passed,
+                "suppressed": self.suppressed,
+                "sampled_out": self.sampled_out,
+                "summaries": self.summaries,
+                "top_suppressed": [
+                    {
+                        "logger": name,
+                        "level": logging.getLevelName(level),
+                        "msg": msg,
+                        "count": count,
+                    }
+                    for (name, level, msg), count in self.suppressed_by_key.most_common(
+                        10
+                    )
+                ],
+            }
+
+
+# Форматтер только для traceback в BoundedQueueHandler.prepare
+_exception_formatter = logging.Formatter()
+
+# Общий конвейер логирования процесса (создаётся при первом get_logger)
+_pipeline_lock = threading.Lock()
+_queue_handler: BoundedQueueHandler | None = None
+_listener: _DrainingQueueListener | None = None
+_dedup_filter: DedupFilter | None = None
+
+
+def _build_sink_handlers() -> list[logging.Handler]:
+    """Создаёт обработчики, выполняющие реальный вывод в фоновом потоке.
+
+    Returns:
+        list[logging.Handler]: Обработчики консоли и файла.
+    """
+    # --- Консольный вывод ---
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.DEBUG)
+    console_formatter = ColoredFormatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT)
+    console_handler.setFormatter(console_formatter)
+
+    # --- Логирование в файл ---
+    if LOG_FILE_MODE == "json":
+        suffix = ".jsonl"
+        file_formatter = JsonFormatter()
+    elif LOG_FILE_MODE == "text":
+        suffix = ".log"
+        file_formatter = logging.Formatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT)
+    else:
+        raise ValueError(f"Unknown log file mode: {LOG_FILE_MODE}")
+    file_handler = DailySizeRotatingFileHandler(
+        LOGS_DIR,
+        suffix=suffix,
+        max_bytes=LOG_MAX_BYTES,
+        retention_bytes=LOG_RETENTION_BYTES,
+        compress=LOG_COMPRESS,
+    )
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(file_formatter)
+
+    return [console_handler, file_handler]
+
+
+def _get_queue_handler() -> BoundedQueueHandler:
+    """Возвращает общий `QueueHandler`, при первом вызове запуская фоновый поток.
+
+    Returns:
+        BoundedQueueHandler: Обработчик, общий для всех логгеров процесса.
+    """
+    global _queue_handler, _listener, _dedup_filter
+    with _pipeline_lock:
+        if _queue_handler is None:
+            log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+            _listener = _DrainingQueueListener(
+                log_queue, *_build_sink_handlers(), respect_handler_level=True
+            )
+            _listener.start()
+            _queue_handler = BoundedQueueHandler(log_queue, LOG_OVERFLOW_POLICY)
+            _dedup_filter = DedupFilter(
+                LOG_DEDUP_WINDOW, LOG_SAMPLING, emit=_queue_handler.handle
+            )
+            _queue_handler.addFilter(_dedup_filter)
+            atexit.register(shutdown_logging)
+        return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Дописывает накопленные записи и останавливает фоновый поток логирования.
+
+    Вызывается автоматически при завершении интерпретатора; повторный вызов
+    безопасен. После остановки следующий `get_logger` для нового логгера
+    запустит конвейер заново.
+    """
+    global _queue_handler, _listener, _dedup_filter
+    with _pipeline_lock:
+        if _listener is None:
+            return
+        _dedup_filter.flush()
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+            handler.close()
+        for logger in [
+            logging.getLogger(),
+            *logging.Logger.manager.loggerDict.values(),
+        ]:
+            if isinstance(logger, logging.Logger) and _queue_handler in logger.handlers:
+                logger.removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+        _dedup_filter = None
+
+
+def get_logging_stats() -> dict:
+    """
+    Счётчики конвейера логирования.
+
+    Returns:
+        dict: `dropped` — записи, вытесненные из переполненной очереди, и
+            счётчики `DedupFilter` (подавленные повторы и сэмплирование).
+            Пустой словарь, если конвейер ещё не запущен.
+    """
+    with _pipeline_lock:
+        if _queue_handler is None:
+            return {}
+        return {"dropped": _queue_handler.dropped, **_dedup_filter.stats()}
 
 
 def get_logger(name=None):
@@ -71,7 +768,7 @@ def get_logger(name=None):
 
     Создаёт и настраивает логгер, который выводит сообщения в консоль с цветовой
     индикацией уровня логирования и записывает информационные и более серьёзные
-    сообщения в файл.
+    сообщения в файл. Сам вывод выполняет общий фоновый поток.
 
     Args:
         name (str, optional): Имя логгера. Если не указано, возвращается корневой логгер.
@@ -88,20 +785,6 @@ def get_logger(name=None):
     if logger.hasHandlers():
         return logger
 
-    # --- Консольный вывод ---
-    console_handler = logging.StreamHandler(sys.stdout)
-
-    console_handler.setLevel(logging.DEBUG)
-    console_formatter = ColoredFormatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-
-    # --- Логирование в файл ---
-    log_file = os.path.join(LOGS_DIR, f"{datetime.now().strftime('%Y-%m-%d')}.log")
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter(fmt=LOG_FORMAT, datefmt=DATE_FORMAT)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(_get_queue_handler())
 
     return logger
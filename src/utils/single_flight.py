@@ -0,0 +1,116 @@
+"""
+Объединение одинаковых одновременных вызовов (single-flight).
+
+Когда в группе много пользователей одновременно вызывают один и тот же
+запрос к модели или присылают одно и то же голосовое сообщение, каждый вызов
+превращается в отдельный платный запрос к API. `SingleFlight` выполняет
+вызов один раз на ключ: пока он идёт, остальные вызовы с тем же ключом
+ждут тот же результат (или то же исключение).
+
+Отмена безопасна: общий вызов выполняется отдельной задачей, и отмена
+одного ожидающего не прерывает её для остальных. Задача отменяется, только
+когда отменены все ожидающие.
+
+Рассчитан на использование из одного event loop.
+"""
+
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def make_key(*parts: str | bytes) -> str:
+    """
+    Ключ по содержимому (например, по байтам аудио или телу запроса).
+
+    Returns:
+        str: SHA-256 частей в шестнадцатеричном виде.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode() if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Выполняет не больше одного вызова на ключ одновременно.
+
+    Example:
+        flight = SingleFlight()
+        text = await flight.do(make_key(audio), lambda: transcribe(audio))
+    """
+
+    def __init__(self):
+        # ключ -> [общая задача, количество ожидающих]
+        self._calls: dict[Hashable, list] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Возвращает результат `func()`, общий для одновременных вызовов с `key`.
+
+        Args:
+            key: Ключ вызова (одинаковые запросы — одинаковый ключ).
+            func: Функция без аргументов, возвращающая awaitable; вызывается,
+                только если вызова с этим ключом сейчас нет.
+
+        Raises:
+            Исключение `func()` — всем ожидающим этого вызова.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.ensure_future(func())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(
+                lambda _, key=key, call=call: self._forget(key, call)
+            )
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        task = call[0]
+        call[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.done() and not task.cancelled():
+                raise  # Отменили ожидающего уже после завершения вызова
+            call[1] -= 1
+            if call[1] == 0 and not task.done():
+                # Результат больше никому не нужен; новые вызовы начнут заново
+                self._forget(key, call)
+                task.cancel()
+                self.cancelled += 1
+            raise
+
+    def _forget(self, key: Hashable, call: list) -> None:
+        """Убирает завершённый вызов (следующий вызов с ключом начнётся заново)."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def in_flight(self) -> int:
+        """Количество выполняющихся сейчас вызовов."""
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        """
+        Счётчики объединения.
+
+        Returns:
+            dict: calls (реально выполненные вызовы), coalesced (вызовы,
+                получившие чужой результат), cancelled (вызовы, отменённые
+                после ухода всех ожидающих) и in_flight.
+        """
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight(),
+        }
@@ -0,0 +1,50 @@
+"""
+Оценка длины текста в токенах для бюджета контекста модели.
+
+Модель выбирается настройкой `MODEL_NAME` и может смениться в любой момент,
+поэтому точный токенизатор не используется. Вместо него — оценка «один токен
+на 4 байта UTF-8»: для английского текста она близка к токенизаторам
+BPE, а для кириллицы (2 байта на символ) слегка завышает длину.
+
+Для части текстов оценка занижает длину: числа и код (токенизаторы режут
+их на куски по 1–3 символа), эмодзи (4 байта, но нередко 2–3 токена) и
+CJK (3 байта на иероглиф, но около токена на иероглиф). Поэтому бюджет
+контекста оставляет запас `OPENROUTER_CONTEXT_RESERVE_PERCENT`.
+
+Оценка сохраняется в `Message.token_count` при вставке, чтобы не считать
+длину истории заново на каждом ходе.
+"""
+
+from typing import Protocol
+
+# Байт UTF-8 на токен в оценке `count_tokens`
+BYTES_PER_TOKEN = 4
+
+
+class _HasContent(Protocol):
+    content: str
+    token_count: int | None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Оценка количества токенов в тексте.
+
+    Returns:
+        int: Округлённое вверх отношение длины текста в байтах UTF-8
+            к `BYTES_PER_TOKEN`.
+    """
+    return -(-len(text.encode()) // BYTES_PER_TOKEN)
+
+
+def message_tokens(message: _HasContent) -> int:
+    """
+    Длина сообщения в токенах: сохранённая при вставке или оценённая заново.
+
+    Args:
+        message: `Message` или `MessageRead`; `token_count` пуст у строк,
+            записанных до появления столбца.
+    """
+    if message.token_count is not None:
+        return message.token_count
+    return count_tokens(message.content)
@@ -0,0 +1,110 @@
+"""
+Ограниченный in-memory кэш с вытеснением LRU и временем жизни записей.
+
+Используется для горячих поисков, где повторный запрос к БД дороже
+небольшой задержки актуальности данных (например, пользователь по Telegram ID).
+Поддерживает негативное кэширование — запоминание того, что ключа нет.
+
+Кэш не потокобезопасен и рассчитан на использование из одного event loop.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Маркер отсутствия ключа в кэше (в отличие от закэшированного None)
+MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU-кэш с ограничением по размеру и времени жизни записей.
+
+    Example:
+        cache = TTLCache(maxsize=1000, ttl=300, negative_ttl=30)
+        value = cache.get(key)
+        if value is MISSING:
+            value = await load(key)
+            cache.set(key, value)  # None будет закэширован на negative_ttl
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float | None = None):
+        """
+        Args:
+            maxsize: Максимальное количество записей; при переполнении
+                вытесняется давно не использованная.
+            ttl: Время жизни записи в секундах.
+            negative_ttl: Время жизни закэшированного `None` (промаха).
+                По умолчанию совпадает с `ttl`; 0 отключает негативный кэш.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key) -> Any:
+        """
+        Возвращает значение по ключу или `MISSING`, если записи нет или она устарела.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return MISSING
+
+        self._data.move_to_end(key)
+        if value is None:
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value) -> None:
+        """Сохраняет значение; `None` сохраняется как негативная запись."""
+        ttl = self.negative_ttl if value is None else self.ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            self._data.pop(key, None)
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key) -> None:
+        """Удаляет запись по ключу, если она есть."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все записи (счётчики сохраняются)."""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Счётчики кэша.
+
+        Returns:
+            dict: hits, negative_hits, misses, evictions, size и hit_rate.
+        """
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "hit_rate": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
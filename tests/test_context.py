@@ -0,0 +1,82 @@
+"""
+Тесты сборки контекста запроса и хранения `Message.token_count`.
+"""
+
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from configs.schemas.ai import OpenRouterSettings
+from src.ai.context import build_context
+from src.databases import redis as redis_module
+from src.databases.cache.dialog import DialogContextCache
+from src.databases.sqlite.models import Message, User
+from src.databases.sqlite.models.base import Base
+from src.utils.tokens import count_tokens
+
+DIALOG = "dialog-1"
+
+
+async def _session_factory():
+    """Фабрика сессий на SQLite в памяти с одним пользователем."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(User(id=1, telegram_id=1, first_name="Анна"))
+        await session.commit()
+    return session_factory
+
+
+def _message(role: str, content: str) -> Message:
+    return Message(user_id=1, dialog_session_id=DIALOG, role=role, content=content)
+
+
+def test_build_context_maps_character_roles(monkeypatch):
+    """Роль-персонаж уходит в API как `assistant`, остальные — как есть."""
+    monkeypatch.setattr(redis_module, "redis_client", None)
+
+    async def scenario():
+        session_factory = await _session_factory()
+        async with session_factory() as session:
+            session.add_all([_message("user", "Привет"), _message("Шерлок", "Ватсон")])
+            await session.commit()
+            messages = await build_context(
+                session,
+                DIALOG,
+                system_prompt="Ты — Шерлок Холмс.",
+                config=OpenRouterSettings(OPENROUTER_API_KEY="test-key"),
+                cache=DialogContextCache(),
+            )
+        assert [message["role"] for message in messages] == [
+            "system",
+            "user",
+            "assistant",
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_token_count_changes_only_with_content():
+    """UPDATE без `content` не трогает `token_count`, с `content` — пересчитывает."""
+
+    async def scenario():
+        session_factory = await _session_factory()
+        async with session_factory() as session:
+            message = _message("user", "Привет")
+            session.add(message)
+            await session.commit()
+
+            message.role = "assistant"
+            await session.commit()
+            stored = await session.scalar(select(Message.token_count))
+            assert stored == count_tokens("Привет")
+
+            message.content = "Привет, как дела?"
+            await session.commit()
+            stored = await session.scalar(select(Message.token_count))
+            assert stored == count_tokens("Привет, как дела?")
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+"""
+Тесты кэша диалогов `DialogContextCache` на fakeredis.
+"""
+
+import asyncio
+
+import fakeredis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.databases.cache.dialog import DialogContextCache
+from src.databases.dao.message_dao import MessageDAO
+from src.databases.dao.message_writer import MessageWriteQueue
+from src.databases.sqlite.models import User
+from src.databases.sqlite.models.base import Base
+
+DIALOG = "dialog-1"
+
+
+async def _session_factory():
+    """Фабрика сессий на SQLite в памяти с одним пользователем."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(User(id=1, telegram_id=1, first_name="Анна"))
+        await session.commit()
+    return session_factory
+
+
+def _message(content: str) -> dict:
+    return {
+        "user_id": 1,
+        "dialog_session_id": DIALOG,
+        "role": "user",
+        "content": content,
+    }
+
+
+def test_every_write_path_updates_cached_dialog():
+    """`create_message`, `add_many` и очередь записи дописывают кэш диалога."""
+
+    async def scenario():
+        session_factory = await _session_factory()
+        cache = DialogContextCache(client=fakeredis.FakeAsyncRedis())
+        cache.attach()
+        writer = MessageWriteQueue(session_factory=session_factory)
+        try:
+            async with session_factory() as session:
+                await MessageDAO.create_message(session, **_message("первое"))
+                # Промах заполняет кэш из SQLite
+                assert len(await cache.get_last_messages(session, DIALOG)) == 1
+
+                await MessageDAO.create_message(session, **_message("второе"))
+                await MessageDAO.add_many(session, [_message("третье")], bulk=True)
+                await writer.start()
+                await (await writer.enqueue(**_message("четвёртое")))
+                await writer.stop()
+
+                messages = await cache.get_last_messages(session, DIALOG)
+                assert [message.content for message in messages] == [
+                    "первое",
+                    "второе",
+                    "третье",
+                    "четвёртое",
+                ]
+                # Вставка без гидрации сбрасывает кэш диалога
+                await MessageDAO.add_many(
+                    session, [_message("пятое")], bulk=True, hydrate=False
+                )
+                messages = await cache.get_last_messages(session, DIALOG)
+            assert messages[-1].content == "пятое"
+        finally:
+            cache.detach()
+
+    asyncio.run(scenario())
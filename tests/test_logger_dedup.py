@@ -0,0 +1,29 @@
+"""
+Тесты фильтра повторов `DedupFilter`.
+"""
+
+import logging
+
+from src.utils.logger import DedupFilter
+
+
+def _record(msg: str, created: float) -> logging.LogRecord:
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, msg, None, None)
+    record.created = created
+    return record
+
+
+def test_suppressed_counter_is_bounded(monkeypatch):
+    """Счётчик подавленных шаблонов не растёт без предела при f-строках."""
+    monkeypatch.setattr(DedupFilter, "SUPPRESSED_KEYS_LIMIT", 10)
+    monkeypatch.setattr(DedupFilter, "SUPPRESSED_KEYS_KEEP", 3)
+    dedup = DedupFilter(window=5.0)
+    now = 1000.0
+    for i in range(50):
+        # Каждое сообщение уникально, повтор подавляется в своём окне
+        for _ in range(i % 5 + 1):
+            dedup.filter(_record(f"пользователь {i}", now))
+        now += 1.0
+
+    assert len(dedup.suppressed_by_key) <= 10
+    assert dedup.stats()["suppressed"] == sum(i % 5 for i in range(50))
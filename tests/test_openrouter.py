@@ -0,0 +1,160 @@
+"""
+Тесты клиента OpenRouter: повторные попытки на `httpx.MockTransport` и
+переиспользование соединения на локальном HTTP-сервере.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from configs.schemas.ai import OpenRouterSettings
+from src.ai import openrouter
+from src.ai.openrouter import OpenRouterClient, OpenRouterError
+
+MESSAGES = [{"role": "user", "content": "Привет!"}]
+RESPONSE = {"choices": [{"message": {"role": "assistant", "content": "Здравствуйте"}}]}
+
+
+def _config(**values) -> OpenRouterSettings:
+    """Настройки клиента для тестов: без прогрева и с короткими паузами."""
+    defaults = {
+        "OPENROUTER_API_KEY": "test-key",
+        "OPENROUTER_API_URL": "https://openrouter.test/api/v1/chat/completions",
+        "MAX_RETRIES": 3,
+        "OPENROUTER_RETRY_BASE_DELAY": 0.5,
+        "OPENROUTER_RETRY_MAX_DELAY": 8,
+        "OPENROUTER_PREWARM": False,
+        "OPENROUTER_COALESCE_REQUESTS": False,
+    }
+    return OpenRouterSettings(**(defaults | values))
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Паузы между попытками (без реального ожидания)."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(openrouter.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(openrouter.random, "uniform", lambda low, high: high)
+    return delays
+
+
+def test_retries_503_with_exponential_backoff(sleeps):
+    """Ответ 503 повторяется с растущей паузой, пока API не ответит 200."""
+    statuses = iter([503, 503, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        return httpx.Response(status, json=RESPONSE if status == 200 else {})
+
+    async def scenario():
+        client = OpenRouterClient(_config(), transport=httpx.MockTransport(handler))
+        try:
+            assert await client.complete(MESSAGES) == "Здравствуйте"
+        finally:
+            await client.close()
+        assert client.stats()["retries"] == 2
+
+    asyncio.run(scenario())
+    assert sleeps == [0.5, 1.0]
+
+
+def test_retries_timeout(sleeps):
+    """Таймаут попытки повторяется, как и сетевая ошибка."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ReadTimeout("нет ответа", request=request)
+        return httpx.Response(200, json=RESPONSE)
+
+    async def scenario():
+        client = OpenRouterClient(_config(), transport=httpx.MockTransport(handler))
+        try:
+            assert await client.complete(MESSAGES) == "Здравствуйте"
+        finally:
+            await client.close()
+
+    asyncio.run(scenario())
+    assert calls == 2
+    assert sleeps == [0.5]
+
+
+def test_does_not_retry_400(sleeps):
+    """Ответ 400 сразу завершается `OpenRouterError` без повторов."""
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+    async def scenario():
+        client = OpenRouterClient(_config(), transport=httpx.MockTransport(handler))
+        try:
+            with pytest.raises(OpenRouterError) as error:
+                await client.complete(MESSAGES)
+        finally:
+            await client.close()
+        assert error.value.status_code == 400
+        assert client.stats()["failures"] == 1
+
+    asyncio.run(scenario())
+    assert calls == 1
+    assert sleeps == []
+
+
+def test_requests_reuse_one_connection():
+    """Последовательные запросы идут по одному keep-alive соединению."""
+    connections = 0
+    body = json.dumps(RESPONSE).encode()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        nonlocal connections
+        connections += 1
+        try:
+            while headers := await reader.readuntil(b"\r\n\r\n"):
+                length = 0
+                for line in headers.decode("latin-1").split("\r\n"):
+                    name, _, value = line.partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            pass  # Клиент закрыл соединение
+        finally:
+            writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = OpenRouterClient(
+            _config(
+                OPENROUTER_API_URL=f"http://127.0.0.1:{port}/api/v1/chat/completions",
+                OPENROUTER_HTTP2=False,
+            )
+        )
+        try:
+            for _ in range(3):
+                assert await client.complete(MESSAGES) == "Здравствуйте"
+        finally:
+            await client.close()
+            server.close()
+        assert client.stats()["requests"] == 3
+
+    asyncio.run(scenario())
+    assert connections == 1
@@ -0,0 +1,92 @@
+"""
+Регрессионная проверка планов выполнения горячих запросов к SQLite.
+
+Схема создаётся миграциями Alembic (`alembic upgrade head`) во временной
+базе, а не `create_all`, поэтому проверяются индексы, которые реально
+окажутся в рабочей базе. Для каждого запроса `MessageDAO` через
+`EXPLAIN QUERY PLAN` проверяется, что он использует ожидаемый индекс и не
+сортирует строки во временном B-дереве.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+from alembic import command
+from configs.settings import settings
+from src.databases.dao import MessageDAO
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DIALOG_INDEX = "ix_messages_dialog_session_id_timestamp_id"
+USER_INDEX = "ix_messages_user_id_timestamp_id"
+
+# Проверяемые запросы: название -> (запрос, ожидаемый индекс)
+QUERIES = {
+    "get_last_messages": (
+        MessageDAO._last_messages_query("dialog", limit=30),
+        DIALOG_INDEX,
+    ),
+    "get_context_messages (страница после курсора)": (
+        MessageDAO._last_messages_query(
+            "dialog",
+            limit=50,
+            before_timestamp=datetime(2024, 1, 1),
+            before_id=1,
+        ),
+        DIALOG_INDEX,
+    ),
+    "stream_messages_by_session (страница)": (
+        MessageDAO._keyset_page_query(
+            MessageDAO.model.dialog_session_id == "dialog",
+            chunk_size=500,
+            last_timestamp=datetime(2024, 1, 1),
+            last_id=1,
+        ),
+        DIALOG_INDEX,
+    ),
+    "stream_messages_by_user (страница)": (
+        MessageDAO._keyset_page_query(
+            MessageDAO.model.user_id == 1,
+            chunk_size=500,
+            last_timestamp=datetime(2024, 1, 1),
+            last_id=1,
+        ),
+        USER_INDEX,
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def migrated_engine(tmp_path_factory):
+    """Синхронный движок на временной базе, созданной миграциями Alembic."""
+    path = tmp_path_factory.mktemp("plans") / "db.sqlite3"
+    sqlite_config = settings.database.sqlite
+    database_url = sqlite_config.database_url
+    sqlite_config.database_url = f"sqlite+aiosqlite:///{path}"
+    try:
+        # Без файла конфигурации env.py не перенастраивает логирование
+        config = Config()
+        config.set_main_option("script_location", str(ROOT / "alembic"))
+        command.upgrade(config, "head")
+    finally:
+        sqlite_config.database_url = database_url
+
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("title", list(QUERIES))
+def test_query_uses_index_without_sorting(migrated_engine, title):
+    """Запрос читает ожидаемый индекс и не сортирует во временном B-дереве."""
+    query, expected_index = QUERIES[title]
+    sql = str(query.compile(migrated_engine, compile_kwargs={"literal_binds": True}))
+    with migrated_engine.connect() as conn:
+        plan = [row.detail for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+    assert any(expected_index in step for step in plan), plan
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,99 @@
+"""
+Тесты пакетной отправки команд `RedisBatcher` на fakeredis.
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from src.databases.redis_batch import RedisBatcher
+from src.databases.redis_codec import ModelCodec
+from src.databases.sqlite.schemas import UserRead
+
+
+def test_commands_of_one_loop_pass_share_a_pipeline():
+    """Команды одного прохода event loop уходят одним конвейером."""
+
+    async def scenario():
+        batcher = RedisBatcher(client=fakeredis.FakeAsyncRedis(decode_responses=True))
+        await batcher.set("a", "1")
+        results = await asyncio.gather(
+            batcher.get("a"), batcher.get("missing"), batcher.expire("a", 60)
+        )
+        assert results == ["1", None, True]
+        assert batcher.stats()["batches"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_binary_batcher_reads_codec_values():
+    """Батчер без декодирования ответов возвращает байты кодека как есть."""
+
+    async def scenario():
+        codec = ModelCodec(UserRead, "struct")
+        user = UserRead(id=1, telegram_id=2, first_name="Анна", username=None)
+        batcher = RedisBatcher(client=fakeredis.FakeAsyncRedis(), binary=True)
+        await batcher.set("user:tg:2", codec.encode(user))
+        assert codec.decode(await batcher.get("user:tg:2")) == user
+
+    asyncio.run(scenario())
+
+
+def test_unexpected_error_fails_every_future_of_the_chunk():
+    """Любое исключение при отправке завершает ошибкой все Future пакета."""
+
+    async def scenario():
+        batcher = RedisBatcher(client=fakeredis.FakeAsyncRedis())
+        good = batcher.get("a")
+        bad = batcher._enqueue("no_such_command", "a")
+        with pytest.raises(AttributeError):
+            await bad
+        with pytest.raises(AttributeError):
+            await good
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_block_cancels_queued_commands():
+    """Исключение в `batch()` не отправляет команды и отменяет их Future."""
+
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis()
+        batcher = RedisBatcher(client=client)
+        with pytest.raises(ValueError):
+            async with batcher.batch():
+                future = batcher.set("a", b"1")
+                raise ValueError("сбой внутри блока")
+        assert future.cancelled()
+        assert await client.exists("a") == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_flush_cancels_futures():
+    """Отмена отправки отменяет Future, а не оставляет их ожидающими."""
+
+    class SlowPipeline:
+        async def __aenter__(self):
+            await asyncio.sleep(10)
+
+        async def __aexit__(self, *exc):
+            return False
+
+    class SlowRedis:
+        def pipeline(self, transaction=True):
+            return SlowPipeline()
+
+    async def scenario():
+        batcher = RedisBatcher(client=SlowRedis())
+        future = batcher.get("a")
+        await asyncio.sleep(0)  # Запуск фоновой отправки
+        tasks = list(batcher._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0)  # Колбэки завершения задачи
+        assert future.cancelled()
+
+    asyncio.run(scenario())
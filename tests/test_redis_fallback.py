@@ -0,0 +1,60 @@
+"""
+Тесты возврата из хранилища в памяти к Redis на fakeredis.
+"""
+
+import asyncio
+
+import fakeredis
+
+from configs.settings import settings
+from src.databases import redis as redis_module
+
+
+def test_restore_drops_keys_written_during_outage(monkeypatch):
+    """После восстановления в Redis не остаются копии ключей, изменённых в памяти."""
+
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        monkeypatch.setattr(redis_module, "redis_client", client)
+        monkeypatch.setattr(settings.database.redis, "redis_fallback_enabled", True)
+        monkeypatch.setattr(redis_module, "_restore_listeners", [])
+        restored = []
+        redis_module.add_restore_listener(lambda: restored.append(True))
+
+        await client.set("dialog:s1:version", "1")
+        await client.set("user:tg:5", "stale")
+        await client.set("other", "keep")
+
+        redis_module.mark_redis_unavailable(OSError("Redis недоступен"))
+        memory = await redis_module.get_redis_client()
+        await memory.incr("dialog:s1:version")
+        await memory.delete("user:tg:5")
+
+        await redis_module._restore_redis()
+        assert not redis_module.is_redis_degraded()
+        assert await client.keys("*") == ["other"]
+        assert restored == [True]
+
+    asyncio.run(scenario())
+
+
+def test_restore_after_journal_overflow_drops_cache_prefixes(monkeypatch):
+    """При переполнении журнала удаляются все ключи зарегистрированных префиксов."""
+
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        monkeypatch.setattr(redis_module, "redis_client", client)
+        monkeypatch.setattr(settings.database.redis, "redis_fallback_enabled", True)
+        monkeypatch.setattr(redis_module, "_cache_prefixes", {"dialog:"})
+
+        await client.set("dialog:s2:version", "1")
+        await client.set("other", "keep")
+
+        redis_module.mark_redis_unavailable(OSError("Redis недоступен"))
+        memory = await redis_module.get_redis_client()
+        memory.written_overflow = True
+
+        await redis_module._restore_redis()
+        assert await client.keys("*") == ["other"]
+
+    asyncio.run(scenario())
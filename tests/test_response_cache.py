@@ -0,0 +1,74 @@
+"""
+Тесты кэша ответов модели `LLMResponseCache` на fakeredis и `httpx.MockTransport`.
+"""
+
+import asyncio
+
+import fakeredis
+import httpx
+
+from configs.schemas.ai import OpenRouterSettings
+from src.ai.openrouter import OpenRouterClient
+from src.ai.response_cache import LLMResponseCache
+from src.databases import redis as redis_module
+
+MESSAGES = [{"role": "user", "content": "Привет!"}]
+RESPONSE = {
+    "choices": [{"message": {"role": "assistant", "content": "Здравствуйте"}}],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 2},
+}
+
+
+def _llm_client(calls: list) -> OpenRouterClient:
+    """Клиент OpenRouter, который отвечает без сети и считает запросы."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=RESPONSE)
+
+    config = OpenRouterSettings(OPENROUTER_API_KEY="test-key", OPENROUTER_PREWARM=False)
+    return OpenRouterClient(config, transport=httpx.MockTransport(handler))
+
+
+def test_second_deterministic_request_is_served_from_cache():
+    """Повторный запрос с `temperature = 0` не доходит до API."""
+
+    async def scenario():
+        calls = []
+        cache = LLMResponseCache(
+            llm_client=_llm_client(calls), redis_client=fakeredis.FakeAsyncRedis()
+        )
+        for _ in range(2):
+            assert await cache.complete(MESSAGES, temperature=0) == "Здравствуйте"
+        assert len(calls) == 1
+        assert cache.stats()["saved_tokens"] == 7
+
+    asyncio.run(scenario())
+
+
+def test_uninitialized_redis_is_a_miss(monkeypatch):
+    """Без `setup_redis` кэш пропускается, а запрос уходит в API."""
+    monkeypatch.setattr(redis_module, "redis_client", None)
+
+    async def scenario():
+        calls = []
+        cache = LLMResponseCache(llm_client=_llm_client(calls))
+        for _ in range(2):
+            assert await cache.complete(MESSAGES, temperature=0) == "Здравствуйте"
+        assert len(calls) == 2
+        assert cache.stats()["misses"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_zero_ttl_does_not_store_responses():
+    """`ttl = 0` не подменяется настройкой и не сохраняет ответы."""
+
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis()
+        cache = LLMResponseCache(llm_client=_llm_client([]), redis_client=client, ttl=0)
+        assert cache.ttl == 0
+        await cache.complete(MESSAGES, temperature=0)
+        assert await client.dbsize() == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,121 @@
+"""
+Тесты объединения одновременных вызовов `SingleFlight`.
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+class Call:
+    """Вызов, завершением которого управляет тест."""
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+        self.error: Exception | None = None
+
+    async def __call__(self) -> str:
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return f"результат {self.started}"
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    """Отмена одного ожидающего не прерывает вызов для остальных."""
+
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        call.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1:] == ["результат 1", "результат 1"]
+        assert call.started == 1
+        assert not call.cancelled
+        assert flight.stats()["coalesced"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_all_waiters_cancelled_cancels_call_and_forgets_key():
+    """Когда отменены все ожидающие, общий вызов отменяется и ключ забывается."""
+
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)  # Отмена доходит до общей задачи
+
+        assert call.cancelled
+        assert flight.in_flight() == 0
+        assert flight.stats()["cancelled"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_exception_is_raised_to_every_waiter():
+    """Исключение вызова получают все ожидающие."""
+
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        call.error = ValueError("API недоступен")
+        waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        call.release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(result is call.error for result in results)
+        assert call.started == 1
+        assert flight.in_flight() == 0
+
+    asyncio.run(scenario())
+
+
+def test_call_after_completion_starts_fresh():
+    """Вызов после завершения предыдущего выполняется заново."""
+
+    async def scenario():
+        flight, call = SingleFlight(), Call()
+        call.release.set()
+        assert await flight.do("key", call) == "результат 1"
+        assert await flight.do("key", call) == "результат 2"
+        assert flight.stats()["calls"] == 2
+        assert flight.stats()["coalesced"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_call_does_not_block_next_call():
+    """После отмены всех ожидающих новый вызов с тем же ключом не ждёт старый."""
+
+    async def scenario():
+        flight, first = SingleFlight(), Call()
+        waiter = asyncio.create_task(flight.do("key", first))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        second = Call()
+        second.release.set()
+        assert await flight.do("key", second) == "результат 1"
+        assert second.started == 1
+
+    asyncio.run(scenario())
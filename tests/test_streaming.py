@@ -0,0 +1,167 @@
+"""
+Тесты потокового ответа: разбор SSE в `OpenRouterClient.stream_completion`
+на `httpx.MockTransport` и правки сообщения `ThrottledEditSink`.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from configs.schemas.ai import OpenRouterSettings
+from src.ai.openrouter import OpenRouterClient, OpenRouterError
+from src.ai.streaming import ThrottledEditSink
+
+MESSAGES = [{"role": "user", "content": "Привет!"}]
+
+
+def _client(handler) -> OpenRouterClient:
+    """Клиент OpenRouter на `httpx.MockTransport` с короткими паузами повтора."""
+    config = OpenRouterSettings(
+        OPENROUTER_API_KEY="test-key",
+        OPENROUTER_PREWARM=False,
+        MAX_RETRIES=3,
+        OPENROUTER_RETRY_BASE_DELAY=0.001,
+    )
+    return OpenRouterClient(config, transport=httpx.MockTransport(handler))
+
+
+def _delta(text: str) -> str:
+    return json.dumps({"choices": [{"delta": {"content": text}}]}, ensure_ascii=False)
+
+
+async def _chunks(body: str, size: int = 7, error: Exception | None = None):
+    """Тело ответа кусками, разрывающими строки SSE посередине."""
+    data = body.encode()
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+    if error is not None:
+        raise error
+
+
+async def _collect(client: OpenRouterClient) -> list[str]:
+    try:
+        return [delta async for delta in client.stream_completion(MESSAGES)]
+    finally:
+        await client.close()
+
+
+def test_stream_parses_multiline_data_comments_and_done():
+    """Многострочное `data:`, комментарии keep-alive и `[DONE]` разбираются."""
+    first, second = _delta("При"), _delta("вет")
+    body = (
+        ": OPENROUTER PROCESSING\n\n"
+        f"data: {first[:10]}\ndata: {first[10:]}\n\n"
+        ": keep-alive\n"
+        f"data: {second}\n\n"
+        "data: [DONE]\n\n"
+        f"data: {_delta('после конца')}\n\n"
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=_chunks(body))
+
+    assert asyncio.run(_collect(_client(handler))) == ["При", "вет"]
+
+
+def test_stream_error_event_raises():
+    """Событие `error` внутри потока завершается `OpenRouterError`."""
+    error = json.dumps({"error": {"code": 502, "message": "provider failed"}})
+    body = f"data: {_delta('Нача')}\n\ndata: {error}\n\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=_chunks(body))
+
+    client = _client(handler)
+    with pytest.raises(OpenRouterError) as raised:
+        asyncio.run(_collect(client))
+    assert raised.value.status_code == 502
+    assert client.stats()["failures"] == 1
+
+
+def test_stream_retries_only_before_response_starts():
+    """Ошибка до ответа 200 повторяется, обрыв после начала потока — нет."""
+    statuses = iter([503, 200])
+    calls = 0
+
+    def retried(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        if status != 200:
+            return httpx.Response(status)
+        return httpx.Response(200, content=_chunks(f"data: {_delta('Да')}\n\n"))
+
+    client = _client(retried)
+    assert asyncio.run(_collect(client)) == ["Да"]
+    assert client.stats()["retries"] == 1
+
+    def broken(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        body = f"data: {_delta('Нача')}\n\n"
+        return httpx.Response(
+            200, content=_chunks(body, error=httpx.ReadError("обрыв", request=request))
+        )
+
+    client = _client(broken)
+    with pytest.raises(OpenRouterError):
+        asyncio.run(_collect(client))
+    assert calls == 1
+    assert client.stats()["retries"] == 0
+
+
+def test_sink_coalesces_fragments_between_edits():
+    """Первый фрагмент показывается сразу, следующие — одной правкой."""
+
+    async def scenario():
+        edits = []
+
+        async def edit(text):
+            edits.append(text)
+
+        sink = ThrottledEditSink(edit, interval=0.1)
+        sink.feed("Пр")
+        await asyncio.sleep(0.01)
+        for delta in ("и", "в", "е", "т"):
+            sink.feed(delta)
+        await asyncio.sleep(0.25)
+        assert await sink.finish() == "Привет"
+        assert edits == ["Пр", "Привет"]
+
+    asyncio.run(scenario())
+
+
+def test_sink_postpones_edit_on_retry_after():
+    """Flood control откладывает правку на `retry_after`, не теряя текст."""
+
+    class RetryAfter(Exception):
+        retry_after = 0.05
+
+    async def scenario():
+        edits = []
+        failed = False
+
+        async def edit(text):
+            nonlocal failed
+            if not failed:
+                failed = True
+                raise RetryAfter("Too Many Requests")
+            edits.append((text, time.monotonic()))
+
+        sink = ThrottledEditSink(edit, interval=0)
+        started = time.monotonic()
+        sink.feed("Привет")
+        assert await sink.finish() == "Привет"
+        assert sink.flood_waits == 1
+        assert [text for text, _ in edits] == ["Привет"]
+        assert edits[0][1] - started >= 0.05
+
+    asyncio.run(scenario())
+
+
+def test_sink_keeps_explicit_zero_interval():
+    """`interval=0` не подменяется значением из настроек."""
+    sink = ThrottledEditSink(lambda text: asyncio.sleep(0), interval=0)
+    assert sink.interval == 0
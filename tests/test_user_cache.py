@@ -0,0 +1,135 @@
+"""
+Тесты двухуровневого кэша пользователей `UserCache` на fakeredis.
+
+Два экземпляра `UserCache` с отдельными клиентами одного `FakeServer`
+играют роль двух процессов бота.
+"""
+
+import asyncio
+
+import fakeredis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.databases.cache.users import UserCache
+from src.databases.dao.user_dao import UserDAO
+from src.databases.sqlite.models import User
+from src.databases.sqlite.models.base import Base
+from src.utils.ttl_cache import MISSING
+
+TELEGRAM_ID = 42
+
+
+async def _session_factory():
+    """Фабрика сессий на пустой SQLite в памяти."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _wait_subscribed(client, channel: str) -> None:
+    """Ждёт, пока на канал подпишется слушатель."""
+    for _ in range(100):
+        if (await client.pubsub_numsub(channel))[0][1]:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Слушатель не подписался на канал")
+
+
+def test_remote_invalidation_drops_negative_entry():
+    """Сброс в одном процессе убирает негативную запись в другом."""
+
+    async def scenario():
+        UserDAO.cache.clear()
+        server = fakeredis.FakeServer()
+        first = UserCache(client=fakeredis.FakeAsyncRedis(server=server))
+        second = UserCache(client=fakeredis.FakeAsyncRedis(server=server))
+        session_factory = await _session_factory()
+
+        await first.start()
+        try:
+            await _wait_subscribed(first._client, first.channel)
+            async with session_factory() as session:
+                assert await first.get_user(session, TELEGRAM_ID) is None
+
+                # Пользователь появился в БД «в другом процессе»
+                session.add(User(telegram_id=TELEGRAM_ID, first_name="Анна"))
+                await session.commit()
+                UserDAO.cache.clear()
+                await second.invalidate(TELEGRAM_ID)
+
+                for _ in range(100):
+                    if first.local.get(TELEGRAM_ID) is MISSING:
+                        break
+                    await asyncio.sleep(0.01)
+                user = await first.get_user(session, TELEGRAM_ID)
+            assert user is not None
+            assert user.first_name == "Анна"
+        finally:
+            await first.stop()
+
+    asyncio.run(scenario())
+
+
+def test_zero_negative_ttl_skips_redis_entry():
+    """`negative_ttl = 0` не записывает промах в Redis."""
+
+    async def scenario():
+        UserDAO.cache.clear()
+        client = fakeredis.FakeAsyncRedis()
+        cache = UserCache(client=client)
+        cache.negative_ttl = 0
+        session_factory = await _session_factory()
+        async with session_factory() as session:
+            assert await cache.get_user(session, TELEGRAM_ID) is None
+        assert await client.exists(cache._key(TELEGRAM_ID)) == 0
+
+    asyncio.run(scenario())
+
+
+def test_listener_clears_local_cache_once_per_outage():
+    """Во время обрыва подписки локальный кэш не очищается на каждой попытке."""
+
+    class UnavailableRedis:
+        attempts = 0
+
+        def pubsub(self):
+            UnavailableRedis.attempts += 1
+            raise RedisConnectionError("Redis недоступен")
+
+    async def scenario():
+        cache = UserCache(client=UnavailableRedis())
+        task = asyncio.create_task(cache._listen())
+        await asyncio.sleep(0.01)
+        cache.local.set(TELEGRAM_ID, None)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        assert UnavailableRedis.attempts == 1  # Пауза перед повторной попыткой
+        assert cache.local.get(TELEGRAM_ID) is not MISSING
+
+    asyncio.run(scenario())
+
+
+def test_invalidation_during_db_read_blocks_stale_fill(monkeypatch):
+    """Сброс, пришедший во время чтения из SQLite, не затирается заполнением."""
+
+    async def scenario():
+        UserDAO.cache.clear()
+        client = fakeredis.FakeAsyncRedis()
+        cache = UserCache(client=client)
+        cache.negative_ttl = 60
+        read_user = UserDAO.get_user_by_telegram_id
+
+        async def read_then_invalidate(session, telegram_id):
+            user = await read_user(session, telegram_id)
+            await cache.invalidate(telegram_id)  # Пользователь создан «рядом»
+            return user
+
+        monkeypatch.setattr(UserDAO, "get_user_by_telegram_id", read_then_invalidate)
+        session_factory = await _session_factory()
+        async with session_factory() as session:
+            assert await cache.get_user(session, TELEGRAM_ID) is None
+        assert await client.exists(cache._key(TELEGRAM_ID)) == 0
+
+    asyncio.run(scenario())
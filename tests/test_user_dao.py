@@ -0,0 +1,54 @@
+"""
+Тесты кэша `UserDAO` на SQLite в памяти.
+"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.databases.dao.user_dao import UserDAO
+from src.databases.sqlite.models.base import Base
+
+TELEGRAM_ID = 42
+
+
+async def _session_factory(expire_on_commit: bool = False):
+    """Фабрика сессий на пустой SQLite в памяти."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return async_sessionmaker(engine, expire_on_commit=expire_on_commit)
+
+
+def test_create_user_with_expire_on_commit():
+    """`create_user` возвращает пользователя и при `expire_on_commit=True`."""
+
+    async def scenario():
+        UserDAO.cache.clear()
+        session_factory = await _session_factory(expire_on_commit=True)
+        async with session_factory() as session:
+            user = await UserDAO.create_user(session, TELEGRAM_ID, "Анна")
+            assert user.first_name == "Анна"
+            cached = await UserDAO.get_user_by_telegram_id(session, TELEGRAM_ID)
+        assert cached.id == user.id
+
+    asyncio.run(scenario())
+
+
+def test_update_through_cached_user_invalidates_cache():
+    """Изменение пользователя, полученного из кэша, сбрасывает его запись."""
+
+    async def scenario():
+        UserDAO.cache.clear()
+        session_factory = await _session_factory()
+        async with session_factory() as session:
+            await UserDAO.create_user(session, TELEGRAM_ID, "Анна")
+        async with session_factory() as session:
+            user = await UserDAO.get_user_by_telegram_id(session, TELEGRAM_ID)
+            user.first_name = "Борис"
+            await session.commit()
+        async with session_factory() as session:
+            user = await UserDAO.get_user_by_telegram_id(session, TELEGRAM_ID)
+        assert user.first_name == "Борис"
+
+    asyncio.run(scenario())
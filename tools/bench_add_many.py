@@ -0,0 +1,82 @@
+"""
+Бенчмарк пакетной вставки `BaseDAO.add_many`.
+
+Сравнивает обычный путь через unit of work (`add_many`) с пакетным режимом
+(`add_many(bulk=True)`) — с гидрацией ORM-объектов и без неё (только ID).
+Каждый замер выполняется на чистой временной SQLite-базе.
+
+Использование
+1. Активируйте виртуальное окружение проекта
+2. Запустите `python tools/bench_add_many.py`
+   (или с размерами: `python tools/bench_add_many.py 1000 5000`)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.databases.dao import MessageDAO, UserDAO  # noqa: E402
+from src.databases.sqlite.models.base import Base  # noqa: E402
+
+# Количество строк по умолчанию
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Сравниваемые режимы: название -> аргументы add_many
+MODES = {
+    "orm (unit of work)": {},
+    "bulk + hydrate": {"bulk": True},
+    "bulk, только id": {"bulk": True, "hydrate": False},
+}
+
+
+async def run_once(rows_count: int, options: dict) -> float:
+    """Вставляет `rows_count` сообщений в чистую БД и возвращает время в секундах."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_dir}/bench.sqlite3")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as session:
+            user = await UserDAO.create_user(session, telegram_id=1, first_name="bench")
+            rows = [
+                {
+                    "user_id": user.id,
+                    "dialog_session_id": f"dialog-{i % 100}",
+                    "role": "user",
+                    "content": f"Сообщение номер {i}",
+                    "message_type": "text",
+                }
+                for i in range(rows_count)
+            ]
+
+            started = time.perf_counter()
+            await MessageDAO.add_many(session, rows, **options)
+            elapsed = time.perf_counter() - started
+
+        await engine.dispose()
+        return elapsed
+
+
+async def main(sizes: tuple[int, ...]) -> None:
+    """Запускает все режимы для каждого размера и печатает таблицу результатов."""
+    print(f"{'строк':>8} | {'режим':<20} | {'время, с':>9} | {'строк/с':>10}")
+    print("-" * 57)
+    for rows_count in sizes:
+        for title, options in MODES.items():
+            elapsed = await run_once(rows_count, options)
+            print(
+                f"{rows_count:>8} | {title:<20} | {elapsed:>9.3f} | "
+                f"{rows_count / elapsed:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or DEFAULT_SIZES
+    asyncio.run(main(sizes))
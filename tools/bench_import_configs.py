@@ -0,0 +1,86 @@
+"""
+Бенчмарк времени импорта `configs`.
+
+Запускает `python -c "import configs"` в отдельных процессах (каждый раз с
+холодным интерпретатором) и печатает медиану и минимум. Для сравнения
+отдельно замеряется пустой запуск интерпретатора и полное создание всех
+секций настроек (`settings.get_safe_dump()`).
+
+Время процесса заметно шумит из-за импорта pydantic, поэтому дополнительно
+печатается собственное время модуля `configs.settings` по `-X importtime`
+(создание `AppSettings` без импорта зависимостей).
+
+Использование
+1. Активируйте виртуальное окружение проекта
+2. Запустите `python tools/bench_import_configs.py`
+   (или с количеством запусков: `python tools/bench_import_configs.py 30`)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Количество запусков по умолчанию
+DEFAULT_RUNS = 15
+
+# Сравниваемые сценарии: название -> код для `python -c`
+SCENARIOS = {
+    "пустой интерпретатор": "pass",
+    "import configs": "import configs",
+    "import configs + все секции": "import configs; configs.settings.get_safe_dump()",
+}
+
+
+def run_once(code: str) -> float:
+    """Запускает код в новом процессе и возвращает время в секундах."""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT_DIR,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - started
+
+
+def settings_self_time() -> float:
+    """Собственное время импорта `configs.settings` в секундах (`-X importtime`)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import configs"],
+        cwd=ROOT_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        self_us, _, module = (part.strip() for part in line.split("|"))
+        if module == "configs.settings":
+            return int(self_us.removeprefix("import time:").strip()) / 1_000_000
+    raise RuntimeError("configs.settings не найден в выводе -X importtime")
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS
+    print(f"Запусков: {runs}")
+    for title, code in SCENARIOS.items():
+        run_once(code)  # Прогрев файлового кэша и .pyc
+        timings = [run_once(code) for _ in range(runs)]
+        print(
+            f"  {title:<30} медиана {statistics.median(timings) * 1000:7.1f} мс, "
+            f"минимум {min(timings) * 1000:7.1f} мс"
+        )
+
+    timings = [settings_self_time() for _ in range(runs)]
+    print(
+        f"  {'configs.settings (self)':<30} медиана "
+        f"{statistics.median(timings) * 1000:7.1f} мс, "
+        f"минимум {min(timings) * 1000:7.1f} мс"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Микробенчмарк форматтеров логов из `src.utils.logger`.
+
+Сравнивает пропускную способность (записей в секунду):
+
+- прежнего `ColoredFormatter`, который пересобирал `_style._fmt` на каждую запись;
+- текущего `ColoredFormatter` с заранее созданными форматтерами по уровням;
+- текстового форматтера лог-файла;
+- `JsonFormatter` (с `orjson`, если он установлен, и со стандартным `json`).
+
+Использование
+1. Активируйте виртуальное окружение проекта
+2. Запустите `python tools/bench_log_formatters.py`
+   (или с количеством записей: `python tools/bench_log_formatters.py 500000`)
+"""
+
+import logging
+import os
+import sys
+import time
+
+from colorama import Style
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import logger as logger_module  # noqa: E402
+from src.utils.logger import (  # noqa: E402
+    DATE_FORMAT,
+    LOG_FORMAT,
+    ColoredFormatter,
+    JsonFormatter,
+)
+
+# Количество записей по умолчанию
+DEFAULT_RECORDS = 200_000
+
+# Уровни, по которым циклически распределяются записи
+LEVELS = (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR)
+
+
+class LegacyColoredFormatter(logging.Formatter):
+    """Прежняя реализация: формат с цветом собирается на каждую запись."""
+
+    def format(self, record):
+        color = ColoredFormatter.COLORS.get(record.levelname, "")
+        self._style._fmt = f"{color}{LOG_FORMAT}{Style.RESET_ALL}"
+        return super().format(record)
+
+
+class StdlibJsonFormatter(JsonFormatter):
+    """`JsonFormatter` с принудительной сериализацией через стандартный `json`."""
+
+    def format(self, record):
+        orjson, logger_module.orjson = logger_module.orjson, None
+        try:
+            return super().format(record)
+        finally:
+            logger_module.orjson = orjson
+
+
+def make_records(count: int) -> list[logging.LogRecord]:
+    """Создаёт записи с аргументами и полями `extra`, как в коде бота."""
+    records = []
+    for i in range(count):
+        record = logging.LogRecord(
+            "src.databases.dao.message_dao",
+            LEVELS[i % len(LEVELS)],
+            __file__,
+            42,
+            "Сообщение %s сохранено в диалог %s",
+            (i, f"dialog-{i % 100}"),
+            None,
+        )
+        record.user_id = i % 1000
+        record.dialog_session_id = f"dialog-{i % 100}"
+        records.append(record)
+    return records
+
+
+def bench(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    """Форматирует все записи и возвращает пропускную способность, записей/с."""
+    started = time.perf_counter()
+    for record in records:
+        formatter.format(record)
+    return len(records) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS
+    records = make_records(count)
+
+    formatters = {
+        "ColoredFormatter (прежний)": LegacyColoredFormatter(LOG_FORMAT, DATE_FORMAT),
+        "ColoredFormatter": ColoredFormatter(LOG_FORMAT, DATE_FORMAT),
+        "текстовый файл": logging.Formatter(LOG_FORMAT, DATE_FORMAT),
+        "JsonFormatter (json)": StdlibJsonFormatter(),
+    }
+    if logger_module.orjson is not None:
+        formatters["JsonFormatter (orjson)"] = JsonFormatter()
+
+    print(f"Записей: {count}")
+    for title, formatter in formatters.items():
+        bench(formatter, records[: min(count, 10_000)])  # Прогрев
+        print(f"  {title:<28} {bench(formatter, records):>12,.0f} записей/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Бенчмарк кодеков значений кэша из `src.databases.redis_codec`.
+
+Для `MessageRead` (короткая реплика и длинный ответ модели) и `UserRead`
+сравнивает форматы json, msgpack (если установлен) и struct со сжатием
+zlib и без него:
+
+- размер значения в байтах (столько хранит Redis и передаёт сеть);
+- время кодирования и декодирования одного значения в микросекундах.
+
+Базовая строка `model_dump_json` — прежний способ хранения в кэше.
+
+Использование
+1. Активируйте виртуальное окружение проекта
+2. Запустите `python tools/bench_redis_codecs.py`
+   (или с количеством итераций: `python tools/bench_redis_codecs.py 50000`)
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.databases.redis_codec import FORMATS, ModelCodec, msgpack  # noqa: E402
+from src.databases.sqlite.schemas import MessageRead, UserRead  # noqa: E402
+
+# Количество итераций по умолчанию
+DEFAULT_ITERATIONS = 20_000
+
+# Порог сжатия, с которым сравнивается вариант без сжатия
+COMPRESS_THRESHOLD = 512
+
+SAMPLES = {
+    "MessageRead (короткое)": MessageRead(
+        id=1_234_567,
+        user_id=42,
+        dialog_session_id="3f2b9c1e-8d4a-4f6b-9e2d-7a1c5b8e0f13",
+        role="user",
+        content="Привет! Как дела?",
+        timestamp=datetime(2026, 1, 15, 12, 30, 45, 123456),
+        message_type="text",
+    ),
+    "MessageRead (длинное)": MessageRead(
+        id=1_234_568,
+        user_id=42,
+        dialog_session_id="3f2b9c1e-8d4a-4f6b-9e2d-7a1c5b8e0f13",
+        role="assistant",
+        content=(
+            "Конечно! Вот подробный ответ на ваш вопрос о работе кэша. "
+            "Redis хранит значения в памяти, поэтому размер каждого ключа "
+            "напрямую влияет на расход памяти и сетевой трафик. "
+        )
+        * 12,
+        timestamp=datetime(2026, 1, 15, 12, 30, 47, 654321),
+        message_type="text",
+    ),
+    "UserRead": UserRead(
+        id=42, telegram_id=123_456_789, first_name="Анна", username="anna_k"
+    ),
+}
+
+
+def measure(func, arg, iterations: int) -> float:
+    """Среднее время одного вызова в микросекундах."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    formats = [name for name in FORMATS if name != "msgpack" or msgpack is not None]
+    print(f"Итераций: {iterations}")
+    if msgpack is None:
+        print("msgpack не установлен — формат пропущен")
+
+    for title, sample in SAMPLES.items():
+        model = type(sample)
+        print(f"\n{title}")
+        print(f"  {'формат':<22} {'байт':>6} {'encode, мкс':>12} {'decode, мкс':>12}")
+
+        baseline = sample.model_dump_json()
+        encode_us = measure(model.model_dump_json, sample, iterations)
+        decode_us = measure(model.model_validate_json, baseline, iterations)
+        size = len(baseline.encode())
+        print(
+            f"  {'model_dump_json':<22} {size:>6} {encode_us:>12.2f} {decode_us:>12.2f}"
+        )
+
+        for name in formats:
+            for threshold in (0, COMPRESS_THRESHOLD):
+                codec = ModelCodec(model, name, compress_threshold=threshold)
+                raw = codec.encode(sample)
+                assert codec.decode(raw) == sample
+                encode_us = measure(codec.encode, sample, iterations)
+                decode_us = measure(codec.decode, raw, iterations)
+                label = f"{name} + zlib" if threshold else name
+                print(
+                    f"  {label:<22} {len(raw):>6} {encode_us:>12.2f} {decode_us:>12.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
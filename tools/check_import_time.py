@@ -0,0 +1,106 @@
+"""
+Регрессионная проверка времени импорта основных точек входа.
+
+Для каждой точки входа запускает `python -X importtime -c "import <модуль>"`
+в новом процессе и проверяет, что:
+
+- при импорте не загружаются тяжёлые модули, которые должны подгружаться
+  лениво (драйвер aiosqlite, диалект SQLAlchemy, клиент Redis и т.п.);
+- суммарное время импорта (лучшее из нескольких запусков) не превышает
+  бюджета.
+
+Бюджеты заданы с запасом и зависят от машины; при необходимости их можно
+умножить аргументом `--budget-scale` (например, на медленном CI).
+
+Использование
+1. Активируйте виртуальное окружение проекта
+2. Запустите `python tools/check_import_time.py`
+   (или `python tools/check_import_time.py --budget-scale 2`)
+3. Код возврата 1 означает, что хотя бы одна точка входа деградировала
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модули, которые должны загружаться только при первом подключении к БД
+LAZY_DB_MODULES = ("aiosqlite", "sqlalchemy.dialects.sqlite.aiosqlite")
+
+# Точки входа: модуль -> (запрещённые при импорте модули, бюджет в мс)
+ENTRY_POINTS = {
+    "src.main": (LAZY_DB_MODULES, 400),
+    "configs": (LAZY_DB_MODULES, 800),
+    "src.databases.sqlite": (LAZY_DB_MODULES, 1200),
+    "src.databases.dao": (LAZY_DB_MODULES, 1200),
+}
+
+# Сколько раз запускать импорт (берётся лучший результат)
+RUNS = 3
+
+
+def import_profile(module: str) -> dict[str, tuple[int, int]]:
+    """
+    Импортирует модуль в новом процессе.
+
+    Returns:
+        dict: имя модуля -> (собственное время, суммарное время) в микросекундах.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line.split("|"))
+        if not cumulative_us.isdigit():
+            continue  # Строка заголовка
+        self_us = self_us.removeprefix("import time:").strip()
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main() -> int:
+    """Проверяет все точки входа и возвращает код возврата."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--budget-scale",
+        type=float,
+        default=1.0,
+        help="Множитель бюджетов времени импорта",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module, (forbidden, budget_ms) in ENTRY_POINTS.items():
+        profiles = [import_profile(module) for _ in range(RUNS)]
+        best = min(profiles, key=lambda profile: profile[module][1])
+        total_ms = best[module][1] / 1000
+        limit_ms = budget_ms * args.budget_scale
+
+        problems = [f"загружен {name}" for name in forbidden if name in best]
+        if total_ms > limit_ms:
+            problems.append(f"{total_ms:.0f} мс при бюджете {limit_ms:.0f} мс")
+
+        status = "FAIL" if problems else "OK"
+        print(f"[{status}] {module}: {total_ms:.0f} мс")
+        for problem in problems:
+            print(f"       -> {problem}")
+        if problems:
+            slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)
+            for name, (self_us, _) in slowest[:5]:
+                print(f"       {self_us / 1000:7.1f} мс  {name}")
+        failed = failed or bool(problems)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())